@@ -1,237 +1,151 @@
 """
 Simple rule-based chatbot using Flask.
 
-This module serves a small web UI and answers user messages using explicit
-if/elif/else statements (no external dataset). The rules are written directly
-in code so the bot responds deterministically to common queries.
+This module serves a small web UI and answers user messages using an ordered
+table of explicit rules (no external dataset). The rules are declared in
+`rules.json`, compiled into an index by `rules.py` and reloaded automatically
+when the file changes, so the bot responds deterministically to common queries.
+
+Servers should get the app from :func:`create_app`, which finishes the setup
+left out of the import (the WebSocket route and, on request, warming up).
 """
 
-from flask import Flask, render_template, request, jsonify
-import re
-import random
-from datetime import datetime, date
+import time
 
+# Taken before the other imports, for the import time reported in STARTUP.
+_IMPORT_START = time.perf_counter()
 
-# Flask app instance
-app = Flask(__name__)
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+import json
+import os
+import random
+from typing import Optional
+
+import chat_metrics
+from classifier import DEFAULT_MODEL_PATH, LazyClassifier
+from context import ContextStore, follow_up, new_session_id
+from response_cache import ResponseCache
+from rules import DEFAULT_RULES_PATH, RuleStore, math_result
+
+
+# Flask app instance. Its static files (the page's WebSocket channel script)
+# are shared with the Tic-Tac-Toe app, in static/ at the repository root.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+app = Flask(__name__, static_folder=STATIC_DIR)
+
+# Largest number of messages accepted by one /chat/batch request.
+app.config['CHAT_BATCH_MAX'] = int(os.environ.get('CHATBOT_BATCH_MAX', '1000'))
+
+# Live rule index. Point CHATBOT_RULES at another file to use a custom rule
+# set; edits are picked up within CHATBOT_RULES_CHECK_INTERVAL seconds.
+RULE_STORE = RuleStore(
+    os.environ.get('CHATBOT_RULES', DEFAULT_RULES_PATH),
+    check_interval=float(os.environ.get('CHATBOT_RULES_CHECK_INTERVAL', '1.0')),
+)
+
+# LRU cache of resolved messages; CHATBOT_CACHE_SIZE=0 turns it off.
+RESPONSE_CACHE = ResponseCache(int(os.environ.get('CHATBOT_CACHE_SIZE', '1024')))
+
+# Per-session conversation state, so follow-ups such as "another one" or "and
+# times 3" can be answered. Sessions are named by the chat_session cookie (or
+# a sessionId field) and expire after CHATBOT_SESSION_TTL idle seconds; at most
+# CHATBOT_CONTEXT_SESSIONS are kept, 0 turns follow-ups off.
+SESSION_COOKIE = 'chat_session'
+SESSION_TTL = float(os.environ.get('CHATBOT_SESSION_TTL', '1800'))
+MAX_SESSIONS = int(os.environ.get('CHATBOT_CONTEXT_SESSIONS', '100000'))
+CONTEXTS = ContextStore(
+    ttl=SESSION_TTL,
+    max_sessions=MAX_SESSIONS,
+    history=int(os.environ.get('CHATBOT_CONTEXT_HISTORY', '4')),
+) if MAX_SESSIONS > 0 else None
+
+# Second-stage intent classifier for messages no rule matches, used when a
+# trained model exists (`python classifier.py train`). It loads on a background
+# thread; until then such messages get the plain fallback.
+CLASSIFIER_PATH = os.environ.get('CHATBOT_CLASSIFIER', DEFAULT_MODEL_PATH)
+CLASSIFIER = LazyClassifier(
+    CLASSIFIER_PATH,
+    threshold=float(os.environ.get('CHATBOT_CLASSIFIER_THRESHOLD', '0.5')),
+    budget=float(os.environ.get('CHATBOT_CLASSIFIER_BUDGET_MS', '1.0')) / 1000,
+) if os.path.exists(CLASSIFIER_PATH) else None
+
+# Request, intent and match-time metrics served at /metrics; only collected
+# when CHATBOT_METRICS is set, otherwise METRICS is None and nothing is timed.
+METRICS = chat_metrics.ChatMetrics() if chat_metrics.enabled() else None
+chat_metrics.instrument(app, METRICS)
 
 
 # -------------------------
 # Rule-based chatbot logic
 # -------------------------
-def get_bot_response(message: str) -> str:
+def get_bot_response(message: str, session=None) -> str:
     """Return a short reply for a given user message using explicit rules.
 
-    This implementation does not consult an external dataset. It uses a
-    prioritized if/elif/else chain to produce one reply per message.
+    This implementation does not consult an external dataset. The rules live in
+    `rules.json` in priority order and are matched through the prebuilt index
+    held by `RULE_STORE`; the first (highest-priority) matching rule wins.
+    When none matches, the optional intent classifier gets a chance before
+    the fallback reply. With a ``session`` (a :class:`context.Session`),
+    follow-ups to the previous message are answered first and the session
+    is updated with this turn.
     """
     msg = (message or '').lower().strip()
+    index = RULE_STORE.index
 
     # quick empty guard
     if not msg:
-        return "I didn't catch that — could you please type something?"
-
-    # Response pools
-    greetings = [
-        "Hey there! How are you doing today?",
-        "Hello! Nice to meet you — what's on your mind?",
-        "Hi! I'm here to chat whenever you're ready.",
-        "Hey! How's your day going so far?",
-        "Hi there! What would you like to talk about?",
-    ]
-
-    farewells = [
-        "Goodbye, come chat again soon!",
-        "See you later — take care!",
-        "Bye! It was great talking with you.",
-        "Catch you later!",
-    ]
-
-    thanks = [
-        "You're welcome!",
-        "No problem — happy to help!",
-        "Anytime! If you have more questions, just ask.",
-    ]
-
-    jokes = [
-        "Why did the computer catch a cold? It left its Windows open.",
-        "Why do programmers prefer dark mode? Because light attracts bugs!",
-        "Why was the robot so bad at soccer? It kept stopping to recharge its batteries.",
-        "I would tell you a UDP joke, but you might not get it.",
-        "Why don't keyboards sleep? They have two shift keys.",
-    ]
-
-    weather_replies = [
-        "I can't check real-time weather, but I hope it's nice where you are!",
-        "I don't have live weather data, but remember: an umbrella is handy if clouds appear.",
-        "Can't fetch live weather here — try a weather website or app for the latest forecast.",
-    ]
-
-    colors = ["blue", "green", "purple", "teal", "amber", "mint"]
-
-    hobbies = [
-        "I enjoy 'reading' logs and learning from examples.",
-        "I like talking about ideas and trying to be helpful.",
-    ]
-
-    advice = [
-        "If you're stuck, try breaking the problem into smaller steps.",
-        "Taking a short break often helps recharge your focus.",
-    ]
-
-    quotes = [
-        "The only limit to our realization of tomorrow is our doubts of today. — F. D. Roosevelt",
-        "Code is like humor. When you have to explain it, it’s bad. — Cory House",
-    ]
-
-    # prepare matchers used by some branches
-    math_match = re.search(r"what(?:'s| is)?\s+(-?\d+(?:\.\d+)?)\s*([+\-*/x×])\s*(-?\d+(?:\.\d+)?)", msg)
-    echo_match = re.search(r"\b(?:repeat after me|say)\s+(.+)", msg)
-
-    # 1) Greetings
-    if re.search(r"\b(hi|hello|hey|hiya|good\s(morning|afternoon|evening))\b", msg):
-        return random.choice(greetings)
-
-    # 2) Farewell
-    elif re.search(r"\b(bye|goodbye|see you|see ya|later|farewell)\b", msg):
-        return random.choice(farewells)
-
-    # 3) Thanks / gratitude
-    elif re.search(r"\b(thank(s| you)?|thx|ty)\b", msg):
-        return random.choice(thanks)
-
-    # 4) Asking for the bot's name or identity
-    elif re.search(r"\b(your name|what.?s your name|who are you|identify yourself)\b", msg):
-        return "I'm your friendly rule-based chatbot!"
-
-    # 5) Creator / origin
-    elif re.search(r"\b(who (made|created) you|who (is )?your creator|built you)\b", msg):
-        return "I was created by a developer using Python and Flask — you can expand my rules anytime!"
-
-    # 6) Jokes / humor
-    elif re.search(r"\b(joke|tell me a joke|make me laugh|funny)\b", msg):
-        return random.choice(jokes)
-
-    # 7) Weather-related
-    elif re.search(r"\b(weather|rain|sunny|cloudy|temperature|forecast)\b", msg):
-        return random.choice(weather_replies)
-
-    # 8) Time and date
-    elif re.search(r"\b(time|current time|what time)\b", msg):
-        now = datetime.now().strftime("%H:%M:%S")
-        return f"The current time is {now}."
-
-    elif re.search(r"\b(date|today's date|what date|today date)\b", msg):
-        today = date.today().isoformat()
-        return f"Today's date is {today}."
-
-    # 9) Day of the week
-    elif re.search(r"\b(day|weekday|what day|which day)\b", msg):
-        weekday = datetime.now().strftime("%A")
-        return f"Today is {weekday}."
-
-    # 10) How are you / status
-    elif re.search(r"\b(how are you|how's it going|how are things|how you doing)\b", msg):
-        return "I'm a program, so I don't have feelings, but I'm running smoothly and ready to chat!"
-
-    # 11) Mood / feelings empathy
-    elif re.search(r"\b(sad|unhappy|depressed|upset|angry|down)\b", msg):
-        return "I'm sorry you're feeling that way. If you'd like to talk about it, I'm here to listen."
-
-    # 12) Favorite color
-    elif re.search(r"\b(favorite color|favourite colour|what color do you like|favou?rite color)\b", msg):
-        return f"I like {random.choice(colors)} — it's soothing for bot eyes."
-
-    # 13) Basic math like 'what is 2 + 2' or 'calculate 7*8'
-    elif math_match:
-        a = float(math_match.group(1))
-        op = math_match.group(2)
-        b = float(math_match.group(3))
-        try:
-            if op in ['+', 'plus']:
-                res = a + b
-            elif op in ['-', '−', 'minus']:
-                res = a - b
-            elif op in ['*', 'x', '×']:
-                res = a * b
-            elif op == '/':
-                if b == 0:
-                    return "I can't divide by zero."
-                res = a / b
-            else:
-                return "I couldn't parse that operator. Try +, -, * or /."
-            if float(res).is_integer():
-                res = int(res)
-            return f"The answer is {res}."
-        except Exception:
-            return "I couldn't compute that — maybe check the numbers?"
-
-    # 14) Ask for help or capabilities
-    elif re.search(r"\b(help|what can you do|capabilities|features|commands)\b", msg):
-        return (
-            "I can respond to greetings, tell jokes, report the current time/date, do simple math, "
-            "and answer other simple questions. Try: 'Hi', 'Tell me a joke', 'What time is it?', or 'What is 3 + 4'."
-        )
-
-    # 15) Privacy-safe replies to personal info requests
-    elif re.search(r"\b(age|how old are you|phone|address|social security|ssn|email)\b", msg):
-        return "I don't share personal or private information. I'm a simple demo chatbot."
-
-    # 16) Echo / repeat
-    elif echo_match:
-        to_say = echo_match.group(1).strip()
-        return f"You asked me to say: {to_say}"
-
-    # 17) Ask for example conversation or sample commands
-    elif re.search(r"\b(example|sample|commands|usage)\b", msg):
-        return (
-            "Try: 'Hi', 'What's your name?', 'Tell me a joke', 'What time is it?', 'What is 3 + 4', 'What's the weather like?', or 'Bye'."
-        )
-
-    # 18) If user says they like something, respond amicably
-    elif re.search(r"\b(i like|i love|i enjoy|i'm into)\b", msg):
-        return "That's great! It's nice to hear what you enjoy."
-
-    # 19) Compliment / small talk
-    elif re.search(r"\b(nice|cool|awesome|great|good job|well done)\b", msg):
-        return "Thanks! I try my best to be helpful."
-
-    # 20) Hobbies or interests
-    elif re.search(r"\b(hobby|hobbies|what do you do for fun|interests)\b", msg):
-        return random.choice(hobbies)
-
-    # 21) Simple advice
-    elif re.search(r"\b(advice|suggest|tip|tips)\b", msg):
-        return random.choice(advice)
-
-    # 22) Quotes
-    elif re.search(r"\b(quote|inspire|motivate|motivation)\b", msg):
-        return random.choice(quotes)
-
-    # 23) Programming related (simple)
-    elif re.search(r"\b(programming|code|python|javascript|java|bug|debug)\b", msg):
-        return "I can talk about programming basics. What's your language or question?"
-
-    # 24) Food / breakfast / coffee small talk
-    elif re.search(r"\b(food|hungry|breakfast|lunch|dinner|coffee|tea)\b", msg):
-        return "I don't eat, but I can help you find a recipe or suggest something tasty!"
-
-    # 25) Small talk about news or current events
-    elif re.search(r"\b(news|updates|headlines|current events)\b", msg):
-        return "I don't fetch live news here, but you can check a news site or ask me for general topics."
-
-    # 26) Favorite programming language (playful)
-    elif re.search(r"\b(favorite language|fav programming|what language)\b", msg):
-        return "I speak JSON, Python, and a little bit of human. 😉"
-
-    # 27) Fallback: default reply with a tip so user knows what to try next
+        return index.empty_reply
+
+    # A follow-up depends on the conversation, so it never goes through the cache.
+    if session is not None:
+        start = time.perf_counter()
+        answered = follow_up(msg, session, index)
+        if answered is not None:
+            intent, reply = answered
+            session.record(msg, intent, CONTEXTS.history)
+            if METRICS is not None:
+                METRICS.observe_intent(intent, time.perf_counter() - start)
+            return reply
+
+    # Repeated messages skip matching; deterministic replies skip the rule too.
+    cached = RESPONSE_CACHE.get(msg, index)
+    if cached is None:
+        start = time.perf_counter()
+        hit = index.match(msg)
+        elapsed = time.perf_counter() - start
+        RULE_STORE.record_match(elapsed)
+        rule, match = hit if hit is not None else (None, None)
+        if rule is None and CLASSIFIER is not None:
+            rule = classify(msg, index)
+        reply = rule.respond(match) if rule is not None and rule.deterministic else None
+        # A fallback decided before the classifier loaded must not outlive it.
+        if rule is not None or CLASSIFIER is None or CLASSIFIER.ready:
+            RESPONSE_CACHE.put(msg, index, (rule, match, reply))
     else:
-        fallback_responses = [
-            "I didn't quite understand that. Try asking for the time, a joke, or say 'help'.",
-            "Huh — I don't know that one yet. Ask me for a joke or the time, or try a different phrase.",
-            "I'm still learning new phrases. You can ask me 'What can you do?' for ideas.",
-        ]
-        return random.choice(fallback_responses)
+        rule, match, reply = cached
+        elapsed = None
+    if METRICS is not None:
+        METRICS.observe_intent(rule.name if rule is not None else 'fallback', elapsed)
+    if session is not None:
+        session.record(msg, rule.name if rule is not None else None, CONTEXTS.history)
+        session.last_result = math_result(match) if rule is not None and rule.handler == 'math' else None
+
+    if reply is not None:
+        return reply
+
+    # Fallback: default reply with a tip so user knows what to try next
+    if rule is None:
+        return random.choice(index.fallback)
+
+    return rule.respond(match)
+
+
+def classify(msg: str, index):
+    """Return the rule the classifier confidently picks for ``msg``, or None."""
+    hit = CLASSIFIER.predict(msg)
+    rule = index.by_name.get(hit[0]) if hit is not None else None
+    # Handlers that read regex groups can't answer without a match.
+    return rule if rule is not None and not rule.capturing else None
 
 # -------------------------
 # Flask routes
@@ -244,21 +158,196 @@ def index():
     return render_template('index.html')
 
 
+def chat_session(session_id):
+    """Return (session_id, session) for a request, starting a new session if needed.
+
+    Both are None when conversation contexts are turned off. IDs longer
+    than 64 characters are not accepted and get a fresh session instead.
+    """
+    if CONTEXTS is None:
+        return None, None
+    if not isinstance(session_id, str) or not session_id or len(session_id) > 64:
+        session_id = new_session_id()
+    return session_id, CONTEXTS.session(session_id)
+
+
 @app.route('/chat', methods=['POST'])
 def chat():
     """Receive a JSON payload with a user message and return a JSON response with the bot's reply.
 
-    Expected JSON body: {"message": "..."}
-    Response JSON: {"reply": "..."}
+    Expected JSON body: {"message": "...", "sessionId": "..." (optional)}
+    Response JSON: {"reply": "...", "sessionId": "..."}
+    The session ID is also set as the chat_session cookie; the browser sends
+    it back, so follow-ups work without the field.
     """
     data = request.get_json(force=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
     user_message = data.get('message', '')
+    if not isinstance(user_message, str):
+        return jsonify({'error': 'Expected the message to be a string'}), 400
+    session_id, session = chat_session(data.get('sessionId') or request.cookies.get(SESSION_COOKIE))
 
     # Get the bot reply using the rule engine
-    reply = get_bot_response(user_message)
+    reply = get_bot_response(user_message, session)
 
     # Return a JSON response to the frontend's fetch request
-    return jsonify({'reply': reply})
+    if session_id is None:
+        return jsonify({'reply': reply})
+    response = jsonify({'reply': reply, 'sessionId': session_id})
+    response.set_cookie(SESSION_COOKIE, session_id, max_age=int(SESSION_TTL), httponly=True, samesite='Lax')
+    return response
+
+
+def _batch_message(item) -> str:
+    """Accept either a bare string or a {"message": "..."} object as a batch item."""
+    if isinstance(item, dict):
+        item = item.get('message', '')
+    return item if isinstance(item, str) else ''
+
+
+def _ndjson_items(stream):
+    """Yield one decoded item per non-blank NDJSON line, or None for a bad line."""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+@app.route('/chat/batch', methods=['POST'])
+def chat_batch():
+    """Answer many messages in one request, streaming the replies back in order.
+
+    Request body is either JSON ({"messages": [...]} or a bare array) or, with
+    Content-Type application/x-ndjson, one message per line read as it arrives.
+    Each item is a string or {"message": "..."}.
+    Response is NDJSON, one {"index": i, "reply": "..."} line per message,
+    written as soon as it is produced.
+    """
+    limit = app.config['CHAT_BATCH_MAX']
+
+    if request.mimetype == 'application/x-ndjson':
+        items = _ndjson_items(request.stream)
+    else:
+        data = request.get_json(force=True)
+        items = data.get('messages') if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return jsonify({'error': 'Expected a list of messages'}), 400
+        if len(items) > limit:
+            return jsonify({'error': f'Batch too large (max {limit} messages)'}), 413
+
+    def generate():
+        for i, item in enumerate(items):
+            if i >= limit:
+                # Streamed input can only be counted as it arrives.
+                yield json.dumps({'error': f'Batch too large (max {limit} messages)'}) + '\n'
+                return
+            if item is None:
+                yield json.dumps({'index': i, 'error': 'Invalid JSON line'}) + '\n'
+                continue
+            reply = get_bot_response(_batch_message(item))
+            yield json.dumps({'index': i, 'reply': reply}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+def channel_frame(text: str, session_id: Optional[str] = None) -> str:
+    """Answer one frame received on the /ws/chat WebSocket.
+
+    Frames are JSON {"id": ..., "message": "..."}; the reply is
+    {"id": ..., "reply": "..."} with the same id, so a client can keep several
+    messages in flight on one connection. Follow-ups are resolved against the
+    connection's session, ``session_id``.
+    """
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return json.dumps({'error': 'Invalid JSON'})
+    if not isinstance(data, dict):
+        return json.dumps({'error': 'Expected a JSON object'})
+    session = CONTEXTS.session(session_id) if CONTEXTS is not None and session_id else None
+    payload = {'reply': get_bot_response(_batch_message(data), session)}
+    if 'id' in data:
+        payload['id'] = data['id']
+    return json.dumps(payload)
+
+
+def register_socket() -> bool:
+    """Serve /ws/chat through flask-sock, if it is installed; returns whether it is."""
+    try:  # WebSocket support under the Flask/gunicorn servers is optional
+        from flask_sock import Sock
+    except ImportError:
+        return False
+    sock = Sock(app)
+
+    @sock.route('/ws/chat')
+    def chat_socket(ws):
+        """Persistent chat channel: one reply frame per message frame (see channel_frame)."""
+        session_id, _ = chat_session(request.cookies.get(SESSION_COOKIE))
+        while True:
+            ws.send(channel_frame(ws.receive(), session_id))
+    return True
+
+
+@app.route('/rules/stats')
+def rules_stats():
+    """Report rule reload cost, per-message match latency, response cache, classifier
+    and conversation context counters as JSON."""
+    stats = RULE_STORE.stats()
+    stats['cache'] = RESPONSE_CACHE.stats()
+    stats['contexts'] = CONTEXTS.stats() if CONTEXTS is not None else None
+    stats['classifier'] = CLASSIFIER.stats() if CLASSIFIER is not None else None
+    stats['startup'] = dict(STARTUP, pid=os.getpid())
+    return jsonify(stats)
+
+
+# -------------------------
+# Application factory
+# -------------------------
+# Import and setup cost of this process, reported by /rules/stats.
+STARTUP = {'import_ms': 0.0, 'create_ms': 0.0, 'warm_ms': None, 'websocket': False}
+
+
+def warm_up() -> None:
+    """Do the work first requests would otherwise do.
+
+    Loads the intent classifier synchronously (a loader thread would not
+    survive a fork), compiles the page template and checks the rule index.
+    In a pre-forking server's parent this leaves the data in pages that every
+    worker shares copy-on-write.
+    """
+    RULE_STORE.index
+    if CLASSIFIER is not None:
+        CLASSIFIER.wait()
+    app.jinja_env.get_template('index.html')
+
+
+def create_app(websocket: bool = True, warm: bool = False) -> Flask:
+    """Return the chatbot's Flask app, finishing the setup deferred at import.
+
+    ``websocket`` serves /ws/chat through flask-sock; asgi.py serves the socket
+    itself and passes False, so its workers never import flask-sock. ``warm``
+    runs :func:`warm_up`. Calling it again only adds what earlier calls left
+    out.
+    """
+    start = time.perf_counter()
+    if websocket and not STARTUP['websocket']:
+        STARTUP['websocket'] = register_socket()
+    if warm and STARTUP['warm_ms'] is None:
+        warm_start = time.perf_counter()
+        warm_up()
+        STARTUP['warm_ms'] = (time.perf_counter() - warm_start) * 1000
+    STARTUP['create_ms'] += (time.perf_counter() - start) * 1000
+    app.logger.info("Chatbot ready: import %.1f ms, create_app %.1f ms",
+                    STARTUP['import_ms'], STARTUP['create_ms'])
+    return app
+
+
+STARTUP['import_ms'] = (time.perf_counter() - _IMPORT_START) * 1000
 
 
 # Run the Flask development server when invoked directly. In production you would use a WSGI server.
@@ -266,4 +355,4 @@ if __name__ == '__main__':
     # Debug mode is useful during development. Remove debug=True in production.
     # Start the server and listen on all interfaces so the app is reachable from
     # forwarded ports or other machines on the network.
-    app.run(debug=True, host="0.0.0.0", port=5000)
+    create_app().run(debug=True, host="0.0.0.0", port=5000)
@@ -0,0 +1,155 @@
+"""
+ASGI entry point for the chatbot.
+
+`POST /chat` is answered natively on the event loop: the rule engine is fast
+and never blocks, so the message skips the WSGI bridge and its thread hop.
+The `/ws/chat` WebSocket is served here too, carrying any number of messages
+over one connection. Every other route is served by the regular Flask app
+wrapped with asgiref.
+
+    uvicorn asgi:application --workers 4
+"""
+
+import asyncio
+import contextvars
+import json
+import time
+from http.cookies import SimpleCookie
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import (METRICS, SESSION_COOKIE, SESSION_TTL, channel_frame, chat_session, create_app,
+                 get_bot_response)
+
+
+# The WebSocket is served natively below, so flask-sock is not needed.
+flask_app = WsgiToAsgi(create_app(websocket=False))
+
+
+async def _read_body(receive) -> bytes:
+    """Collect the full request body from the ASGI receive channel."""
+    body = b''
+    more = True
+    while more:
+        message = await receive()
+        body += message.get('body', b'')
+        more = message.get('more_body', False)
+    return body
+
+
+async def _send_json(send, payload: dict, status: int = 200, headers=()) -> None:
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii')),
+            *headers,
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def _cookie(scope, name: str):
+    """The value of cookie ``name`` in the request headers, or None."""
+    for key, value in scope['headers']:
+        if key == b'cookie':
+            morsel = SimpleCookie(value.decode('latin-1')).get(name)
+            if morsel is not None:
+                return morsel.value
+    return None
+
+
+def _session_cookie(session_id: str):
+    """Set-Cookie header for the session, matching the Flask view's cookie."""
+    value = f'{SESSION_COOKIE}={session_id}; Max-Age={int(SESSION_TTL)}; HttpOnly; Path=/; SameSite=Lax'
+    return b'set-cookie', value.encode('latin-1')
+
+
+async def chat(scope, receive, send) -> int:
+    """Async variant of the Flask `/chat` view with the same request/response contract.
+
+    Returns the response status, for the request metrics.
+    """
+    try:
+        data = json.loads(await _read_body(receive) or b'{}')
+    except ValueError:
+        await _send_json(send, {'error': 'Invalid JSON'}, status=400)
+        return 400
+    if not isinstance(data, dict):
+        await _send_json(send, {'error': 'Expected a JSON object'}, status=400)
+        return 400
+    user_message = data.get('message', '')
+    if not isinstance(user_message, str):
+        await _send_json(send, {'error': 'Expected the message to be a string'}, status=400)
+        return 400
+    session_id, session = chat_session(data.get('sessionId') or _cookie(scope, SESSION_COOKIE))
+    reply = get_bot_response(user_message, session)
+    if session_id is None:
+        await _send_json(send, {'reply': reply})
+    else:
+        await _send_json(send, {'reply': reply, 'sessionId': session_id}, headers=[_session_cookie(session_id)])
+    return 200
+
+
+async def chat_socket(scope, receive, send) -> None:
+    """WebSocket variant of `/chat`; each text frame is answered by `channel_frame`."""
+    session_id, _ = chat_session(_cookie(scope, SESSION_COOKIE))
+    while True:
+        message = await receive()
+        if message['type'] == 'websocket.connect':
+            await send({'type': 'websocket.accept'})
+        elif message['type'] == 'websocket.receive':
+            text = message.get('text')
+            if text is None:
+                text = (message.get('bytes') or b'').decode('utf-8', 'replace')
+            await send({'type': 'websocket.send', 'text': channel_frame(text, session_id)})
+        elif message['type'] == 'websocket.disconnect':
+            return
+
+
+async def _reject_socket(receive, send) -> None:
+    """Refuse a WebSocket on a path that has none."""
+    message = await receive()
+    if message['type'] == 'websocket.connect':
+        await send({'type': 'websocket.close', 'code': 1008})
+
+
+async def _flask(scope, receive, send) -> None:
+    """Serve a request through the wrapped Flask app in a fresh context.
+
+    On a keep-alive connection uvicorn starts each request from the previous
+    one's context, where asgiref may still have its single-thread executor
+    marked busy; the next request would then fail with "would deadlock".
+    """
+    loop = asyncio.get_running_loop()
+    await contextvars.Context().run(loop.create_task, flask_app(scope, receive, send))
+
+
+async def _lifespan(receive, send) -> None:
+    """Acknowledge server startup/shutdown; the app has no async resources."""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send) -> None:
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+    elif scope['type'] == 'http' and scope['path'] == '/chat' and scope['method'] == 'POST':
+        start = time.perf_counter()
+        status = await chat(scope, receive, send)
+        if METRICS is not None:
+            METRICS.observe_request('/chat', 'POST', status, time.perf_counter() - start)
+    elif scope['type'] == 'websocket':
+        if scope['path'] == '/ws/chat':
+            await chat_socket(scope, receive, send)
+        else:
+            await _reject_socket(receive, send)
+    else:
+        await _flask(scope, receive, send)
@@ -0,0 +1,205 @@
+"""
+Safe arithmetic expressions for the ``math`` rule and numeric follow-ups.
+
+Expressions are read by a small tokenizer and a precedence (Pratt) parser, so
+no ``eval`` is involved. They may use:
+
+- numbers such as ``3``, ``2.5`` or ``.5``,
+- ``+ - * / % ^`` and ``**``, with ``x``, ``×``, ``÷`` and ``−`` as aliases,
+- word operators (``plus``, ``minus``, ``times``, ``divided by``, ``over``,
+  ``mod``, ``to the power of``, ...),
+- parentheses and unary minus or plus.
+
+Usual precedence applies: ``^`` binds tightest and groups to the right, then
+unary minus (so ``-2 ^ 2`` is -4), then ``* / %``, then ``+ -``. ``%`` is the
+remainder, as in Python.
+
+An expression is compiled once into a postfix program, cached by its text,
+and run on a small stack of floats. Hostile input is bounded by hard limits:
+at most ``MAX_EXPRESSION_CHARS`` characters, ``MAX_STEPS`` program steps and
+exponents up to ``MAX_EXPONENT``; non-finite results are rejected. Every
+failure raises :class:`CalcError`, whose text is a reply for the user.
+"""
+
+import math
+import operator
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+
+# Longest expression text accepted.
+MAX_EXPRESSION_CHARS = 200
+
+# Most numbers and operators in one expression.
+MAX_STEPS = 128
+
+# Largest exponent magnitude for ``^``.
+MAX_EXPONENT = 1000
+
+# Compiled programs kept, keyed by expression text.
+CACHE_SIZE = 1024
+
+_WORD_OPERATORS = {
+    'plus': '+', 'add': '+',
+    'minus': '-', 'subtract': '-', 'take away': '-',
+    'times': '*', 'multiplied by': '*', 'multiply by': '*',
+    'divided by': '/', 'divide by': '/', 'over': '/',
+    'mod': '%', 'modulo': '%',
+    'to the power of': '^', 'raised to the power of': '^',
+}
+_SYMBOLS = {
+    '+': '+', '-': '-', '−': '-', '*': '*', 'x': '*', '×': '*',
+    '/': '/', '÷': '/', '%': '%', '^': '^', '**': '^', '(': '(', ')': ')',
+}
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<number>\d+(?:\.\d*)?|\.\d+)"
+    r"|(?P<word>" + '|'.join(sorted((w.replace(' ', r'\s+') for w in _WORD_OPERATORS), key=len, reverse=True))
+    + r")(?![a-z])"
+    r"|(?P<symbol>\*\*|[-+−*x×/÷%^()]))"
+)
+
+# (left, right) binding power of each binary operator; ``^`` groups to the right.
+_BINARY = {'+': (10, 11), '-': (10, 11), '*': (20, 21), '/': (20, 21), '%': (20, 21), '^': (41, 40)}
+_UNARY = 30
+
+# Postfix program items besides numbers and the binary operators.
+PREVIOUS = 'previous'
+NEGATE = 'negate'
+
+_APPLY = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv, '%': operator.mod}
+
+_UNREADABLE = "I couldn't follow that expression. Try something like (2 + 3) * 4."
+
+
+class CalcError(ValueError):
+    """An expression that can't be read or computed; the message is a ready reply."""
+
+
+def tokenize(text: str) -> list:
+    """Split ``text`` into numbers (floats) and canonical operator strings."""
+    if len(text) > MAX_EXPRESSION_CHARS:
+        raise CalcError("That expression is too long for me.")
+    tokens = []
+    pos = 0
+    end = len(text.rstrip())
+    while pos < end:
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            raise CalcError(_UNREADABLE)
+        if m.group('number') is not None:
+            tokens.append(float(m.group('number')))
+        elif m.group('word') is not None:
+            tokens.append(_WORD_OPERATORS[' '.join(m.group('word').split())])
+        else:
+            tokens.append(_SYMBOLS[m.group('symbol')])
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    """Pratt parser emitting a postfix program."""
+
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        self.pos = 0
+        self.program = []
+
+    def _next(self):
+        token = self.tokens[self.pos] if self.pos < len(self.tokens) else None
+        self.pos += 1
+        return token
+
+    def expression(self, min_power: int) -> None:
+        self.operand()
+        while self.pos < len(self.tokens):
+            op = self.tokens[self.pos]
+            if op.__class__ is float or op not in _BINARY or _BINARY[op][0] <= min_power:
+                return
+            self.pos += 1
+            self.expression(_BINARY[op][1])
+            self.program.append(op)
+
+    def operand(self) -> None:
+        token = self._next()
+        if token.__class__ is float or token == PREVIOUS:
+            self.program.append(token)
+        elif token == '(':
+            self.expression(0)
+            if self._next() != ')':
+                raise CalcError(_UNREADABLE)
+        elif token in ('-', '+'):
+            self.expression(_UNARY)
+            if token == '-':
+                self.program.append(NEGATE)
+        else:
+            raise CalcError(_UNREADABLE)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(text: str, continues: bool = False) -> Tuple:
+    """Compile ``text`` to a postfix program.
+
+    With ``continues``, ``text`` carries on from a previous result that is
+    its implicit first operand, as in "times 3", so it must start with a
+    binary operator.
+    """
+    tokens = tokenize(text)
+    if continues:
+        if not tokens or tokens[0].__class__ is float or tokens[0] not in _BINARY:
+            raise CalcError(_UNREADABLE)
+        tokens.insert(0, PREVIOUS)
+    if not tokens:
+        raise CalcError(_UNREADABLE)
+    if len(tokens) > MAX_STEPS:
+        raise CalcError("That expression has too many steps for me.")
+    parser = _Parser(tokens)
+    parser.expression(0)
+    if parser.pos != len(tokens):
+        raise CalcError(_UNREADABLE)
+    return tuple(parser.program)
+
+
+def _power(a: float, b: float) -> float:
+    if abs(b) > MAX_EXPONENT:
+        raise CalcError(f"I only handle exponents up to {MAX_EXPONENT}.")
+    if a < 0 and not b.is_integer():
+        raise CalcError("That has no real answer.")
+    return a ** b
+
+
+def run(program: Tuple, previous: Optional[float] = None) -> float:
+    """Run a compiled program; ``previous`` is the value of a continued expression's first operand."""
+    stack = []
+    try:
+        for item in program:
+            if item.__class__ is float:
+                stack.append(item)
+            elif item == PREVIOUS:
+                stack.append(previous)
+            elif item == NEGATE:
+                stack[-1] = -stack[-1]
+            else:
+                b = stack.pop()
+                value = _power(stack[-1], b) if item == '^' else _APPLY[item](stack[-1], b)
+                if not math.isfinite(value):
+                    raise OverflowError
+                stack[-1] = value
+    except ZeroDivisionError:
+        raise CalcError("I can't divide by zero.") from None
+    except OverflowError:
+        raise CalcError("That number is too large for me.") from None
+    return stack[-1]
+
+
+def evaluate(text: str, previous: Optional[float] = None) -> float:
+    """Compute ``text``; with ``previous`` it continues from that value (see :func:`compile_expression`)."""
+    return run(compile_expression(text, previous is not None), previous)
+
+
+def format_number(value: float) -> str:
+    """Render a result without a trailing ``.0`` for whole numbers."""
+    if float(value).is_integer():
+        value = int(value)
+    return str(value)
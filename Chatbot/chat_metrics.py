@@ -0,0 +1,72 @@
+"""
+Prometheus-style metrics for the chatbot.
+
+The registry, counters and histograms live in ``prometheus_text.py`` at the
+repository root, shared with the Tic-Tac-Toe game; this module defines the
+chatbot's metrics on top of them. Instrumentation is off unless
+``CHATBOT_METRICS`` is set (``1``, ``true`` or ``yes``); when off,
+:func:`instrument` registers nothing and callers skip recording behind a
+single ``None`` check.
+
+Values are per process. Under a multi-worker server each scrape reads the
+worker that happened to answer it, so scrape every worker or aggregate with
+a label per instance.
+"""
+
+import os
+import sys
+from typing import Optional
+
+from flask import Flask
+
+# prometheus_text.py sits one level up, next to the Tic-Tac-Toe folder.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import prometheus_text
+from prometheus_text import Registry
+
+
+# Request latency buckets in seconds.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Rule matching is far below a millisecond.
+MATCH_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3)
+
+
+def enabled(var: str = 'CHATBOT_METRICS') -> bool:
+    """True when the environment variable ``var`` turns metrics on."""
+    return prometheus_text.enabled(var)
+
+
+class ChatMetrics:
+    """The chatbot's metrics: request latency per route and rule matching per intent."""
+
+    def __init__(self):
+        self.registry = Registry('chatbot')
+        self.requests = self.registry.histogram(
+            'http_request_duration_seconds', 'Time spent answering HTTP requests.',
+            ('route', 'method', 'status'), LATENCY_BUCKETS)
+        self.intents = self.registry.counter(
+            'intent_total', 'Messages answered, by intent and whether the response cache was hit.',
+            ('intent', 'cached'))
+        self.match = self.registry.histogram(
+            'intent_match_seconds', 'Time spent matching a message against the rules, by intent.',
+            ('intent',), MATCH_BUCKETS)
+
+    def observe_request(self, route: str, method: str, status: int, seconds: float) -> None:
+        self.requests.observe(seconds, route, method, str(status))
+
+    def observe_intent(self, intent: str, seconds: Optional[float]) -> None:
+        """Count one answered message; ``seconds`` is None when the cache answered it."""
+        if seconds is None:
+            self.intents.inc(intent, 'true')
+        else:
+            self.intents.inc(intent, 'false')
+            self.match.observe(seconds, intent)
+
+    def render(self) -> str:
+        return self.registry.render()
+
+
+def instrument(app: Flask, metrics: Optional[ChatMetrics]) -> None:
+    """Time every Flask request and serve ``GET /metrics``; does nothing when ``metrics`` is None."""
+    prometheus_text.instrument(app, metrics)
@@ -0,0 +1,283 @@
+"""
+Statistical intent classifier consulted when no rule matches.
+
+A second stage for the fallback path: paraphrases such as "cya" or "got any
+jokes" miss every regex in ``rules.json`` but are close, in character
+n-grams, to phrases the rules do cover. The classifier is a TF-IDF model over
+character n-grams with a multinomial logistic regression on top, trained on
+the literal keywords of each rule's pattern, the rule's ``examples`` and a
+``__none__`` class built from the file's ``fallback_examples``.
+
+Training needs scikit-learn and happens offline::
+
+    python classifier.py train            # writes intent_model.json
+    python classifier.py check "cya"      # classify messages with a saved model
+
+The fitted model is serialized as precomputed per-n-gram vectors (the n-gram's
+IDF weight and its coefficient for every intent), so the app scores a message
+in pure Python without importing scikit-learn or NumPy. Only rules whose
+replies do not read captured groups (everything but the ``math`` and ``echo``
+handlers) can be predicted, since there is no regex match to hand them.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from rules import CAPTURING_HANDLERS, DEFAULT_RULES_PATH, pattern_keywords
+
+
+# Default location of the serialized model.
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'intent_model.json')
+
+# Label of the "no intent" class trained on the rule file's fallback_examples.
+NONE_LABEL = '__none__'
+
+NGRAM_RANGE = (2, 4)
+
+# Only this much of a message is scored; it bounds the work per message.
+MAX_MESSAGE_CHARS = 200
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = NGRAM_RANGE) -> List[str]:
+    """Character n-grams of each word padded with spaces, like scikit-learn's ``char_wb``."""
+    low, high = ngram_range
+    grams = []
+    for word in _WHITESPACE.split(text.strip()):
+        if not word:
+            continue
+        word = f' {word} '
+        for n in range(low, min(high, len(word)) + 1):
+            grams.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return grams
+
+
+# -------------------------
+# Training (offline, needs scikit-learn)
+# -------------------------
+def training_data(rules_path: str = DEFAULT_RULES_PATH) -> Tuple[List[str], List[str]]:
+    """Phrases and intent labels taken from a rule file.
+
+    Each eligible rule contributes the literal phrases its pattern matches in
+    full (e.g. ``tell me a joke``) and its ``examples``; ``fallback_examples``
+    become the ``__none__`` class. Partial keywords such as the ``who`` of
+    ``who (is )?your creator`` are left out, as they say little about the intent.
+    """
+    with open(rules_path, encoding='utf-8') as fh:
+        doc = json.load(fh)
+    texts, labels = [], []
+    for entry in doc.get('rules', []):
+        if entry.get('handler') in CAPTURING_HANDLERS:
+            continue
+        phrases = {p.strip() for p in pattern_keywords(entry['pattern'], complete=True)}
+        for phrase in sorted(p for p in phrases if p) + list(entry.get('examples', [])):
+            texts.append(phrase.lower())
+            labels.append(entry['name'])
+    for phrase in doc.get('fallback_examples', []):
+        texts.append(phrase.lower())
+        labels.append(NONE_LABEL)
+    return texts, labels
+
+
+def train(rules_path: str = DEFAULT_RULES_PATH, c: float = 10.0) -> dict:
+    """Fit the model on a rule file and return it in serialized form."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+
+    texts, labels = training_data(rules_path)
+    vectorizer = TfidfVectorizer(analyzer=char_ngrams, sublinear_tf=True)
+    features = vectorizer.fit_transform(texts)
+    model = LogisticRegression(C=c, max_iter=2000)
+    model.fit(features, labels)
+
+    coef = model.coef_.T  # (n_features, n_classes)
+    return {
+        'version': 1,
+        'ngram_range': list(NGRAM_RANGE),
+        'classes': [str(label) for label in model.classes_],
+        'intercept': [round(float(b), 6) for b in model.intercept_],
+        'features': {
+            gram: [round(float(vectorizer.idf_[column]), 6)] + [round(float(w), 6) for w in coef[column]]
+            for gram, column in sorted(vectorizer.vocabulary_.items())
+        },
+    }
+
+
+def save_model(model: dict, path: str = DEFAULT_MODEL_PATH) -> None:
+    """Write a serialized model atomically, so a running app never reads half a file."""
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(model, fh, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+# -------------------------
+# Inference (pure Python)
+# -------------------------
+class IntentClassifier:
+    """Scores messages with a serialized model.
+
+    ``predict`` returns the best intent and its probability, or None when the
+    best class is ``__none__``, its probability is below ``threshold``, or
+    scoring would take longer than ``budget`` seconds.
+    """
+
+    def __init__(self, model: dict, threshold: float = 0.5, budget: float = 0.001):
+        self.classes = model['classes']
+        self.intercept = model['intercept']
+        self.ngram_range = tuple(model['ngram_range'])
+        self.features = {gram: (values[0], values[1:]) for gram, values in model['features'].items()}
+        self.threshold = threshold
+        self.budget = budget
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.predictions = 0
+        self.over_budget = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH, **kwargs) -> 'IntentClassifier':
+        with open(path, encoding='utf-8') as fh:
+            return cls(json.load(fh), **kwargs)
+
+    def probabilities(self, msg: str, deadline: float = math.inf) -> Optional[List[float]]:
+        """Class probabilities for ``msg``, or None if ``deadline`` (a perf_counter time) passes."""
+        counts: Dict[str, int] = {}
+        features = self.features
+        for gram in char_ngrams(msg[:MAX_MESSAGE_CHARS], self.ngram_range):
+            if gram in features:
+                counts[gram] = counts.get(gram, 0) + 1
+        # Sublinear TF-IDF weights, L2-normalized, as the vectorizer computed them.
+        weights = [(features[gram], (1.0 + math.log(n)) * features[gram][0]) for gram, n in counts.items()]
+        norm = math.sqrt(sum(w * w for _, w in weights)) or 1.0
+        scores = list(self.intercept)
+        for i, ((_, coef), w) in enumerate(weights):
+            if i & 15 == 15 and time.perf_counter() > deadline:
+                return None
+            w /= norm
+            scores = [s + c * w for s, c in zip(scores, coef)]
+        top = max(scores)
+        exps = [math.exp(s - top) for s in scores]
+        total = sum(exps)
+        return [e / total for e in exps]
+
+    def predict(self, msg: str) -> Optional[Tuple[str, float]]:
+        """Return (intent, probability) for a confident prediction, else None."""
+        start = time.perf_counter()
+        probs = self.probabilities(msg, start + self.budget)
+        elapsed = time.perf_counter() - start
+        result = None
+        if probs is not None:
+            best = max(range(len(probs)), key=probs.__getitem__)
+            if self.classes[best] != NONE_LABEL and probs[best] >= self.threshold:
+                result = self.classes[best], probs[best]
+        with self._lock:
+            self.calls += 1
+            self.total_seconds += elapsed
+            if elapsed > self.max_seconds:
+                self.max_seconds = elapsed
+            if probs is None:
+                self.over_budget += 1
+            elif result is not None:
+                self.predictions += 1
+        return result
+
+    def stats(self) -> dict:
+        """Call counts and per-message latency, for the stats endpoint."""
+        calls = self.calls
+        return {
+            'intents': sum(1 for label in self.classes if label != NONE_LABEL),
+            'features': len(self.features),
+            'threshold': self.threshold,
+            'calls': calls,
+            'predictions': self.predictions,
+            'over_budget': self.over_budget,
+            'avg_us': (self.total_seconds / calls * 1e6) if calls else 0.0,
+            'max_us': self.max_seconds * 1e6,
+        }
+
+
+class LazyClassifier:
+    """Loads an :class:`IntentClassifier` on a background thread.
+
+    Importing the app and starting workers stays fast; until the model is
+    ready, :meth:`predict` returns None and messages get the plain fallback.
+    A model that fails to load is reported in :meth:`stats` and never retried.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        self.path = path
+        self.error: Optional[str] = None
+        self._model: Optional[IntentClassifier] = None
+        self._kwargs = kwargs
+        self._thread = threading.Thread(target=self._load, name='intent-classifier', daemon=True)
+        self._thread.start()
+
+    def _load(self) -> None:
+        try:
+            self._model = IntentClassifier.load(self.path, **self._kwargs)
+        except (OSError, ValueError, KeyError) as exc:
+            self.error = str(exc)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until loading has finished (or failed); returns :attr:`ready`."""
+        self._thread.join(timeout)
+        return self.ready
+
+    @property
+    def ready(self) -> bool:
+        return self._model is not None
+
+    def predict(self, msg: str) -> Optional[Tuple[str, float]]:
+        model = self._model
+        return model.predict(msg) if model is not None else None
+
+    def stats(self) -> dict:
+        model = self._model
+        stats = model.stats() if model is not None else {}
+        stats.update({'path': self.path, 'ready': model is not None, 'error': self.error})
+        return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python classifier.py', description="Train and try the intent classifier.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    train_cmd = commands.add_parser('train', help="fit the model on a rule file and save it")
+    train_cmd.add_argument('--rules', default=DEFAULT_RULES_PATH)
+    train_cmd.add_argument('-o', '--output', default=DEFAULT_MODEL_PATH)
+    train_cmd.add_argument('-C', type=float, default=10.0, help="inverse regularization strength")
+    check = commands.add_parser('check', help="classify messages with a saved model")
+    check.add_argument('messages', nargs='+')
+    check.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    check.add_argument('--threshold', type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    if args.command == 'train':
+        start = time.perf_counter()
+        model = train(args.rules, c=args.C)
+        save_model(model, args.output)
+        print(f"Trained {len(model['classes'])} classes on {len(model['features'])} n-grams "
+              f"in {time.perf_counter() - start:.2f} s; wrote {os.path.getsize(args.output)} bytes "
+              f"to {args.output}")
+    else:
+        classifier = IntentClassifier.load(args.model, threshold=args.threshold, budget=math.inf)
+        for message in args.messages:
+            probs = classifier.probabilities(message.lower())
+            best = max(range(len(probs)), key=probs.__getitem__)
+            hit = classifier.predict(message.lower())
+            verdict = hit[0] if hit else 'fallback'
+            print(f"{message!r}: {verdict} (best {classifier.classes[best]} at {probs[best]:.2f})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Per-session conversation state for follow-up messages.
+
+``/chat`` answers each message on its own, so "another one" after a joke or
+"and times 3" after a sum would fall through to the fallback reply. A
+:class:`ContextStore` keeps a small :class:`Session` record per conversation
+(keyed by the ``chat_session`` cookie or an explicit session ID) with the
+last intent, the last numeric answer and the most recent turns in a
+fixed-size ring buffer; :func:`follow_up` answers those messages from it.
+
+Memory is bounded twice over: each session holds at most ``history`` turns
+with messages cut to ``MAX_TURN_CHARS``, and the store keeps at most
+``max_sessions`` sessions, dropping idle ones after ``ttl`` seconds and the
+least recently used beyond the cap.
+"""
+
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from calc import CalcError, compile_expression, format_number, run
+
+
+# Longest message text kept per turn.
+MAX_TURN_CHARS = 64
+
+# Most expired sessions dropped per call, so a burst of expiries (say, after a
+# quiet night) is spread over many requests instead of stalling one.
+EXPIRE_BATCH = 64
+
+# "another one", "one more", "again", "tell me another", ...
+_MORE = re.compile(r"^(?:(?:tell|give|show) me )?(?:another(?: one)?|one more|more|again|next)(?: please)?[.!?]*$")
+
+# "and times 3", "then divide by 4", "plus 2." -> the expression continuing the last result
+_CONTINUATION = re.compile(r"^(?:(?:and|then|now)\s+)*(.*?)[.!?]*$")
+
+
+def new_session_id() -> str:
+    """Return a fresh, unguessable session ID."""
+    return secrets.token_urlsafe(12)
+
+
+class Turn:
+    """One answered message: the intent it resolved to and its (truncated) text."""
+
+    __slots__ = ('intent', 'message')
+
+    def __init__(self, intent: Optional[str], message: str):
+        self.intent = intent
+        self.message = message
+
+
+class Session:
+    """Conversation state of one session.
+
+    ``turns`` is a ring buffer: it grows to the store's ``history`` size and
+    is then overwritten in place, ``next_turn`` pointing at the oldest entry.
+    """
+
+    __slots__ = ('last_intent', 'last_result', 'turns', 'next_turn', 'touched')
+
+    def __init__(self, now: float):
+        self.last_intent: Optional[str] = None
+        self.last_result: Optional[float] = None
+        self.turns: List[Turn] = []
+        self.next_turn = 0
+        self.touched = now
+
+    def record(self, message: str, intent: Optional[str], history: int) -> None:
+        """Remember an answered message, overwriting the oldest turn once ``history`` are held."""
+        turn = Turn(intent, message[:MAX_TURN_CHARS])
+        if len(self.turns) < history:
+            self.turns.append(turn)
+        else:
+            self.turns[self.next_turn] = turn
+            self.next_turn = (self.next_turn + 1) % history
+        self.last_intent = intent
+
+    def recent(self) -> List[Turn]:
+        """The remembered turns, oldest first."""
+        return self.turns[self.next_turn:] + self.turns[:self.next_turn]
+
+
+class ContextStore:
+    """Thread-safe store of :class:`Session` records.
+
+    Sessions are kept in an OrderedDict in least-recently-used order, so both
+    TTL expiry and the ``max_sessions`` cap only ever drop entries from the
+    front. Each call expires at most ``EXPIRE_BATCH`` sessions; expired ones
+    still waiting are never handed out.
+    """
+
+    def __init__(self, ttl: float = 1800, max_sessions: int = 100_000, history: int = 4,
+                 clock=time.monotonic):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.history = history
+        self._clock = clock
+        self._sessions = OrderedDict()  # session_id -> Session
+        self._lock = threading.Lock()
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def session(self, session_id: str) -> Session:
+        """Return the live session for ``session_id``, starting a new one if it is unknown or expired."""
+        now = self._clock()
+        with self._lock:
+            sessions = self._sessions
+            session = sessions.get(session_id)
+            if session is not None and now - session.touched > self.ttl:
+                session = None
+                self.expired += 1
+            if session is None:
+                session = sessions[session_id] = Session(now)
+                self.created += 1
+            else:
+                session.touched = now
+            sessions.move_to_end(session_id)
+            # Drop expired sessions, then the least recently used beyond the cap.
+            budget = EXPIRE_BATCH
+            while sessions:
+                oldest = next(iter(sessions.values()))
+                if budget and now - oldest.touched > self.ttl:
+                    budget -= 1
+                    self.expired += 1
+                elif len(sessions) > self.max_sessions:
+                    self.evicted += 1
+                else:
+                    break
+                sessions.popitem(last=False)
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """Return the session for ``session_id`` without touching it, or None."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None or self._clock() - session.touched > self.ttl:
+            return None
+        return session
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> dict:
+        return {
+            'sessions': len(self._sessions),
+            'max_sessions': self.max_sessions,
+            'history': self.history,
+            'created': self.created,
+            'expired': self.expired,
+            'evicted': self.evicted,
+        }
+
+
+def follow_up(msg: str, session: Session, index) -> Optional[Tuple[str, str]]:
+    """Answer a follow-up to the session's previous message.
+
+    Handles "another one" (and similar) after a rule whose reply does not need
+    a regex match, and an expression starting with an operator ("and times 3",
+    "minus (4 / 2)") after a numeric answer, computed by :mod:`calc`. Returns
+    (intent, reply), or None when ``msg`` is not a follow-up the session can
+    answer.
+    """
+    if session.last_result is not None:
+        try:
+            program = compile_expression(_CONTINUATION.match(msg).group(1), continues=True)
+        except CalcError:
+            program = None  # Not arithmetic; it may still be another kind of follow-up.
+        if program is not None:
+            try:
+                session.last_result = run(program, session.last_result)
+            except CalcError as exc:
+                return 'math', str(exc)
+            return 'math', f"The answer is {format_number(session.last_result)}."
+    if session.last_intent is not None and _MORE.match(msg):
+        rule = index.by_name.get(session.last_intent)
+        if rule is not None and not rule.capturing:
+            return rule.name, rule.respond(None)
+    return None
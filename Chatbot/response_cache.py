@@ -0,0 +1,91 @@
+"""
+Bounded LRU cache of resolved chatbot messages.
+
+Real traffic repeats a small set of phrases, so the rule lookup for a
+normalized message is worth remembering. An entry holds the winning rule and
+its match object (or nothing, for a message no rule matches) and, for rules
+whose reply depends only on the message, the reply text too. Random-pool and
+clock-based rules keep only the resolution, so every hit still draws a fresh
+line or reads the clock.
+
+Entries belong to one :class:`rules.RuleIndex`; when the rule file is
+reloaded, the cache empties itself on the next lookup.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+# A cached resolution: (rule or None, match or None, reply or None).
+Entry = Tuple[object, object, Optional[str]]
+
+
+class ResponseCache:
+    """Thread-safe LRU cache keyed on the normalized message.
+
+    ``maxsize`` bounds the number of entries; 0 disables caching. Messages
+    longer than ``max_key_length`` are never stored, so a few huge inputs
+    cannot pin much memory. Counters for hits, misses and evictions are
+    reported by :meth:`stats`.
+    """
+
+    def __init__(self, maxsize: int = 1024, max_key_length: int = 256):
+        self.maxsize = maxsize
+        self.max_key_length = max_key_length
+        self._entries = OrderedDict()
+        self._index = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, msg: str, index) -> Optional[Entry]:
+        """Return the entry for ``msg`` resolved against ``index``, or None."""
+        if not self.maxsize or len(msg) > self.max_key_length:
+            return None
+        with self._lock:
+            if index is not self._index:
+                # The rules were reloaded; earlier resolutions may be stale.
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._index = index
+            entry = self._entries.get(msg)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(msg)
+            self.hits += 1
+            return entry
+
+    def put(self, msg: str, index, entry: Entry) -> None:
+        """Store ``entry`` for ``msg``, evicting the least recently used entry if full."""
+        if not self.maxsize or len(msg) > self.max_key_length:
+            return
+        with self._lock:
+            if index is not self._index:
+                return
+            entries = self._entries
+            entries[msg] = entry
+            entries.move_to_end(msg)
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
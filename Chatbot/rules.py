@@ -0,0 +1,357 @@
+"""
+Declarative, hot-reloadable rule table for the chatbot.
+
+The intents (pattern, priority, response pool or fixed reply, or the name of
+a dynamic handler) live in ``rules.json`` next to this module. The file is
+compiled into a :class:`RuleIndex` in which every rule is indexed by the
+literal keywords its pattern starts with, so a message only runs the regexes
+of rules it could possibly trigger. Rules are tried in ascending priority
+order: when several match, the lowest priority number wins.
+
+:class:`RuleStore` owns the live index and swaps in a freshly built one when
+the file's mtime changes. The swap is a single reference assignment, so
+requests already holding the old index finish with it and nothing blocks.
+"""
+
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, date
+from typing import Callable, Dict, Optional, Tuple
+
+from calc import CalcError, evaluate, format_number
+
+try:  # Python 3.11+
+    from re import _constants as _sre, _parser as _sre_parse
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_constants as _sre
+    import sre_parse as _sre_parse
+
+
+logger = logging.getLogger(__name__)
+
+# Default rule file shipped with the app.
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules.json')
+
+
+# -------------------------
+# Dynamic handlers
+# -------------------------
+def _reply_time(match: re.Match) -> str:
+    now = datetime.now().strftime("%H:%M:%S")
+    return f"The current time is {now}."
+
+
+def _reply_date(match: re.Match) -> str:
+    today = date.today().isoformat()
+    return f"Today's date is {today}."
+
+
+def _reply_weekday(match: re.Match) -> str:
+    weekday = datetime.now().strftime("%A")
+    return f"Today is {weekday}."
+
+
+def math_result(match: re.Match) -> Optional[float]:
+    """The value of the expression matched by the ``math`` rule, or None if it can't be computed."""
+    try:
+        return evaluate(match.group(1))
+    except CalcError:
+        return None
+
+
+def _reply_math(match: re.Match) -> str:
+    try:
+        res = evaluate(match.group(1))
+    except CalcError as exc:
+        return str(exc)
+    return f"The answer is {format_number(res)}."
+
+
+def _reply_echo(match: re.Match) -> str:
+    to_say = match.group(1).strip()
+    return f"You asked me to say: {to_say}"
+
+
+HANDLERS: Dict[str, Callable[[re.Match], str]] = {
+    "time": _reply_time,
+    "date": _reply_date,
+    "weekday": _reply_weekday,
+    "math": _reply_math,
+    "echo": _reply_echo,
+}
+
+# Handlers whose reply depends only on the message, so it may be cached.
+DETERMINISTIC_HANDLERS = frozenset({"math", "echo"})
+
+# Handlers that read the groups their pattern captured, so they need a real match.
+CAPTURING_HANDLERS = frozenset({"math", "echo"})
+
+
+def _pick(pool: Tuple[str, ...]) -> Callable[[re.Match], str]:
+    """Build a responder that draws a random line from ``pool``."""
+    return lambda match: random.choice(pool)
+
+
+def _say(text: str) -> Callable[[re.Match], str]:
+    """Build a responder that always returns ``text``."""
+    return lambda match: text
+
+
+# -------------------------
+# Rule index
+# -------------------------
+@dataclass(frozen=True)
+class Rule:
+    """One intent: a compiled pattern and the callable that builds the reply.
+
+    ``deterministic`` is True when the reply depends only on the message
+    (fixed replies and the math/echo handlers), so it can be cached.
+    ``capturing`` is True when ``respond`` reads the match's groups, so the
+    rule can only answer a message its pattern actually matched. ``handler``
+    names the dynamic handler, if the rule uses one.
+    """
+
+    name: str
+    priority: int
+    pattern: re.Pattern
+    respond: Callable[[re.Match], str]
+    deterministic: bool = False
+    capturing: bool = False
+    handler: Optional[str] = None
+
+
+def _literal_prefixes(items, limit=64):
+    """Return the literal strings a match of ``items`` must start with.
+
+    Walks the parsed regex: literals extend the current prefixes, groups and
+    alternations fan out, and anything else (classes, repeats, wildcards,
+    case-insensitive groups) ends them. Returns (prefix, complete) pairs where ``complete`` means the
+    whole of ``items`` was literal, so a caller may keep extending it.
+    """
+    open_ = [""]
+    closed = []
+    for op, av in items:
+        if op is _sre.AT:
+            continue
+        if op is _sre.LITERAL:
+            open_ = [p + chr(av) for p in open_]
+            continue
+        if op is _sre.SUBPATTERN:
+            parts = None if av[1] & _sre.SRE_FLAG_IGNORECASE else _literal_prefixes(av[-1], limit)
+        elif op is _sre.BRANCH:
+            parts = [pc for branch in av[1] for pc in _literal_prefixes(branch, limit)]
+        else:
+            parts = None
+        if parts is None or len(open_) * len(parts) > limit:
+            # The rest of the pattern isn't literal: every prefix ends here.
+            return [(p, False) for p in closed + open_]
+        extended = []
+        for p in open_:
+            for s, complete in parts:
+                (extended if complete else closed).append(p + s)
+        open_ = extended
+        if not open_:
+            return [(p, False) for p in closed]
+    return [(p, False) for p in closed] + [(p, True) for p in open_]
+
+
+def pattern_keywords(pattern: str, complete: bool = False) -> set:
+    """Return the literal strings a match of ``pattern`` must start with ("" if any text can).
+
+    With ``complete``, only strings that make up a whole match are returned.
+    """
+    return {p for p, whole in _literal_prefixes(_sre_parse.parse(pattern)) if whole or not complete}
+
+
+class RuleIndex:
+    """Keyword-to-rule index over a priority-ordered rule table.
+
+    For every rule the literal text its pattern must start with is extracted
+    once (e.g. ``hi``/``hello``/``good`` for greetings). A message is first
+    checked for those keywords with plain substring tests, which yields a
+    bitmask of candidate rules; only candidates are then searched, in
+    priority order. Messages that contain no keyword at all (the fallback
+    path) never run a regex. Rules whose pattern has no literal prefix are
+    always candidates.
+
+    Messages are lowercased before matching, so keywords are lowercase too.
+    A pattern that ignores case or spells a keyword with capitals can match
+    text that doesn't contain the keyword as written (under IGNORECASE the
+    Kelvin sign matches "k", for one), so such rules are always candidates.
+    """
+
+    def __init__(self, rules, fallback: Tuple[str, ...], empty_reply: str):
+        self.rules = tuple(sorted(rules, key=lambda r: r.priority))
+        self.by_name = {rule.name: rule for rule in self.rules}
+        self.fallback = fallback
+        self.empty_reply = empty_reply
+        keywords = {}
+        self._always = 0
+        for i, rule in enumerate(self.rules):
+            literal = pattern_keywords(rule.pattern.pattern)
+            prefixes = {p.lower() for p in literal}
+            if not prefixes or "" in prefixes or prefixes != literal or rule.pattern.flags & re.IGNORECASE:
+                self._always |= 1 << i
+                continue
+            # A keyword containing a shorter keyword of the same rule adds nothing.
+            for p in prefixes:
+                if not any(q != p and q in p for q in prefixes):
+                    keywords[p] = keywords.get(p, 0) | (1 << i)
+        self._keywords = tuple(keywords.items())
+
+    def match(self, msg: str) -> Optional[Tuple[Rule, re.Match]]:
+        """Return the winning rule and its match object, or None."""
+        mask = self._always
+        for keyword, bits in self._keywords:
+            if keyword in msg:
+                mask |= bits
+        rules = self.rules
+        while mask:
+            low = mask & -mask
+            rule = rules[low.bit_length() - 1]
+            m = rule.pattern.search(msg)
+            if m is not None:
+                return rule, m
+            mask ^= low
+        return None
+
+
+def load_rules(path: str) -> RuleIndex:
+    """Read a rule file and build its index.
+
+    Raises ValueError (or ``re.error``) when the file is malformed, so a bad
+    edit never replaces a working index.
+    """
+    with open(path, encoding='utf-8') as fh:
+        doc = json.load(fh)
+
+    pools = {name: tuple(lines) for name, lines in doc.get('pools', {}).items()}
+    for name, lines in pools.items():
+        if not lines:
+            raise ValueError(f"pool {name!r} is empty")
+
+    def pool(name):
+        try:
+            return pools[name]
+        except KeyError:
+            raise ValueError(f"unknown pool {name!r}") from None
+
+    rules = []
+    for entry in doc.get('rules', []):
+        name = entry.get('name')
+        if not name or 'pattern' not in entry:
+            raise ValueError(f"rule {entry!r} needs a name and a pattern")
+        if 'handler' in entry:
+            if entry['handler'] not in HANDLERS:
+                raise ValueError(f"rule {name!r}: unknown handler {entry['handler']!r}")
+            respond = HANDLERS[entry['handler']]
+            deterministic = entry['handler'] in DETERMINISTIC_HANDLERS
+            capturing = entry['handler'] in CAPTURING_HANDLERS
+        elif 'pool' in entry:
+            respond = _pick(pool(entry['pool']))
+            deterministic = capturing = False
+        elif 'reply' in entry:
+            respond = _say(entry['reply'])
+            deterministic, capturing = True, False
+        else:
+            raise ValueError(f"rule {name!r} needs a reply, pool or handler")
+        rules.append(Rule(name, int(entry.get('priority', 0)), re.compile(entry['pattern']),
+                          respond, deterministic, capturing, entry.get('handler')))
+
+    return RuleIndex(rules, pool(doc.get('fallback', 'fallback')), doc.get('empty_reply', ''))
+
+
+class RuleStore:
+    """Holds the live :class:`RuleIndex` and reloads it when the file changes.
+
+    The file's mtime is checked at most once per ``check_interval`` seconds.
+    Only one thread rebuilds at a time and it does so without holding up
+    readers: other threads keep using the current index until the new one is
+    assigned. A rule file that fails to load is logged and skipped.
+    """
+
+    def __init__(self, path: str = DEFAULT_RULES_PATH, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._next_check = 0.0
+        self.reloads = 0
+        self.reload_errors = 0
+        self.last_reload_seconds = 0.0
+        self.total_reload_seconds = 0.0
+        self.matches = 0
+        self.total_match_seconds = 0.0
+        self.max_match_seconds = 0.0
+        self._mtime = os.stat(path).st_mtime_ns
+        self._index = self._build()
+
+    def _build(self) -> RuleIndex:
+        start = time.perf_counter()
+        index = load_rules(self.path)
+        elapsed = time.perf_counter() - start
+        self.reloads += 1
+        self.last_reload_seconds = elapsed
+        self.total_reload_seconds += elapsed
+        return index
+
+    @property
+    def index(self) -> RuleIndex:
+        """The current index, reloaded first if the rule file has changed."""
+        now = time.monotonic()
+        if now >= self._next_check and self._lock.acquire(blocking=False):
+            try:
+                self._next_check = now + self.check_interval
+                self._reload_if_changed()
+            finally:
+                self._lock.release()
+        return self._index
+
+    def _reload_if_changed(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as exc:
+            logger.warning("Cannot stat rule file %s: %s", self.path, exc)
+            return
+        if mtime == self._mtime:
+            return
+        # Remember the mtime even on failure so a broken file isn't retried
+        # on every check; the next save will trigger another attempt.
+        self._mtime = mtime
+        try:
+            index = self._build()
+        except (OSError, ValueError, re.error) as exc:
+            self.reload_errors += 1
+            logger.error("Keeping previous rules; failed to load %s: %s", self.path, exc)
+            return
+        self._index = index
+        logger.info("Reloaded %d rules from %s in %.2f ms",
+                    len(index.rules), self.path, self.last_reload_seconds * 1000)
+
+    def record_match(self, seconds: float) -> None:
+        """Account one message's match latency."""
+        with self._stats_lock:
+            self.matches += 1
+            self.total_match_seconds += seconds
+            if seconds > self.max_match_seconds:
+                self.max_match_seconds = seconds
+
+    def stats(self) -> dict:
+        """Reload cost and per-message match latency, for the stats endpoint."""
+        matches = self.matches
+        return {
+            'rules': len(self._index.rules),
+            'reloads': self.reloads,
+            'reload_errors': self.reload_errors,
+            'last_reload_ms': self.last_reload_seconds * 1000,
+            'total_reload_ms': self.total_reload_seconds * 1000,
+            'matches': matches,
+            'avg_match_us': (self.total_match_seconds / matches * 1e6) if matches else 0.0,
+            'max_match_us': self.max_match_seconds * 1e6,
+        }
@@ -0,0 +1,15 @@
+"""
+Test setup: the chatbot's modules are imported from the Chatbot folder, as
+``python app.py`` does, and the app is configured before its first import.
+"""
+
+import os
+import sys
+
+CHATBOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CHATBOT_DIR)
+
+# Replies must come from the rules alone: no trained intent classifier (a
+# model file may exist locally) and no metrics.
+os.environ['CHATBOT_CLASSIFIER'] = os.path.join(CHATBOT_DIR, 'tests', 'no-intent-model.json')
+os.environ.pop('CHATBOT_METRICS', None)
@@ -0,0 +1,56 @@
+"""
+Request validation of ``/chat``, in the Flask view and the native ASGI one:
+malformed input gets a 400, never a 500.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import app
+import asgi
+
+BAD_BODIES = [
+    ({'message': 123}, 'Expected the message to be a string'),
+    ({'message': ['hi']}, 'Expected the message to be a string'),
+    ({'message': None}, 'Expected the message to be a string'),
+    (['hello'], 'Expected a JSON object'),
+    ('hello', 'Expected a JSON object'),
+    (7, 'Expected a JSON object'),
+]
+
+
+def asgi_chat(body: bytes):
+    """Run asgi.chat on ``body``; returns (status, decoded JSON reply)."""
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': 'POST', 'path': '/chat', 'headers': []}
+    status = asyncio.run(asgi.chat(scope, receive, send))
+    assert sent[0]['status'] == status
+    return status, json.loads(sent[1]['body'])
+
+
+@pytest.mark.parametrize('body,error', BAD_BODIES)
+def test_flask_chat_rejects_bad_bodies(body, error):
+    response = app.app.test_client().post('/chat', json=body)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': error}
+
+
+@pytest.mark.parametrize('body,error', BAD_BODIES)
+def test_asgi_chat_rejects_bad_bodies(body, error):
+    assert asgi_chat(json.dumps(body).encode()) == (400, {'error': error})
+
+
+def test_both_views_answer_a_message():
+    expected = app.get_bot_response('what is 2 + 3')
+    assert app.app.test_client().post('/chat', json={'message': 'what is 2 + 3'}).get_json()['reply'] == expected
+    status, reply = asgi_chat(b'{"message": "what is 2 + 3"}')
+    assert status == 200 and reply['reply'] == expected
@@ -0,0 +1,132 @@
+"""
+ContextStore bounds and follow-up answers, at production-sized session counts.
+
+The store takes its clock as an argument, so these tests drive time by hand
+instead of sleeping.
+"""
+
+import json
+import math
+import tracemalloc
+
+import pytest
+
+import app
+import rules
+from context import EXPIRE_BATCH, MAX_TURN_CHARS, ContextStore, Session, follow_up
+
+# Sessions created by the high-count tests; the app's default cap is 100,000.
+SESSIONS = 100_000
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_cap_holds_under_lru_eviction(clock):
+    cap = SESSIONS // 2
+    store = ContextStore(ttl=math.inf, max_sessions=cap, clock=clock)
+    for i in range(SESSIONS):
+        store.session(f's{i}')
+        if i % 100 == 0:
+            store.session('s0')  # Kept recently used, so never the one evicted.
+        assert len(store) <= cap
+        clock.now += 0.001
+    assert len(store) == cap
+    assert store.evicted == SESSIONS - cap
+    assert store.get('s0') is not None
+    assert store.get('s1') is None  # Oldest untouched sessions went first.
+    assert store.get(f's{SESSIONS - cap}') is None
+    assert store.get(f's{SESSIONS - cap + 1}') is not None
+    assert store.get(f's{SESSIONS - 1}') is not None
+
+
+def test_expired_sessions_are_never_handed_out(clock):
+    store = ContextStore(ttl=10, max_sessions=SESSIONS, clock=clock)
+    old = {i: store.session(f's{i}') for i in range(0, SESSIONS, 1000)}
+    for i in range(SESSIONS):
+        store.session(f's{i}').last_result = 1.0
+    clock.now = 10.5
+    store.session('s1').last_result = 2.0  # Touched, so it lives on.
+    for i in range(0, SESSIONS, 997):
+        assert store.get(f's{i}') is None
+    clock.now = 11
+    for i, session in old.items():
+        # Still held (the sweep is batched), but a fresh session comes back.
+        fresh = store.session(f's{i}')
+        assert fresh is not session
+        assert fresh.last_result is None and fresh.turns == []
+    assert store.session('s1').last_result == 2.0
+
+
+def test_expiry_sweep_catches_up(clock):
+    store = ContextStore(ttl=10, max_sessions=SESSIONS, clock=clock)
+    for i in range(SESSIONS):
+        store.session(f'old{i}')
+    clock.now = 20
+    calls = 0
+    while len(store) > calls:
+        before = len(store)
+        store.session(f'new{calls}')
+        calls += 1
+        # One new session in, at most EXPIRE_BATCH expired ones out.
+        assert len(store) >= before + 1 - EXPIRE_BATCH
+    assert calls == math.ceil(SESSIONS / EXPIRE_BATCH)
+    assert store.expired == SESSIONS
+    assert store.evicted == 0
+    assert store.get('old0') is None and store.get(f'new{calls - 1}') is not None
+
+
+def test_ring_buffer_overwrites_oldest_turn():
+    session = Session(0.0)
+    for i in range(6):
+        session.record(f'message {i}', f'intent{i}', history=4)
+    assert len(session.turns) == 4
+    assert [turn.message for turn in session.recent()] == [f'message {i}' for i in range(2, 6)]
+    assert session.last_intent == 'intent5'
+    session.record('x' * 500, None, history=4)
+    assert session.recent()[-1].message == 'x' * MAX_TURN_CHARS
+    assert session.recent()[0].message == 'message 3'
+
+
+def test_memory_per_session_stays_small(clock):
+    count = SESSIONS // 5
+    store = ContextStore(ttl=math.inf, max_sessions=count, history=4, clock=clock)
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        for i in range(count):
+            session = store.session(f'{i:016d}')
+            for turn in range(6):
+                session.record(f'what is {i} plus {turn}, and then some more words', 'math', store.history)
+        used = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+    # The README quotes about 0.8 KB per session, key and turns included.
+    assert used / count < 1200
+
+
+def test_follow_ups():
+    index = app.RULE_STORE.index
+    _, session = app.chat_session(None)
+    assert app.get_bot_response('what is 2 + 3', session) == "The answer is 5."
+    assert app.get_bot_response('and times 3', session) == "The answer is 15."
+    assert app.get_bot_response('then minus (4 / 2).', session) == "The answer is 13."
+    # Punctuation alone, or a bare number, doesn't continue the sum.
+    for msg in ('?', '.', '!', 'and', '3', '(2)'):
+        assert follow_up(msg, session, index) is None
+    assert follow_up('then divide by 0', session, index) == ('math', "I can't divide by zero.")
+    app.get_bot_response('tell me a joke', session)
+    intent, reply = follow_up('another one', session, index)
+    with open(rules.DEFAULT_RULES_PATH, encoding='utf-8') as fh:
+        jokes = json.load(fh)['pools']['jokes']
+    assert intent == 'joke' and reply in jokes
@@ -0,0 +1,356 @@
+"""
+Reply equivalence between the rule engine and the original if/elif chain.
+
+``baseline_response`` is a frozen copy of ``get_bot_response`` as it was
+before the rules moved to ``rules.json``. ``random`` is seeded identically
+before each call, so randomly drawn replies are comparable, and the clock is
+frozen, so time and date replies can't tick over between the two calls.
+
+The ``math`` rule has since grown from one binary operator to whole
+expressions (see calc.py). Messages either side answers as math are
+therefore left out of the corpus comparison and checked separately, on the
+single-operator phrasings the chain understood.
+"""
+
+import random
+import re
+import sys
+from datetime import datetime, date
+
+import pytest
+
+import app
+import rules
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 5, 17, 9, 30, 15)
+
+
+class FrozenDate(date):
+    @classmethod
+    def today(cls):
+        return cls(2024, 5, 17)
+
+
+@pytest.fixture(autouse=True)
+def frozen_clock(monkeypatch):
+    for module in (rules, sys.modules[__name__]):
+        monkeypatch.setattr(module, 'datetime', FrozenDatetime)
+        monkeypatch.setattr(module, 'date', FrozenDate)
+
+
+# -------------------------
+# The original rule chain
+# -------------------------
+def baseline_response(message: str) -> str:
+    """The original chain, kept verbatim apart from its name."""
+    msg = (message or '').lower().strip()
+
+    # quick empty guard
+    if not msg:
+        return "I didn't catch that — could you please type something?"
+
+    # Response pools
+    greetings = [
+        "Hey there! How are you doing today?",
+        "Hello! Nice to meet you — what's on your mind?",
+        "Hi! I'm here to chat whenever you're ready.",
+        "Hey! How's your day going so far?",
+        "Hi there! What would you like to talk about?",
+    ]
+
+    farewells = [
+        "Goodbye, come chat again soon!",
+        "See you later — take care!",
+        "Bye! It was great talking with you.",
+        "Catch you later!",
+    ]
+
+    thanks = [
+        "You're welcome!",
+        "No problem — happy to help!",
+        "Anytime! If you have more questions, just ask.",
+    ]
+
+    jokes = [
+        "Why did the computer catch a cold? It left its Windows open.",
+        "Why do programmers prefer dark mode? Because light attracts bugs!",
+        "Why was the robot so bad at soccer? It kept stopping to recharge its batteries.",
+        "I would tell you a UDP joke, but you might not get it.",
+        "Why don't keyboards sleep? They have two shift keys.",
+    ]
+
+    weather_replies = [
+        "I can't check real-time weather, but I hope it's nice where you are!",
+        "I don't have live weather data, but remember: an umbrella is handy if clouds appear.",
+        "Can't fetch live weather here — try a weather website or app for the latest forecast.",
+    ]
+
+    colors = ["blue", "green", "purple", "teal", "amber", "mint"]
+
+    hobbies = [
+        "I enjoy 'reading' logs and learning from examples.",
+        "I like talking about ideas and trying to be helpful.",
+    ]
+
+    advice = [
+        "If you're stuck, try breaking the problem into smaller steps.",
+        "Taking a short break often helps recharge your focus.",
+    ]
+
+    quotes = [
+        "The only limit to our realization of tomorrow is our doubts of today. — F. D. Roosevelt",
+        "Code is like humor. When you have to explain it, it’s bad. — Cory House",
+    ]
+
+    # prepare matchers used by some branches
+    math_match = re.search(r"what(?:'s| is)?\s+(-?\d+(?:\.\d+)?)\s*([+\-*/x×])\s*(-?\d+(?:\.\d+)?)", msg)
+    echo_match = re.search(r"\b(?:repeat after me|say)\s+(.+)", msg)
+
+    # 1) Greetings
+    if re.search(r"\b(hi|hello|hey|hiya|good\s(morning|afternoon|evening))\b", msg):
+        return random.choice(greetings)
+
+    # 2) Farewell
+    elif re.search(r"\b(bye|goodbye|see you|see ya|later|farewell)\b", msg):
+        return random.choice(farewells)
+
+    # 3) Thanks / gratitude
+    elif re.search(r"\b(thank(s| you)?|thx|ty)\b", msg):
+        return random.choice(thanks)
+
+    # 4) Asking for the bot's name or identity
+    elif re.search(r"\b(your name|what.?s your name|who are you|identify yourself)\b", msg):
+        return "I'm your friendly rule-based chatbot!"
+
+    # 5) Creator / origin
+    elif re.search(r"\b(who (made|created) you|who (is )?your creator|built you)\b", msg):
+        return "I was created by a developer using Python and Flask — you can expand my rules anytime!"
+
+    # 6) Jokes / humor
+    elif re.search(r"\b(joke|tell me a joke|make me laugh|funny)\b", msg):
+        return random.choice(jokes)
+
+    # 7) Weather-related
+    elif re.search(r"\b(weather|rain|sunny|cloudy|temperature|forecast)\b", msg):
+        return random.choice(weather_replies)
+
+    # 8) Time and date
+    elif re.search(r"\b(time|current time|what time)\b", msg):
+        now = datetime.now().strftime("%H:%M:%S")
+        return f"The current time is {now}."
+
+    elif re.search(r"\b(date|today's date|what date|today date)\b", msg):
+        today = date.today().isoformat()
+        return f"Today's date is {today}."
+
+    # 9) Day of the week
+    elif re.search(r"\b(day|weekday|what day|which day)\b", msg):
+        weekday = datetime.now().strftime("%A")
+        return f"Today is {weekday}."
+
+    # 10) How are you / status
+    elif re.search(r"\b(how are you|how's it going|how are things|how you doing)\b", msg):
+        return "I'm a program, so I don't have feelings, but I'm running smoothly and ready to chat!"
+
+    # 11) Mood / feelings empathy
+    elif re.search(r"\b(sad|unhappy|depressed|upset|angry|down)\b", msg):
+        return "I'm sorry you're feeling that way. If you'd like to talk about it, I'm here to listen."
+
+    # 12) Favorite color
+    elif re.search(r"\b(favorite color|favourite colour|what color do you like|favou?rite color)\b", msg):
+        return f"I like {random.choice(colors)} — it's soothing for bot eyes."
+
+    # 13) Basic math like 'what is 2 + 2' or 'calculate 7*8'
+    elif math_match:
+        a = float(math_match.group(1))
+        op = math_match.group(2)
+        b = float(math_match.group(3))
+        try:
+            if op in ['+', 'plus']:
+                res = a + b
+            elif op in ['-', '−', 'minus']:
+                res = a - b
+            elif op in ['*', 'x', '×']:
+                res = a * b
+            elif op == '/':
+                if b == 0:
+                    return "I can't divide by zero."
+                res = a / b
+            else:
+                return "I couldn't parse that operator. Try +, -, * or /."
+            if float(res).is_integer():
+                res = int(res)
+            return f"The answer is {res}."
+        except Exception:
+            return "I couldn't compute that — maybe check the numbers?"
+
+    # 14) Ask for help or capabilities
+    elif re.search(r"\b(help|what can you do|capabilities|features|commands)\b", msg):
+        return (
+            "I can respond to greetings, tell jokes, report the current time/date, do simple math, "
+            "and answer other simple questions. Try: 'Hi', 'Tell me a joke', 'What time is it?', or 'What is 3 + 4'."
+        )
+
+    # 15) Privacy-safe replies to personal info requests
+    elif re.search(r"\b(age|how old are you|phone|address|social security|ssn|email)\b", msg):
+        return "I don't share personal or private information. I'm a simple demo chatbot."
+
+    # 16) Echo / repeat
+    elif echo_match:
+        to_say = echo_match.group(1).strip()
+        return f"You asked me to say: {to_say}"
+
+    # 17) Ask for example conversation or sample commands
+    elif re.search(r"\b(example|sample|commands|usage)\b", msg):
+        return (
+            "Try: 'Hi', 'What's your name?', 'Tell me a joke', 'What time is it?', 'What is 3 + 4', 'What's the weather like?', or 'Bye'."
+        )
+
+    # 18) If user says they like something, respond amicably
+    elif re.search(r"\b(i like|i love|i enjoy|i'm into)\b", msg):
+        return "That's great! It's nice to hear what you enjoy."
+
+    # 19) Compliment / small talk
+    elif re.search(r"\b(nice|cool|awesome|great|good job|well done)\b", msg):
+        return "Thanks! I try my best to be helpful."
+
+    # 20) Hobbies or interests
+    elif re.search(r"\b(hobby|hobbies|what do you do for fun|interests)\b", msg):
+        return random.choice(hobbies)
+
+    # 21) Simple advice
+    elif re.search(r"\b(advice|suggest|tip|tips)\b", msg):
+        return random.choice(advice)
+
+    # 22) Quotes
+    elif re.search(r"\b(quote|inspire|motivate|motivation)\b", msg):
+        return random.choice(quotes)
+
+    # 23) Programming related (simple)
+    elif re.search(r"\b(programming|code|python|javascript|java|bug|debug)\b", msg):
+        return "I can talk about programming basics. What's your language or question?"
+
+    # 24) Food / breakfast / coffee small talk
+    elif re.search(r"\b(food|hungry|breakfast|lunch|dinner|coffee|tea)\b", msg):
+        return "I don't eat, but I can help you find a recipe or suggest something tasty!"
+
+    # 25) Small talk about news or current events
+    elif re.search(r"\b(news|updates|headlines|current events)\b", msg):
+        return "I don't fetch live news here, but you can check a news site or ask me for general topics."
+
+    # 26) Favorite programming language (playful)
+    elif re.search(r"\b(favorite language|fav programming|what language)\b", msg):
+        return "I speak JSON, Python, and a little bit of human. 😉"
+
+    # 27) Fallback: default reply with a tip so user knows what to try next
+    else:
+        fallback_responses = [
+            "I didn't quite understand that. Try asking for the time, a joke, or say 'help'.",
+            "Huh — I don't know that one yet. Ask me for a joke or the time, or try a different phrase.",
+            "I'm still learning new phrases. You can ask me 'What can you do?' for ideas.",
+        ]
+        return random.choice(fallback_responses)
+
+
+# -------------------------
+# Corpus
+# -------------------------
+PHRASES = [
+    "hi", "hello there", "good morning", "bye", "see you later", "thanks", "thank you so much", "ty",
+    "what's your name", "who are you", "who made you", "who is your creator", "tell me a joke", "that's funny",
+    "weather today?", "is it sunny", "what time is it", "time", "what date is it", "today's date",
+    "what day is it", "which day", "how are you", "how's it going", "i'm sad", "feeling down",
+    "favorite color", "favourite colour", "what color do you like", "help", "what can you do",
+    "how old are you", "email me", "repeat after me hello world", "say cheese", "say", "example", "usage",
+    "i like pizza", "i love you", "i'm into code", "nice", "well done", "good job on the date", "hobby",
+    "what do you do for fun", "advice", "tips", "quote", "motivate me", "python code", "debug my java",
+    "hungry", "coffee", "news", "headlines", "current events", "updates please", "favorite language",
+    "fav programming", "what language", "xyz", "", "   ", "asdf qwerty", "hi bye", "bye hi", "say hi",
+    "tell me a joke about the weather at this time", "thy", "they", "hithere", "chi", "later hello",
+    "sayonara", "HELLO", "  Thanks!  ", "say what is 2+2", "what is 2+2 say hello",
+]
+
+# Phrasings the chain's math branch understood: what / what's / what is, then a op b.
+MATH_PHRASES = [
+    "what is 2 + 2", "what's 7*8", "what is 10 / 0", "what is 3 x 4", "what is -2.5 - 1.5",
+    "what is 9 × 3", "what's 2/3", "what is 1.5*2", "what is 5 + 5 today", "what 6 -1",
+    "tell me what's 12/4 please", "what is 0.1 + 0.2",
+]
+
+BASELINE_MATH = re.compile(r"what(?:'s| is)?\s+(-?\d+(?:\.\d+)?)\s*([+\-*/x×])\s*(-?\d+(?:\.\d+)?)")
+
+
+def corpus(size=20000, seed=1):
+    """The phrases above plus ``size`` random jumbles of their words."""
+    words = [w for phrase in PHRASES + MATH_PHRASES for w in phrase.split()]
+    words += ["the", "a", "is", "it", "and", "?", "!", "2", "+", "3", "calculate", "compute"]
+    rng = random.Random(seed)
+    messages = PHRASES + MATH_PHRASES
+    for _ in range(size):
+        messages.append(" ".join(rng.choice(words) for _ in range(rng.randint(1, 7))))
+    return messages
+
+
+def rule_index():
+    return app.RULE_STORE.index
+
+
+def is_math(message):
+    msg = (message or '').lower().strip()
+    hit = rule_index().match(msg) if msg else None
+    return BASELINE_MATH.search(msg) is not None or (hit is not None and hit[0].name == 'math')
+
+
+def replies(message, seed):
+    random.seed(seed)
+    expected = baseline_response(message)
+    random.seed(seed)
+    return expected, app.get_bot_response(message)
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_corpus_replies_match_baseline():
+    messages = [m for m in corpus() if not is_math(m)]
+    assert len(messages) > 15000
+    # Twice over, so the second pass goes through the response cache.
+    mismatches = [(m, *pair) for m in messages + messages
+                  for pair in [replies(m, m)] if pair[0] != pair[1]]
+    assert mismatches == []
+
+
+def test_math_phrasings_match_baseline():
+    for message in MATH_PHRASES:
+        expected, reply = replies(message, message)
+        assert reply == expected, message
+
+
+def test_every_rule_is_exercised():
+    # Guard against the corpus drifting away from the rules it is meant to cover.
+    index = rule_index()
+    hit = {index.match(m.lower().strip())[0].name for m in corpus() if m.strip() and index.match(m.lower().strip())}
+    assert hit == {rule.name for rule in index.rules}
+
+
+def test_case_insensitive_and_capitalised_rules_are_candidates():
+    # Rule files are edited by hand; a rule must fire whenever its regex
+    # matches the lowercased message, whatever case its pattern is written in.
+    def rule(name, pattern):
+        return rules.Rule(name, 0, re.compile(pattern), lambda match: name)
+
+    index = rules.RuleIndex([
+        rule('global', r'(?i)\bQuux\b'),
+        rule('scoped', r'\bhey (?i:Zorp)\b'),
+        rule('capital', r'\bFoo|bar\b'),
+        rule('plain', r'\bbaz\b'),
+    ], fallback=('?',), empty_reply='')
+    assert index.match('oh quux!')[0].name == 'global'
+    assert index.match('hey zorp')[0].name == 'scoped'
+    assert index.match('bar')[0].name == 'capital'
+    assert index.match('baz')[0].name == 'plain'
+    assert index.match('foo') is None
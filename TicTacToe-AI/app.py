@@ -1,16 +1,148 @@
+import time
+
+# Taken before the other imports, for the import time reported in STARTUP.
+_IMPORT_START = time.perf_counter()
+
 from flask import Flask, render_template, request, jsonify
+import importlib.util
+import json
 import math
+import os
+import re
+
+from functools import lru_cache
+
+import bitboard
+import game_metrics
+from game_store import MAX_SIZE, Game, MemoryGameStore, SQLiteGameStore, new_game_id
+from mnk import MNKEngine
+from opening_book import OpeningBook
+from parallel_search import ParallelRootSearch
+from perfect_table import PerfectPlayTable
+
+# Batch analysis (/analyze) needs NumPy; playing does not. NumPy is only
+# imported by the first /analyze request (or by warm_up), so workers that never
+# analyze don't pay for it at startup.
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+# Static files (the page's WebSocket channel script) are shared with the
+# chatbot, in static/ at the repository root.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+app = Flask(__name__, static_folder=STATIC_DIR)
+
+# Which engine picks the AI's moves:
+#   'minimax' - search the game tree with minimax on every move (default).
+#   'table'   - look the move up in a table of all solved positions, built at
+#               startup or loaded from TICTACTOE_TABLE_PATH if that file exists.
+#   'bitboard' - search with the bitboard engine in bitboard.py, which memoizes
+#               positions (up to symmetry) in a transposition table.
+#   'parallel' - the 'minimax' search with its root moves split across a pool
+#               of TICTACTOE_PARALLEL_WORKERS processes (default: one per CPU),
+#               for positions with at least TICTACTOE_PARALLEL_MIN_EMPTY empty
+#               cells (default 8). It always picks the same move as 'minimax'.
+# TICTACTOE_ENGINE selects the engine for every worker; an unknown name stops
+# the app at startup rather than quietly running minimax. POST /engine can
+# switch it at runtime, but it only exists when TICTACTOE_ENGINE_SWITCH is 1,
+# true, yes or on: it is unauthenticated and changes only the worker process
+# that answers it, so it is meant for single-process development and benchmarking.
+ENGINES = ('minimax', 'table', 'bitboard', 'parallel')
+ENGINE = os.environ.get('TICTACTOE_ENGINE', 'minimax')
+if ENGINE not in ENGINES:
+    raise ValueError(f"TICTACTOE_ENGINE={ENGINE!r} is not one of {', '.join(ENGINES)}")
+ENGINE_SWITCH = os.environ.get('TICTACTOE_ENGINE_SWITCH', '').strip().lower() in ('1', 'true', 'yes', 'on')
+PERFECT_TABLE = None
+
+def load_perfect_table():
+    """
+    Builds (or loads) the perfect-play table the first time it is needed.
+    """
+    global PERFECT_TABLE
+    if PERFECT_TABLE is None:
+        PERFECT_TABLE = PerfectPlayTable(os.environ.get('TICTACTOE_TABLE_PATH'))
+        app.logger.info("Perfect-play table ready: %s", PERFECT_TABLE.info())
+    return PERFECT_TABLE
+
+if ENGINE == 'table':
+    load_perfect_table()
+
+# Opening book consulted before the 'minimax' and 'parallel' searches: a
+# perfect-play table file, whole or cut down by `python opening_book.py build`,
+# named by TICTACTOE_BOOK_PATH; every worker maps the same file read-only.
+OPENING_BOOK = OpeningBook(os.environ['TICTACTOE_BOOK_PATH']) if os.environ.get('TICTACTOE_BOOK_PATH') else None
+
+# Larger boards (anything but 3x3 with 3 in a row) are played by the
+# generalized engine in mnk.py, which searches within a per-move time budget.
+MAX_BOARD_SIZE = 9
+# Stored games give the size and win length one digit each (see game_store.py).
+assert MAX_BOARD_SIZE <= MAX_SIZE
+TIME_BUDGET = float(os.environ.get('TICTACTOE_TIME_BUDGET', '1.0'))  # seconds per AI move
+
+@lru_cache(maxsize=None)
+def get_mnk_engine(size, k):
+    """Returns the (cached) generalized engine for a size x size board with k in a row."""
+    return MNKEngine(size, k)
 
-app = Flask(__name__)
+def game_engine(game):
+    """Returns the generalized engine for `game`, or None for the classic 3x3 game."""
+    if (game.size, game.k) == (3, 3):
+        return None
+    return get_mnk_engine(game.size, game.k)
+
+# Every player gets their own game, identified by a game ID kept in a cookie
+# (or sent explicitly as 'gameId'). Games live in an in-process store by
+# default; set TICTACTOE_STORE=sqlite to share them between worker processes
+# through a SQLite file (TICTACTOE_STORE_PATH, default instance/games.db).
+GAME_COOKIE = 'game_id'
+GAME_TTL = float(os.environ.get('TICTACTOE_GAME_TTL', '3600'))     # idle seconds before a game is dropped
+MAX_GAMES = int(os.environ.get('TICTACTOE_MAX_GAMES', '100000'))   # live games kept at most
+
+# Game IDs come from clients and become store keys and cookie values, so only
+# short URL-safe IDs like the ones new_game_id() makes are accepted.
+_GAME_ID = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+def valid_game_id(game_id):
+    """
+    Returns `game_id` if it is an acceptable game ID, else None.
 
-# The game board, represented as a list of 9 strings.
-# Each element can be '', 'X', or 'O'.
-board = ['' for _ in range(9)]
-# Global variables to store the symbols for the human player and the AI.
-# These are initialized with defaults but can be changed by the player.
+    Args:
+        game_id: A game ID sent by a client, of any type.
+
+    Returns:
+        str: `game_id`, or None if it is not a string of 1 to 64 URL-safe characters.
+    """
+    if isinstance(game_id, str) and _GAME_ID.fullmatch(game_id):
+        return game_id
+    return None
+
+def create_game_store():
+    """Builds the game store selected by TICTACTOE_STORE."""
+    if os.environ.get('TICTACTOE_STORE', 'memory') == 'sqlite':
+        path = os.environ.get('TICTACTOE_STORE_PATH')
+        if not path:
+            os.makedirs(app.instance_path, exist_ok=True)
+            path = os.path.join(app.instance_path, 'games.db')
+        return SQLiteGameStore(path, ttl=GAME_TTL, max_games=MAX_GAMES)
+    return MemoryGameStore(ttl=GAME_TTL, max_games=MAX_GAMES)
+
+GAMES = create_game_store()
+
+# Request latency and per-move search statistics served at /metrics; only
+# collected when TICTACTOE_METRICS is set, otherwise METRICS is None.
+METRICS = game_metrics.GameMetrics() if game_metrics.enabled() else None
+game_metrics.instrument(app, METRICS)
+
+# Default symbols used by minimax/get_best_move when none are passed in.
 HUMAN = 'X'  # Default human player symbol
 AI = 'O'     # Default AI player symbol
 
+# All possible winning combinations (rows, columns, and diagonals). Built once
+# here rather than on every check_winner call, which minimax makes for every node.
+WIN_LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),  # Rows
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),  # Columns
+    (0, 4, 8), (2, 4, 6),             # Diagonals
+)
+
 def check_winner(board):
     """
     Checks the current state of the board to determine if there's a winner or a tie.
@@ -22,21 +154,12 @@ def check_winner(board):
         str: 'X' if human wins, 'O' if AI wins, 'tie' if the board is full with no winner,
              or None if the game is still ongoing.
     """
-    # Define all possible winning combinations (rows, columns, and diagonals).
-    lines = [
-        [0, 1, 2], [3, 4, 5], [6, 7, 8],  # Rows
-        [0, 3, 6], [1, 4, 7], [2, 5, 8],  # Columns
-        [0, 4, 8], [2, 4, 6]              # Diagonals
-    ]
-    
     # Iterate through each winning line to check if any player has won.
     # A player wins if all three positions in a line are occupied by their symbol
     # and that symbol is not empty.
-
-    
-    for line in lines:
-        if board[line[0]] == board[line[1]] == board[line[2]] != '':
-            return board[line[0]]
+    for a, b, c in WIN_LINES:
+        if board[a] == board[b] == board[c] != '':
+            return board[a]
     
     if '' not in board:
         return 'tie'
@@ -46,7 +169,7 @@ def get_available_moves(board):
     """Return list of empty positions on the board"""
     return [i for i, spot in enumerate(board) if spot == '']
 
-def minimax(board, depth, is_maximizing, alpha, beta):
+def minimax(board, depth, is_maximizing, alpha, beta, ai=None, human=None, stats=None):
     """
     Implements the Minimax algorithm with Alpha-Beta pruning to find the optimal move.
     This function recursively evaluates all possible game states.
@@ -57,18 +180,28 @@ def minimax(board, depth, is_maximizing, alpha, beta):
         is_maximizing (bool): True if it's the AI's turn (maximizing player), False if it's the human's turn (minimizing player).
         alpha (float): The best score that the maximizer currently can guarantee at this level or above.
         beta (float): The best score that the minimizer currently can guarantee at this level or above.
+        ai (str): The AI's symbol (defaults to AI).
+        human (str): The human's symbol (defaults to HUMAN).
+        stats (SearchStats): Optional counters for nodes, prunes and depth (see game_metrics.py).
 
     Returns:
         int: The score of the current board state from the perspective of the AI.
              (1 for AI win, -1 for human win, 0 for tie).
     """
+    if ai is None:
+        ai, human = AI, HUMAN
+    if stats is not None:
+        stats.nodes += 1
+        if depth >= stats.max_depth:
+            stats.max_depth = depth + 1 # The root move itself is ply 1.
+
     # Check for terminal states (win, lose, or tie) to determine the score.
     result = check_winner(board)
     
     # Base cases: If the game has ended, return the corresponding score.
-    if result == AI:
+    if result == ai:
         return 1  # AI wins, return a positive score
-    elif result == HUMAN:
+    elif result == human:
         return -1 # Human wins, return a negative score
     elif result == 'tie':
         return 0  # It's a tie, return a neutral score
@@ -78,9 +211,9 @@ def minimax(board, depth, is_maximizing, alpha, beta):
         best_score = -math.inf # Initialize best_score to negative infinity
         # Iterate through all available moves.
         for move in get_available_moves(board):
-            board[move] = AI # Make the move for the AI
+            board[move] = ai # Make the move for the AI
             # Recursively call minimax for the next turn (minimizing player).
-            score = minimax(board, depth + 1, False, alpha, beta)
+            score = minimax(board, depth + 1, False, alpha, beta, ai, human, stats)
             board[move] = ''   # Undo the move (backtrack) for exploring other branches
             best_score = max(score, best_score) # Update best_score with the maximum score found
             alpha = max(alpha, best_score)       # Update alpha (maximizer's best option)
@@ -88,6 +221,8 @@ def minimax(board, depth, is_maximizing, alpha, beta):
             # it means the current branch won't be chosen by the minimizing player,
             # so we can stop exploring this branch.
             if beta <= alpha:
+                if stats is not None:
+                    stats.prunes += 1
                 break
         return best_score
     # If it's the human's turn (minimizing player).
@@ -95,9 +230,9 @@ def minimax(board, depth, is_maximizing, alpha, beta):
         best_score = math.inf  # Initialize best_score to positive infinity
         # Iterate through all available moves.
         for move in get_available_moves(board):
-            board[move] = HUMAN # Make the move for the human
+            board[move] = human # Make the move for the human
             # Recursively call minimax for the next turn (maximizing player).
-            score = minimax(board, depth + 1, True, alpha, beta)
+            score = minimax(board, depth + 1, True, alpha, beta, ai, human, stats)
             board[move] = ''    # Undo the move (backtrack)
             best_score = min(score, best_score) # Update best_score with the minimum score found
             beta = min(beta, best_score)        # Update beta (minimizer's best option)
@@ -105,10 +240,12 @@ def minimax(board, depth, is_maximizing, alpha, beta):
             # it means the current branch won't be chosen by the maximizing player,
             # so we can stop exploring this branch.
             if beta <= alpha:
+                if stats is not None:
+                    stats.prunes += 1
                 break
         return best_score
 
-def get_best_move(board):
+def get_best_move(board, ai=None, stats=None):
     """
     Determines the best possible move for the AI player using the minimax algorithm.
     It iterates through all available moves, simulates each move, and evaluates it
@@ -116,19 +253,32 @@ def get_best_move(board):
 
     Args:
         board (list): The current state of the Tic-Tac-Toe board.
+        ai (str): The AI's symbol (defaults to AI).
+        stats (SearchStats): Optional counters filled in by the search.
 
     Returns:
         int: The index of the best move for the AI.
     """
+    if ai is None:
+        ai, human = AI, HUMAN
+    else:
+        human = 'O' if ai == 'X' else 'X'
+
+    # A position in the opening book was solved ahead of time; no search needed.
+    if OPENING_BOOK is not None:
+        move = OPENING_BOOK.best_move(board, ai)
+        if move is not None:
+            return move
+
     best_score = -math.inf # Initialize best_score to negative infinity to ensure any valid score is greater.
     best_move = None       # Initialize best_move to None.
     
     # Iterate over all empty spots on the board.
     for move in get_available_moves(board):
-        board[move] = AI # Simulate making the AI's move.
+        board[move] = ai # Simulate making the AI's move.
         # Call minimax to evaluate this move. We assume the human will play optimally (minimizing).
         # The depth is 0 as this is the initial call for a potential move.
-        score = minimax(board, 0, False, -math.inf, math.inf)
+        score = minimax(board, 0, False, -math.inf, math.inf, ai, human, stats)
         board[move] = ''   # Undo the move to restore the board to its original state for the next iteration.
         
         # If the score from this move is better than the current best_score, update best_score and best_move.
@@ -138,6 +288,69 @@ def get_best_move(board):
             
     return best_move
 
+def score_root_move(board, move, ai, alpha):
+    """
+    Scores one root move the way get_best_move does, searched with lower bound `alpha`.
+    Runs in the worker processes of the 'parallel' engine.
+
+    Returns:
+        int: The move's minimax score, or a value <= alpha if it cannot beat alpha.
+    """
+    human = 'O' if ai == 'X' else 'X'
+    board = list(board)
+    board[move] = ai
+    return minimax(board, 0, False, alpha, math.inf, ai, human)
+
+PARALLEL_SEARCH = ParallelRootSearch(
+    score_root_move,
+    workers=int(os.environ.get('TICTACTOE_PARALLEL_WORKERS', '0')) or None,
+    min_empty=int(os.environ.get('TICTACTOE_PARALLEL_MIN_EMPTY', '8')),
+)
+
+def choose_move(game):
+    """
+    Picks the AI's move in `game` with the configured engine.
+
+    Args:
+        game (Game): The game in progress.
+
+    Returns:
+        int: The index of the AI's move, or None if there is none.
+    """
+    if METRICS is None:
+        return search_move(game)
+    stats = game_metrics.SearchStats()
+    start = time.perf_counter()
+    move = search_move(game, stats)
+    engine = 'mnk' if game_engine(game) is not None else ENGINE
+    METRICS.observe_move(engine, time.perf_counter() - start, stats)
+    return move
+
+def search_move(game, stats=None):
+    """
+    Runs the configured engine for `game`; see choose_move.
+
+    Args:
+        game (Game): The game in progress.
+        stats (SearchStats): Optional counters for the searches that support them
+            (minimax and the larger-board engine).
+    """
+    board, ai = game.board, game.ai
+    engine = game_engine(game)
+    if engine is not None:
+        return engine.get_best_move(board, ai, time_budget=TIME_BUDGET, stats=stats)
+    if ENGINE == 'bitboard':
+        return bitboard.get_best_move(board, ai)
+    if ENGINE == 'parallel':
+        move = OPENING_BOOK.best_move(board, ai) if OPENING_BOOK is not None else None
+        return move if move is not None else PARALLEL_SEARCH.best_move(board, ai)
+    if ENGINE == 'table':
+        move = PERFECT_TABLE.best_move(board, ai)
+        if move is not None:
+            return move
+    # Positions the table doesn't cover (or the 'minimax' engine) are searched.
+    return get_best_move(board, ai, stats)
+
 @app.route('/')
 def home():
     """
@@ -146,20 +359,136 @@ def home():
     """
     return render_template('index.html')
 
+def default_win_length(size):
+    """Line length needed to win when the client doesn't choose one."""
+    return min(size, 4 if size <= 5 else 5)
+
+def new_game(game_id, symbol, size=3, k=None):
+    """
+    Starts a new game under `game_id` with the human playing `symbol` and the AI the other one.
+
+    Args:
+        game_id (str): The player's game ID; any previous game under it is replaced.
+        symbol (str): The symbol chosen by the human player ('X' or 'O').
+        size (int): Width and height of the board (3 to MAX_BOARD_SIZE).
+        k (int): Symbols in a row needed to win; defaults to default_win_length(size).
+
+    Returns:
+        dict: The payload returned to the client, or a dict with an 'error' key.
+    """
+    if symbol not in ('X', 'O'):
+        return {'error': "Symbol must be 'X' or 'O'"}
+    try:
+        size = int(size)
+        k = default_win_length(size) if k is None else int(k)
+    except (TypeError, ValueError):
+        return {'error': 'Board size and win length must be integers'}
+    if not 3 <= size <= MAX_BOARD_SIZE or not 3 <= k <= size:
+        return {'error': f'Board size must be 3-{MAX_BOARD_SIZE} and win length 3-size'}
+
+    GAMES.put(game_id, Game(symbol, size, k)) # Start from an empty board.
+    return {'success': True, 'gameId': game_id, 'size': size, 'k': k}
+
+def current_winner(game):
+    """Returns check_winner's result for the game's board and geometry."""
+    engine = game_engine(game)
+    return engine.check_winner(game.board) if engine is not None else check_winner(game.board)
+
+def game_state(game_id, game):
+    """
+    Builds the payload describing a game's board for the client.
+
+    Returns:
+        dict: The board, game over status, winner, the player to move next and the game ID.
+    """
+    winner = current_winner(game)
+    return {
+        'board': game.board,
+        'gameOver': winner is not None,
+        'winner': winner,
+        'currentPlayer': game.human if winner is None else None, # If game not over, it's human's turn.
+        'gameId': game_id,
+    }
+
+def play_move(game_id, position):
+    """
+    Applies a human move (or requests the AI's opening move) and the AI's reply.
+
+    Args:
+        game_id (str): The player's game ID.
+        position (int or None): The cell chosen by the human, or None when the AI
+            should make the first move (e.g. if AI is 'X').
+
+    Returns:
+        dict: The new game state, or a dict with an 'error' key.
+    """
+    game = GAMES.get(game_id) if game_id else None
+    if game is None:
+        return {'error': 'No game in progress, choose a symbol to start one'}
+    board = game.board
+
+    # Scenario 1: AI makes the first move (e.g., if AI is 'X' and starts the game).
+    if position is None:
+        # Check if the board is already full, which would mean no AI move is possible.
+        if '' not in board:
+            return {'error': 'Board is full, cannot make AI move'}
+
+        # Get the best move for the AI from the configured engine.
+        ai_move = choose_move(game)
+        if ai_move is not None:
+            board[ai_move] = game.ai # Apply the AI's move to the board.
+        GAMES.put(game_id, game)
+        return game_state(game_id, game)
+
+    # Scenario 2: Human player makes a move.
+    try:
+        position = int(position) # Convert the position from string to integer.
+    except (TypeError, ValueError):
+        return {'error': 'Invalid move'}
+
+    # Validate the move: ensure the chosen cell exists and is empty.
+    if 0 <= position < len(board) and board[position] == '':
+        board[position] = game.human # Apply the human's move to the board.
+
+        # If the game is not over after the human's move, it's the AI's turn to make a counter-move.
+        if not current_winner(game):
+            ai_move = choose_move(game)
+            if ai_move is not None:
+                board[ai_move] = game.ai # Apply the AI's move.
+        GAMES.put(game_id, game)
+        return game_state(game_id, game)
+
+    # If the human tried to make an invalid move (e.g., clicked on an occupied cell).
+    return {'error': 'Invalid move'}
+
+def request_game_id(data):
+    """The game ID sent in the JSON body ('gameId') or, failing that, the cookie; None if it is not valid."""
+    return valid_game_id(data.get('gameId') or request.cookies.get(GAME_COOKIE))
+
+def with_game_cookie(payload):
+    """JSON response for `payload` that also stores its game ID in the cookie."""
+    response = jsonify(payload)
+    if 'gameId' in payload:
+        response.set_cookie(GAME_COOKIE, payload['gameId'], max_age=int(GAME_TTL), httponly=True, samesite='Lax')
+    return response
+
 @app.route('/set-symbol', methods=['POST'])
 def set_symbol():
     """
     Handles the player's choice of symbol (X or O).
-    Updates the global HUMAN and AI symbols and resets the game board.
+    Starts a new game for this player with an empty board.
     
-    Expects a JSON payload with a 'symbol' key (e.g., {"symbol": "X"}).
-    Returns a JSON response indicating success.
+    Expects a JSON payload with a 'symbol' key (e.g., {"symbol": "X"}) and,
+    optionally, 'size' and 'k' for an N x N board with K in a row to win
+    (e.g., {"symbol": "X", "size": 7, "k": 5}).
+    Returns a JSON response indicating success, the board geometry and the
+    game ID, which is also set as a cookie.
     """
-    global HUMAN, AI, board # Declare global to modify the module-level variables.
-    HUMAN = request.json['symbol'] # Get the chosen symbol from the request.
-    AI = 'O' if HUMAN == 'X' else 'X' # Assign the opposite symbol to the AI.
-    board = ['' for _ in range(9)] # Reset the board for a new game.
-    return jsonify({'success': True})
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    game_id = request_game_id(data) or new_game_id()
+    return with_game_cookie(new_game(game_id, data.get('symbol'), data.get('size', 3), data.get('k')))
 
 @app.route('/make-move', methods=['POST'])
 def make_move():
@@ -168,6 +497,7 @@ def make_move():
     
     If 'position' is provided in the JSON payload, it's a human player's move.
     If 'position' is None, it signifies an AI's first move (e.g., if AI is 'X').
+    The game is the one named by 'gameId' in the payload or by the game cookie.
     
     Updates the board, checks for game-ending conditions, and if the game is still
     ongoing, calculates and makes the AI's counter-move.
@@ -175,61 +505,183 @@ def make_move():
     Returns a JSON response with the updated board state, game over status, winner,
     and the current player for the next turn.
     """
-    position = request.json.get('position')
-    
-    # Scenario 1: AI makes the first move (e.g., if AI is 'X' and starts the game).
-    if position is None:
-        # Check if the board is already full, which would mean no AI move is possible.
-        if '' not in board: 
-            return jsonify({'error': 'Board is full, cannot make AI move'})
-        
-        # Get the best move for the AI using the minimax algorithm.
-        ai_move = get_best_move(board)
-        if ai_move is not None:
-            board[ai_move] = AI # Apply the AI's move to the board.
-        
-        # Return the updated game state to the frontend.
-        return jsonify({
-            'board': board,
-            'gameOver': check_winner(board) is not None,
-            'winner': check_winner(board),
-            'currentPlayer': HUMAN if check_winner(board) is None else None # If game not over, it's human's turn.
-        })
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    return with_game_cookie(play_move(request_game_id(data), data.get('position')))
 
-    # Scenario 2: Human player makes a move.
-    position = int(position) # Convert the position from string to integer.
-    
-    # Validate the move: ensure the chosen cell is empty.
-    if board[position] == '':
-        board[position] = HUMAN # Apply the human's move to the board.
-        
-        # After human's move, check if they won or if it's a tie.
-        if check_winner(board):
-            return jsonify({
-                'board': board,
-                'gameOver': True,
-                'winner': check_winner(board),
-                'currentPlayer': None # Game is over, no current player.
-            })
-            
-        # If the game is not over, it's the AI's turn to make a counter-move.
-        ai_move = get_best_move(board)
-        if ai_move is not None:
-            board[ai_move] = AI # Apply the AI's move.
-            
-        # Return the updated game state after AI's move to the frontend.
-        return jsonify({
-            'board': board,
-            'gameOver': check_winner(board) is not None,
-            'winner': check_winner(board),
-            'currentPlayer': HUMAN if check_winner(board) is None else None # If game not over, it's human's turn.
-        })
-    
-    # If the human tried to make an invalid move (e.g., clicked on an occupied cell).
-    return jsonify({'error': 'Invalid move'})
+def channel_frame(game_id, text):
+    """
+    Handles one frame received on the /ws/game WebSocket.
+
+    Frames are JSON objects with a 'type' of 'set-symbol' or 'make-move' and
+    the same fields as the matching POST route, plus an optional 'id' that is
+    echoed back so the client can match replies to requests.
+
+    Args:
+        game_id (str): The connection's current game ID (from the cookie or an
+            earlier frame), or None. Like a frame's 'gameId', it is checked
+            with valid_game_id.
+        text (str): The received frame.
+
+    Returns:
+        tuple: (game_id, reply) with the connection's game ID after this frame
+        and the JSON reply frame.
+    """
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return game_id, json.dumps({'error': 'Invalid JSON'})
+    if not isinstance(data, dict):
+        return game_id, json.dumps({'error': 'Expected a JSON object'})
+
+    game_id = valid_game_id(data.get('gameId') or game_id)
+    kind = data.get('type')
+    if kind == 'set-symbol':
+        game_id = game_id or new_game_id()
+        payload = new_game(game_id, data.get('symbol'), data.get('size', 3), data.get('k'))
+    elif kind == 'make-move':
+        payload = play_move(game_id, data.get('position'))
+    else:
+        payload = {'error': "Unknown message type, expected 'set-symbol' or 'make-move'"}
+    if 'id' in data:
+        payload['id'] = data['id']
+    return payload.get('gameId', game_id), json.dumps(payload)
+
+def register_socket():
+    """
+    Serves /ws/game through flask-sock, if it is installed.
+
+    Returns:
+        bool: Whether flask-sock is installed.
+    """
+    try:  # WebSocket support under the Flask/gunicorn servers is optional
+        from flask_sock import Sock
+    except ImportError:
+        return False
+    sock = Sock(app)
+
+    @sock.route('/ws/game')
+    def game_socket(ws):
+        """
+        Persistent game channel: symbol choices and moves over one connection (see channel_frame).
+        """
+        game_id = valid_game_id(request.cookies.get(GAME_COOKIE))
+        while True:
+            game_id, reply = channel_frame(game_id, ws.receive())
+            ws.send(reply)
+    return True
+
+# Largest number of boards accepted by one /analyze request.
+ANALYZE_MAX = int(os.environ.get('TICTACTOE_ANALYZE_MAX', '10000'))
+
+if HAS_NUMPY:
+    @app.route('/analyze', methods=['POST'])
+    def analyze():
+        """
+        Analyzes many 3x3 boards in one request with the vectorized evaluator in batch_eval.py.
+
+        Expects a JSON payload with a 'boards' list, each board a list of 9 cells
+        that are '', 'X' or 'O' (e.g. {"boards": [["X", "", "", "", "O", "", "", "", ""]]}).
+        Returns lists in the same order as the boards: 'winners' ('X', 'O', 'tie'
+        or null), 'legalMoves', 'bestMoves' for the side to move (null once the
+        game is over) and 'values' (1 win, 0 draw, -1 loss for the side to move).
+        """
+        data = request.get_json(silent=True)
+        boards = data.get('boards') if isinstance(data, dict) else None
+        if not isinstance(boards, list):
+            return jsonify({'error': 'Expected a JSON object with a list of boards'}), 400
+        if len(boards) > ANALYZE_MAX:
+            return jsonify({'error': f'Too many boards (max {ANALYZE_MAX})'}), 413
+        import batch_eval
+        try:
+            array = batch_eval.to_array(boards)
+        except ValueError as exc:
+            return jsonify({'error': str(exc)}), 400
+        return jsonify(batch_eval.to_lists(batch_eval.analyze(array)))
+
+if ENGINE_SWITCH:
+    @app.route('/engine', methods=['POST'])
+    def set_engine():
+        """
+        Switches the engine used for this worker process's AI moves (only with TICTACTOE_ENGINE_SWITCH).
+
+        Expects a JSON payload with an 'engine' key, one of ENGINES (e.g. {"engine": "bitboard"}).
+        """
+        global ENGINE
+        data = request.get_json(silent=True)
+        engine = data.get('engine') if isinstance(data, dict) else None
+        if engine not in ENGINES:
+            return jsonify({'error': f'Unknown engine, expected one of {", ".join(ENGINES)}'}), 400
+        if engine == 'table':
+            load_perfect_table()
+        ENGINE = engine
+        return jsonify({'engine': ENGINE})
+
+@app.route('/engine/stats')
+def engine_stats():
+    """
+    Reports the active engine, the table engine's startup cost and size, how
+    many positions the bitboard engine has memoized, how the parallel
+    engine split its searches and how often the opening book answered.
+    """
+    return jsonify({
+        'engine': ENGINE,
+        'table': PERFECT_TABLE.info() if PERFECT_TABLE is not None else None,
+        'bitboard_positions': bitboard.table_size(),
+        'parallel': PARALLEL_SEARCH.info(),
+        'book': OPENING_BOOK.info() if OPENING_BOOK is not None else None,
+        'games': GAMES.stats(),
+        'startup': dict(STARTUP, pid=os.getpid()),
+    })
+
+# Import and setup cost of this process, reported by /engine/stats.
+STARTUP = {'import_ms': 0.0, 'create_ms': 0.0, 'warm_ms': None, 'websocket': False}
+
+def warm_up():
+    """
+    Does the work first requests would otherwise do: builds the perfect-play
+    table, fills the bitboard engine's transposition table from the empty
+    board, solves the batch evaluator's positions (importing NumPy) and
+    compiles the page template.
+
+    In a pre-forking server's parent this leaves the tables in pages that
+    every worker shares copy-on-write, instead of each worker building its own.
+    """
+    load_perfect_table()
+    bitboard.get_best_move([''] * 9, 'X')
+    if HAS_NUMPY:
+        import batch_eval
+        batch_eval.solve()
+    app.jinja_env.get_template('index.html')
+
+def create_app(websocket=True, warm=False):
+    """
+    Returns the game's Flask app, finishing the setup deferred at import.
+
+    Args:
+        websocket (bool): Serve /ws/game through flask-sock. asgi.py serves the
+            socket itself and passes False, so its workers never import flask-sock.
+        warm (bool): Run warm_up.
+
+    Calling it again only adds what earlier calls left out.
+    """
+    start = time.perf_counter()
+    if websocket and not STARTUP['websocket']:
+        STARTUP['websocket'] = register_socket()
+    if warm and STARTUP['warm_ms'] is None:
+        warm_start = time.perf_counter()
+        warm_up()
+        STARTUP['warm_ms'] = (time.perf_counter() - warm_start) * 1000
+    STARTUP['create_ms'] += (time.perf_counter() - start) * 1000
+    app.logger.info("Tic-Tac-Toe ready: import %.1f ms, create_app %.1f ms",
+                    STARTUP['import_ms'], STARTUP['create_ms'])
+    return app
+
+STARTUP['import_ms'] = (time.perf_counter() - _IMPORT_START) * 1000
 
 # Entry point for running the Flask application.
 if __name__ == '__main__':
     # Run the Flask app in debug mode, accessible from any IP address on port 5000.
     # debug=True allows for automatic reloading on code changes and provides a debugger.
-    app.run(debug=True, host="0.0.0.0", port=5000)
+    create_app().run(debug=True, host="0.0.0.0", port=5000)
@@ -0,0 +1,157 @@
+"""
+ASGI entry point for the Tic-Tac-Toe game.
+
+`POST /make-move` is answered natively: the request is parsed on the event
+loop and the minimax search runs in the default thread pool, so a long AI
+search never stalls other connections on the loop. The `/ws/game` WebSocket
+is served here too, carrying a whole game over one connection. Every other
+route is served by the regular Flask app wrapped with asgiref.
+
+    uvicorn asgi:application
+"""
+
+import asyncio
+import contextvars
+import json
+import time
+from http.cookies import SimpleCookie
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import GAME_COOKIE, GAME_TTL, METRICS, channel_frame, create_app, play_move, valid_game_id
+
+
+# The WebSocket is served natively below, so flask-sock is not needed.
+flask_app = WsgiToAsgi(create_app(websocket=False))
+
+
+async def _read_body(receive):
+    """Collect the full request body from the ASGI receive channel."""
+    body = b''
+    more = True
+    while more:
+        message = await receive()
+        body += message.get('body', b'')
+        more = message.get('more_body', False)
+    return body
+
+
+async def _send_json(send, payload, status=200, headers=()):
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii')),
+            *headers,
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def _cookie(scope, name):
+    """The value of cookie `name` in the request headers, or None."""
+    for key, value in scope['headers']:
+        if key == b'cookie':
+            morsel = SimpleCookie(value.decode('latin-1')).get(name)
+            if morsel is not None:
+                return morsel.value
+    return None
+
+
+def _game_cookie(game_id):
+    """Set-Cookie header for the game ID, matching the one `with_game_cookie` sets."""
+    value = f'{GAME_COOKIE}={game_id}; Max-Age={int(GAME_TTL)}; HttpOnly; Path=/; SameSite=Lax'
+    return b'set-cookie', value.encode('latin-1')
+
+
+async def make_move(scope, receive, send):
+    """
+    Async variant of the Flask `/make-move` view with the same request/response contract.
+
+    Returns:
+        int: The response status, for the request metrics.
+    """
+    try:
+        data = json.loads(await _read_body(receive) or b'{}')
+    except ValueError:
+        await _send_json(send, {'error': 'Invalid JSON'}, status=400)
+        return 400
+    if not isinstance(data, dict):
+        await _send_json(send, {'error': 'Expected a JSON object'}, status=400)
+        return 400
+    game_id = valid_game_id(data.get('gameId') or _cookie(scope, GAME_COOKIE))
+    loop = asyncio.get_running_loop()
+    # The search is CPU-bound; keep it off the event loop.
+    state = await loop.run_in_executor(None, play_move, game_id, data.get('position'))
+    headers = [_game_cookie(state['gameId'])] if 'gameId' in state else []
+    await _send_json(send, state, headers=headers)
+    return 200
+
+
+async def game_socket(scope, receive, send):
+    """
+    WebSocket variant of `/set-symbol` and `/make-move`; each text frame is handled by `channel_frame`.
+    """
+    game_id = valid_game_id(_cookie(scope, GAME_COOKIE))
+    loop = asyncio.get_running_loop()
+    while True:
+        message = await receive()
+        if message['type'] == 'websocket.connect':
+            await send({'type': 'websocket.accept'})
+        elif message['type'] == 'websocket.receive':
+            text = message.get('text')
+            if text is None:
+                text = (message.get('bytes') or b'').decode('utf-8', 'replace')
+            # The AI's search is CPU-bound; keep it off the event loop.
+            game_id, reply = await loop.run_in_executor(None, channel_frame, game_id, text)
+            await send({'type': 'websocket.send', 'text': reply})
+        elif message['type'] == 'websocket.disconnect':
+            return
+
+
+async def _reject_socket(receive, send):
+    """Refuse a WebSocket on a path that has none."""
+    message = await receive()
+    if message['type'] == 'websocket.connect':
+        await send({'type': 'websocket.close', 'code': 1008})
+
+
+async def _flask(scope, receive, send):
+    """Serve a request through the wrapped Flask app in a fresh context.
+
+    On a keep-alive connection uvicorn starts each request from the previous
+    one's context, where asgiref may still have its single-thread executor
+    marked busy; the next request would then fail with "would deadlock".
+    """
+    loop = asyncio.get_running_loop()
+    await contextvars.Context().run(loop.create_task, flask_app(scope, receive, send))
+
+
+async def _lifespan(receive, send):
+    """Acknowledge server startup/shutdown; the app has no async resources."""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+    elif scope['type'] == 'http' and scope['path'] == '/make-move' and scope['method'] == 'POST':
+        start = time.perf_counter()
+        status = await make_move(scope, receive, send)
+        if METRICS is not None:
+            METRICS.observe_request('/make-move', 'POST', status, time.perf_counter() - start)
+    elif scope['type'] == 'websocket':
+        if scope['path'] == '/ws/game':
+            await game_socket(scope, receive, send)
+        else:
+            await _reject_socket(receive, send)
+    else:
+        await _flask(scope, receive, send)
@@ -0,0 +1,211 @@
+"""
+Vectorized analysis of many 3x3 positions at once with NumPy.
+
+`check_winner` and `get_best_move` look at one board per call, which is slow
+for offline analysis and AI-vs-AI tournaments. Here a batch of N boards is an
+(N, 9) int8 array, each cell EMPTY (0), X (1) or O (2), and every question is
+answered for the whole batch with array operations:
+
+    winners(boards)      (N,) int8: NONE, X, O or TIE
+    legal_moves(boards)  (N, 9) bool: empty cells of unfinished games
+    best_moves(boards)   (N,) int8 best move for the side to move, and its value
+
+Best moves come from a retrograde analysis of all 3**9 boards. The boards are
+solved layer by layer, from the full board back to the empty one, and each
+layer is one array operation over all of its boards. The result is solved
+once and cached for later batches. Ties break toward the lowest cell index,
+so every move is the one `get_best_move` would choose.
+
+The side to move is X when both players have as many marks, otherwise O, as
+in the rest of the app.
+"""
+
+import numpy as np
+
+# Cell and winner codes.
+EMPTY, X, O = 0, 1, 2
+NONE, TIE = 0, 3
+
+CODES = {'': EMPTY, 'X': X, 'O': O}
+SYMBOLS = {X: 'X', O: 'O', TIE: 'tie'}
+
+CELLS = 9
+SIZE = 3 ** CELLS
+
+# Rows, columns and diagonals, in the order check_winner tries them.
+LINES = np.array([
+    [0, 1, 2], [3, 4, 5], [6, 7, 8],  # Rows
+    [0, 3, 6], [1, 4, 7], [2, 5, 8],  # Columns
+    [0, 4, 8], [2, 4, 6],             # Diagonals
+])
+
+# Weight of each cell in a board's base-3 index (the perfect_table indexing).
+POW3 = 3 ** np.arange(CELLS)
+
+_solved = None  # (values, moves) for all SIZE boards, filled in by solve()
+
+
+def to_array(boards):
+    """
+    Converts boards in the app's format to a batch array.
+
+    Args:
+        boards (list): Boards, each a list of 9 cells that are '', 'X' or 'O'.
+
+    Returns:
+        numpy.ndarray: An (N, 9) int8 array of cell codes.
+
+    Raises:
+        ValueError: If a board does not have 9 cells or a cell is not '', 'X' or 'O'.
+    """
+    out = np.empty((len(boards), CELLS), dtype=np.int8)
+    for i, board in enumerate(boards):
+        if not isinstance(board, list) or len(board) != CELLS:
+            raise ValueError(f"Board {i} must be a list of {CELLS} cells")
+        try:
+            out[i] = [CODES[cell] for cell in board]
+        except (KeyError, TypeError):
+            raise ValueError(f"Board {i} has a cell that is not '', 'X' or 'O'") from None
+    return out
+
+
+def board_indices(boards):
+    """Base-3 index of each board, matching perfect_table.board_index."""
+    return boards.astype(np.int32) @ POW3
+
+
+def side_to_move(boards):
+    """(N,) int8 array holding X where both players have as many marks, otherwise O."""
+    xs = (boards == X).sum(axis=1)
+    os_ = (boards == O).sum(axis=1)
+    return np.where(xs == os_, X, O).astype(np.int8)
+
+
+def winners(boards):
+    """
+    Determines the outcome of every board, like `check_winner`.
+
+    Args:
+        boards (numpy.ndarray): An (N, 9) array of cell codes.
+
+    Returns:
+        numpy.ndarray: (N,) int8 array of X or O for a completed line (the first
+        one in LINES order), TIE for a full board without one, otherwise NONE.
+    """
+    cells = boards[:, LINES]  # (N, 8, 3)
+    owner = np.where((cells[:, :, 0] == cells[:, :, 1]) & (cells[:, :, 1] == cells[:, :, 2]),
+                     cells[:, :, 0], 0)
+    # The first completed line decides, as in check_winner's loop.
+    first = np.argmax(owner != 0, axis=1)
+    result = owner[np.arange(len(boards)), first].astype(np.int8)
+    result[(result == NONE) & (boards != EMPTY).all(axis=1)] = TIE
+    return result
+
+
+def legal_moves(boards, results=None):
+    """
+    Marks the cells the side to move may play.
+
+    Args:
+        boards (numpy.ndarray): An (N, 9) array of cell codes.
+        results (numpy.ndarray): The boards' `winners`, if already computed.
+
+    Returns:
+        numpy.ndarray: (N, 9) bool array, True for empty cells of unfinished games.
+    """
+    if results is None:
+        results = winners(boards)
+    return (boards == EMPTY) & (results == NONE)[:, None]
+
+
+def solve():
+    """
+    Solves all 3**9 boards by retrograde analysis (once; later calls reuse it).
+
+    Returns:
+        tuple: (values, moves), two int8 arrays indexed by board index. `values`
+        holds 1, 0 or -1 for the side to move and `moves` the lowest-index best
+        move, or -1 when the game is over.
+    """
+    global _solved
+    if _solved is not None:
+        return _solved
+
+    boards = (np.arange(SIZE)[:, None] // POW3 % 3).astype(np.int8)
+    results = winners(boards)
+    player = side_to_move(boards)
+    filled = (boards != EMPTY).sum(axis=1)
+
+    values = np.zeros(SIZE, dtype=np.int8)
+    moves = np.full(SIZE, -1, dtype=np.int8)
+    won = (results == X) | (results == O)
+    values[won] = np.where(results[won] == player[won], 1, -1)
+
+    # A move adds one mark, so every child sits in the next layer, already solved.
+    for marks in range(CELLS - 1, -1, -1):
+        layer = np.flatnonzero((filled == marks) & (results == NONE))
+        if not len(layer):
+            continue
+        empty = boards[layer] == EMPTY
+        children = layer[:, None] + player[layer, None].astype(np.int32) * POW3
+        # Occupied cells get a score below any real one (and a safe index).
+        scores = np.where(empty, -values[np.where(empty, children, 0)], -2)
+        best = np.argmax(scores, axis=1)  # First maximum: the lowest cell index.
+        moves[layer] = best
+        values[layer] = scores[np.arange(len(layer)), best]
+
+    _solved = values, moves
+    return _solved
+
+
+def best_moves(boards):
+    """
+    Finds the best move for the side to move on every board.
+
+    Args:
+        boards (numpy.ndarray): An (N, 9) array of cell codes.
+
+    Returns:
+        tuple: (moves, values), two (N,) int8 arrays with the best move (-1 when
+        the game is over) and its value for the side to move (1 win, 0 draw,
+        -1 loss).
+    """
+    values, moves = solve()
+    index = board_indices(boards)
+    return moves[index], values[index]
+
+
+def analyze(boards):
+    """
+    Runs every analysis on a batch.
+
+    Args:
+        boards (numpy.ndarray): An (N, 9) array of cell codes.
+
+    Returns:
+        dict: 'winners', 'legal' (the legal-move mask), 'moves' and 'values' arrays.
+    """
+    results = winners(boards)
+    moves, values = best_moves(boards)
+    return {
+        'winners': results,
+        'legal': legal_moves(boards, results),
+        'moves': moves,
+        'values': values,
+    }
+
+
+def to_lists(result):
+    """
+    Converts an `analyze` result to JSON-ready lists in the app's format.
+
+    Returns:
+        dict: 'winners' ('X', 'O', 'tie' or None), 'legalMoves' (lists of cell
+        indices), 'bestMoves' (None once the game is over) and 'values'.
+    """
+    return {
+        'winners': [SYMBOLS.get(w) for w in result['winners'].tolist()],
+        'legalMoves': [np.flatnonzero(row).tolist() for row in result['legal']],
+        'bestMoves': [m if m >= 0 else None for m in result['moves'].tolist()],
+        'values': result['values'].tolist(),
+    }
@@ -0,0 +1,218 @@
+"""
+Bitboard Tic-Tac-Toe engine with a transposition table.
+
+Drop-in alternative to `minimax`/`get_best_move` in app.py:
+
+*   A position is two 9-bit integers, one per player (bit i set = that player
+    owns cell i), so making a move is an OR and checking a win is a few ANDs
+    against the eight precomputed WIN_MASKS.
+*   Search is negamax with alpha-beta pruning and move ordering (centre,
+    corners, edges; immediate wins first).
+*   Results are memoized in a transposition table keyed by the position under
+    the 8 symmetries of the board (rotations and reflections), so a position
+    reached by a different move order, or a mirror image of one, is never
+    searched twice. Entries keep an exact/lower/upper bound flag so they stay
+    valid across different alpha-beta windows.
+
+`get_best_move` resolves ties toward the lowest cell index, like app.py, so
+both engines always pick the same move.
+"""
+
+import math
+
+CELLS = 9
+FULL = (1 << CELLS) - 1
+
+WIN_MASKS = tuple(
+    (1 << a) | (1 << b) | (1 << c)
+    for a, b, c in (
+        (0, 1, 2), (3, 4, 5), (6, 7, 8),  # Rows
+        (0, 3, 6), (1, 4, 7), (2, 5, 8),  # Columns
+        (0, 4, 8), (2, 4, 6),             # Diagonals
+    )
+)
+
+# Centre first, then corners, then edges: the moves most likely to be best.
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+
+def _transform(perm):
+    """Table mapping every 9-bit mask to its image under a cell permutation."""
+    table = []
+    for bits in range(1 << CELLS):
+        out = 0
+        for cell in range(CELLS):
+            if bits >> cell & 1:
+                out |= 1 << perm[cell]
+        table.append(out)
+    return tuple(table)
+
+
+def _symmetries():
+    """The 8 cell permutations of the square: 4 rotations, each optionally mirrored."""
+    rotate = [6, 3, 0, 7, 4, 1, 8, 5, 2]   # cell i moves to rotate[i] (90 degrees)
+    mirror = [2, 1, 0, 5, 4, 3, 8, 7, 6]   # left-right reflection
+    perms = []
+    perm = list(range(CELLS))
+    for _ in range(4):
+        perms.append(tuple(perm))
+        perms.append(tuple(mirror[p] for p in perm))
+        perm = [rotate[p] for p in perm]
+    return perms
+
+
+SYMMETRY_TABLES = tuple(_transform(p) for p in _symmetries())
+
+# Transposition table flags.
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# canonical key -> (value, flag)
+_table = {}
+
+
+def clear():
+    """Empty the transposition table."""
+    _table.clear()
+
+
+def table_size():
+    """Number of positions currently stored in the transposition table."""
+    return len(_table)
+
+
+def canonical_key(me, opp):
+    """Smallest encoding of (me, opp) over the 8 board symmetries."""
+    return min((t[me] << CELLS) | t[opp] for t in SYMMETRY_TABLES)
+
+
+def has_won(bits):
+    """True if `bits` contains a complete line."""
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+def negamax(me, opp, alpha, beta):
+    """
+    Scores a position for the player to move.
+
+    Args:
+        me (int): Bitboard of the player to move.
+        opp (int): Bitboard of the player who just moved.
+        alpha (float): Lower bound of the search window.
+        beta (float): Upper bound of the search window.
+
+    Returns:
+        int: 1 if the player to move wins with best play, 0 for a draw, -1 for a loss.
+    """
+    if has_won(opp):
+        return -1
+    occupied = me | opp
+    if occupied == FULL:
+        return 0
+
+    key = canonical_key(me, opp)
+    entry = _table.get(key)
+    if entry is not None:
+        value, flag = entry
+        if flag == EXACT:
+            return value
+        if flag == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+
+    # A move that completes a line wins outright; no need to search further.
+    for mask in WIN_MASKS:
+        gap = mask & ~me
+        if gap & (gap - 1) == 0 and not gap & occupied:
+            _table[key] = (1, EXACT)
+            return 1
+
+    original_alpha = alpha
+    best = -math.inf
+    for move in MOVE_ORDER:
+        bit = 1 << move
+        if occupied & bit:
+            continue
+        score = -negamax(opp, me | bit, -beta, -alpha)
+        if score > best:
+            best = score
+            if best > alpha:
+                alpha = best
+                if alpha >= beta:
+                    break
+
+    if best <= original_alpha:
+        flag = UPPER
+    elif best >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    _table[key] = (best, flag)
+    return best
+
+
+def to_bits(board, symbol):
+    """Bitboard of the cells in `board` that hold `symbol`."""
+    bits = 0
+    for i in range(CELLS):
+        if board[i] == symbol:
+            bits |= 1 << i
+    return bits
+
+
+def minimax(board, depth, is_maximizing, alpha, beta, ai='O', human='X'):
+    """
+    Same contract as `minimax` in app.py, with the symbols passed explicitly.
+
+    Args:
+        board (list): The current state of the Tic-Tac-Toe board.
+        depth (int): Unused; kept for signature compatibility.
+        is_maximizing (bool): True if it's the AI's turn.
+        alpha (float): The best score the maximizer can already guarantee.
+        beta (float): The best score the minimizer can already guarantee.
+        ai (str): The AI's symbol.
+        human (str): The human's symbol.
+
+    Returns:
+        int: The score from the AI's perspective (1 AI wins, -1 human wins, 0 tie).
+    """
+    ai_bits, human_bits = to_bits(board, ai), to_bits(board, human)
+    if has_won(ai_bits):
+        return 1
+    if is_maximizing:
+        return negamax(ai_bits, human_bits, alpha, beta)
+    return -negamax(human_bits, ai_bits, -beta, -alpha)
+
+
+def get_best_move(board, ai='O'):
+    """
+    Determines the best move for `ai`, like `get_best_move` in app.py.
+
+    Args:
+        board (list): The current state of the Tic-Tac-Toe board.
+        ai (str): The symbol the AI plays.
+
+    Returns:
+        int: The lowest-index move with the best score, or None if the board is full.
+    """
+    human = 'O' if ai == 'X' else 'X'
+    me, opp = to_bits(board, ai), to_bits(board, human)
+    occupied = me | opp
+    best_score, best_move = -math.inf, None
+    for move in range(CELLS):
+        bit = 1 << move
+        if occupied & bit:
+            continue
+        # Only a strictly better score can replace the current best move, so
+        # earlier moves keep ties and the window can start at best_score.
+        score = 1 if has_won(me | bit) else -negamax(opp, me | bit, -math.inf, -best_score)
+        if score > best_score:
+            best_score, best_move = score, move
+            if best_score == 1:
+                break
+    return best_move
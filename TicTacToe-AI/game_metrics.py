@@ -0,0 +1,110 @@
+"""
+Prometheus-style metrics for the Tic-Tac-Toe game.
+
+The registry, counters and histograms live in prometheus_text.py at the
+repository root, shared with the chatbot; this module defines the game's
+metrics on top of them. It records request latency per route and, for every
+AI move, the wall time and the search statistics collected in a SearchStats
+(nodes visited, alpha-beta cutoffs and deepest ply reached).
+
+Instrumentation is off unless TICTACTOE_METRICS is set (1, true or yes). When
+off, instrument() registers nothing, no SearchStats is created and the search
+skips its counters behind a single None check.
+
+Values are per process: under a multi-worker server each scrape reads the
+worker that answered it.
+"""
+
+import os
+import sys
+
+# prometheus_text.py sits one level up, next to the Chatbot folder.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import prometheus_text
+from prometheus_text import LATENCY_BUCKETS, Registry
+
+# Nodes searched per move, from a single position to a full game tree.
+NODE_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+# Deepest ply reached by a search.
+DEPTH_BUCKETS = (1, 2, 3, 4, 5, 6, 7, 8, 9, 12, 16, 24)
+
+
+def enabled(var='TICTACTOE_METRICS'):
+    """True when the environment variable `var` turns metrics on."""
+    return prometheus_text.enabled(var)
+
+
+class SearchStats:
+    """
+    Counters filled in by one move search.
+
+    Only minimax and the larger-board engine fill them in.
+
+    Attributes:
+        nodes (int): Positions visited.
+        prunes (int): Alpha-beta cutoffs.
+        max_depth (int): Deepest ply below the current position that was searched.
+    """
+
+    __slots__ = ('nodes', 'prunes', 'max_depth')
+
+    def __init__(self):
+        self.nodes = 0
+        self.prunes = 0
+        self.max_depth = 0
+
+
+class GameMetrics:
+    """The game's metrics: request latency per route and search statistics per move."""
+
+    def __init__(self):
+        self.registry = Registry('tictactoe')
+        self.requests = self.registry.histogram(
+            'http_request_duration_seconds', 'Time spent answering HTTP requests.',
+            ('route', 'method', 'status'), LATENCY_BUCKETS)
+        self.move_seconds = self.registry.histogram(
+            'move_duration_seconds', 'Wall time to choose an AI move, by engine.',
+            ('engine',), LATENCY_BUCKETS)
+        self.nodes = self.registry.histogram(
+            'search_nodes', 'Positions visited per searched AI move (minimax and mnk only), by engine.',
+            ('engine',), NODE_BUCKETS)
+        self.prunes = self.registry.counter(
+            'search_prunes_total', 'Alpha-beta cutoffs (minimax only), by engine.', ('engine',))
+        self.depth = self.registry.histogram(
+            'search_depth', 'Deepest ply searched per searched AI move (minimax and mnk only), by engine.',
+            ('engine',), DEPTH_BUCKETS)
+
+    def observe_request(self, route, method, status, seconds):
+        self.requests.observe(seconds, route, method, str(status))
+
+    def observe_move(self, engine, seconds, stats):
+        """
+        Records one AI move.
+
+        The search statistics are only recorded when the search counted any
+        nodes, so lookups (the table and bitboard engines, opening-book hits)
+        and the parallel engine, whose workers keep no counters, add no zeros.
+
+        Args:
+            engine (str): The engine that chose the move.
+            seconds (float): Wall time of the search.
+            stats (SearchStats): Counters collected during the search.
+        """
+        self.move_seconds.observe(seconds, engine)
+        if not stats.nodes:
+            return
+        self.nodes.observe(stats.nodes, engine)
+        self.depth.observe(stats.max_depth, engine)
+        if stats.prunes:
+            self.prunes.inc(engine, amount=stats.prunes)
+
+    def render(self):
+        return self.registry.render()
+
+
+def instrument(app, metrics):
+    """
+    Times every Flask request and serves GET /metrics. Does nothing when `metrics` is None.
+    """
+    prometheus_text.instrument(app, metrics)
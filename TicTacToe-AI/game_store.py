@@ -0,0 +1,226 @@
+"""
+Per-session game storage for the Tic-Tac-Toe app.
+
+Each game is identified by a random game ID (sent back to the browser as a
+cookie) and serialized into a short string:
+
+    <human symbol><board size><win length><one char per cell, '.' = empty>
+
+e.g. 'X33X...O....' is a 3x3, 3-in-a-row game where the human plays X. That
+is about 60 bytes per game, and the same format is used by every store. The
+size and win length take one digit each, so boards are at most MAX_SIZE wide.
+
+Two stores are provided:
+
+*   MemoryGameStore - a dict behind a lock, for a single worker process.
+*   SQLiteGameStore - a shared SQLite file (WAL mode), so several worker
+    processes on one machine see the same games.
+
+Both evict games that have been idle for longer than `ttl` seconds and cap
+the number of live games at `max_games`, dropping the least recently played
+games first. The memory store expires at most EXPIRE_BATCH games per save.
+"""
+
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Widest board the encoding can hold: the size and win length are one digit each.
+MAX_SIZE = 9
+
+# Most expired games dropped per save, so a burst of expiries (say, after a
+# quiet night) is spread over many requests instead of stalling one.
+EXPIRE_BATCH = 64
+
+
+def new_game_id():
+    """Returns a fresh, unguessable game ID."""
+    return secrets.token_urlsafe(12)
+
+
+class Game:
+    """
+    One game in progress.
+
+    Args:
+        human (str): The symbol the human plays ('X' or 'O').
+        size (int): Width and height of the board.
+        k (int): Symbols in a row needed to win.
+        board (list): The cells ('', 'X' or 'O'); a new empty board if omitted.
+    """
+
+    __slots__ = ('human', 'size', 'k', 'board')
+
+    def __init__(self, human, size=3, k=3, board=None):
+        self.human = human
+        self.size = size
+        self.k = k
+        self.board = board if board is not None else [''] * (size * size)
+
+    @property
+    def ai(self):
+        """The symbol the AI plays."""
+        return 'O' if self.human == 'X' else 'X'
+
+    def encode(self):
+        """Serializes the game into its compact string form."""
+        return f"{self.human}{self.size}{self.k}" + ''.join(cell or '.' for cell in self.board)
+
+    @classmethod
+    def decode(cls, state):
+        """Rebuilds a game from `encode()` output."""
+        board = ['' if cell == '.' else cell for cell in state[3:]]
+        return cls(state[0], int(state[1]), int(state[2]), board)
+
+
+class MemoryGameStore:
+    """
+    In-process game store.
+
+    Games are kept in an OrderedDict in least-recently-saved order, so both
+    TTL expiry and the `max_games` cap only ever drop entries from the front.
+    Each save expires at most EXPIRE_BATCH games; `get` never returns one of
+    the expired games still waiting.
+
+    Args:
+        ttl (float): Seconds a game may sit idle before it is discarded.
+        max_games (int): Most games kept at once.
+    """
+
+    def __init__(self, ttl=3600, max_games=100_000, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_games = max_games
+        self._clock = clock
+        self._games = OrderedDict()  # game_id -> (last saved, encoded game)
+        self._lock = threading.Lock()
+        self.expired = 0
+        self.evicted = 0
+
+    def get(self, game_id):
+        """Returns the game for `game_id`, or None if it is unknown or expired."""
+        with self._lock:
+            entry = self._games.get(game_id)
+            if entry is None:
+                return None
+            if self._clock() - entry[0] > self.ttl:
+                del self._games[game_id]
+                self.expired += 1
+                return None
+        return Game.decode(entry[1])
+
+    def put(self, game_id, game):
+        """Saves `game` under `game_id` and refreshes its idle timer."""
+        state = game.encode()
+        now = self._clock()
+        with self._lock:
+            games = self._games
+            games[game_id] = (now, state)
+            games.move_to_end(game_id)
+            # Drop expired games, then the oldest ones beyond the cap.
+            budget = EXPIRE_BATCH
+            while games:
+                oldest = next(iter(games.values()))
+                if budget and now - oldest[0] > self.ttl:
+                    budget -= 1
+                    self.expired += 1
+                elif len(games) > self.max_games:
+                    self.evicted += 1
+                else:
+                    break
+                games.popitem(last=False)
+
+    def delete(self, game_id):
+        with self._lock:
+            self._games.pop(game_id, None)
+
+    def __len__(self):
+        return len(self._games)
+
+    def stats(self):
+        return {'backend': 'memory', 'games': len(self), 'expired': self.expired, 'evicted': self.evicted}
+
+
+class SQLiteGameStore:
+    """
+    Game store shared between processes through a SQLite database file.
+
+    Each thread gets its own connection (opened again after a fork, so the
+    store can be created before a server forks its workers). The database
+    runs in WAL mode so
+    readers never wait for writers. Expired games and games over the cap are
+    purged every `sweep_every` saves rather than on each request.
+
+    Args:
+        path (str): The database file.
+        ttl (float): Seconds a game may sit idle before it is discarded.
+        max_games (int): Most games kept at once (enforced at each sweep).
+        sweep_every (int): Saves between purges.
+    """
+
+    def __init__(self, path, ttl=3600, max_games=100_000, sweep_every=1000):
+        self.path = path
+        self.ttl = ttl
+        self.max_games = max_games
+        self.sweep_every = sweep_every
+        self._local = threading.local()
+        self._puts = 0
+        self.expired = 0
+        self.evicted = 0
+        conn = self._conn()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS games ('
+            ' id TEXT PRIMARY KEY, state TEXT NOT NULL, touched REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS games_touched ON games (touched)')
+
+    def _conn(self):
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def get(self, game_id):
+        """Returns the game for `game_id`, or None if it is unknown or expired."""
+        row = self._conn().execute(
+            'SELECT state FROM games WHERE id = ? AND touched >= ?',
+            (game_id, time.time() - self.ttl),
+        ).fetchone()
+        return Game.decode(row[0]) if row else None
+
+    def put(self, game_id, game):
+        """Saves `game` under `game_id` and refreshes its idle timer."""
+        self._conn().execute(
+            'INSERT OR REPLACE INTO games (id, state, touched) VALUES (?, ?, ?)',
+            (game_id, game.encode(), time.time()),
+        )
+        self._puts += 1
+        if self._puts % self.sweep_every == 0:
+            self.sweep()
+
+    def delete(self, game_id):
+        self._conn().execute('DELETE FROM games WHERE id = ?', (game_id,))
+
+    def sweep(self):
+        """Purges expired games, then the least recently played ones beyond the cap."""
+        conn = self._conn()
+        self.expired += conn.execute(
+            'DELETE FROM games WHERE touched < ?', (time.time() - self.ttl,)
+        ).rowcount
+        excess = len(self) - self.max_games
+        if excess > 0:
+            self.evicted += conn.execute(
+                'DELETE FROM games WHERE id IN (SELECT id FROM games ORDER BY touched LIMIT ?)',
+                (excess,),
+            ).rowcount
+
+    def __len__(self):
+        return self._conn().execute('SELECT COUNT(*) FROM games').fetchone()[0]
+
+    def stats(self):
+        return {'backend': 'sqlite', 'games': len(self), 'expired': self.expired, 'evicted': self.evicted}
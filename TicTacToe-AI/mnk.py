@@ -0,0 +1,266 @@
+"""
+Generalized Tic-Tac-Toe engine: an N x N board with K in a row to win.
+
+The classic engines in app.py and bitboard.py hard-code the 3 x 3 board and
+search every game to the end, which cannot scale to boards like 4 x 4,
+5 x 5 with 4 in a row, or 7 x 7 gomoku-style play. `MNKEngine` instead:
+
+*   precomputes every K-cell window (row, column and both diagonals) and, for
+    each cell, the windows that pass through it;
+*   keeps per-window piece counts and a running heuristic score that are
+    updated incrementally as moves are made and undone;
+*   runs iterative-deepening negamax with alpha-beta pruning under a wall-clock
+    budget, always returning the best move of the deepest completed iteration.
+
+The heuristic counts, for every window still open to only one player, how
+many of its cells that player holds, weighted exponentially; windows that both
+players have entered are dead and score nothing. Wins are scored far above any
+heuristic value and adjusted by ply so faster wins are preferred.
+"""
+
+import math
+import time
+
+# Score of a completed line; heuristic values stay far below it.
+WIN = 10 ** 12
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+
+class MNKEngine:
+    """
+    Board geometry and search for an N x N, K-in-a-row game.
+
+    Args:
+        size (int): Width and height of the board.
+        k (int): Number of symbols in a row needed to win.
+    """
+
+    def __init__(self, size=3, k=3):
+        if size < 1 or not 1 <= k <= size:
+            raise ValueError(f"invalid board: size={size}, k={k}")
+        self.size = size
+        self.k = k
+        self.cells = size * size
+
+        lines = []
+        for r in range(size):
+            for c in range(size):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= end_r < size and 0 <= end_c < size:
+                        lines.append(tuple((r + dr * i) * size + (c + dc * i) for i in range(k)))
+        self.lines = tuple(lines)
+        self.cell_lines = tuple(
+            tuple(li for li, line in enumerate(self.lines) if cell in line)
+            for cell in range(self.cells)
+        )
+        self.neighbors = tuple(
+            tuple(
+                (r + dr) * size + (c + dc)
+                for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                if (dr or dc) and 0 <= r + dr < size and 0 <= c + dc < size
+            )
+            for r in range(size) for c in range(size)
+        )
+        # Cells ordered from the centre outwards, used to break ordering ties.
+        centre = (size - 1) / 2
+        self.centre_order = tuple(sorted(
+            range(self.cells),
+            key=lambda i: (abs(i // size - centre) + abs(i % size - centre), i),
+        ))
+
+        # weight[n]: value of holding n cells of a window nobody else has entered.
+        weight = [0] + [10 ** n for n in range(1, k)] + [WIN]
+        # contrib[a][h]: a window's score with a AI cells and h human cells.
+        self.contrib = tuple(
+            tuple(weight[a] if not h else (-weight[h] if not a else 0) for h in range(k + 1))
+            for a in range(k + 1)
+        )
+        self.weight = tuple(weight)
+
+    def check_winner(self, board):
+        """
+        Same contract as `check_winner` in app.py for this board geometry.
+
+        Args:
+            board (list): The N*N board of '', 'X' and 'O'.
+
+        Returns:
+            str: 'X' or 'O' for a winner, 'tie' for a full board, or None.
+        """
+        for line in self.lines:
+            first = board[line[0]]
+            if first and all(board[i] == first for i in line):
+                return first
+        if '' not in board:
+            return 'tie'
+        return None
+
+    def get_best_move(self, board, ai, time_budget=1.0, max_depth=None, stats=None):
+        """
+        Picks a move for `ai` with iterative deepening inside `time_budget`.
+
+        Args:
+            board (list): The N*N board of '', 'X' and 'O'.
+            ai (str): The symbol the AI plays.
+            time_budget (float): Seconds the search may use.
+            max_depth (int): Optional cap on the search depth in plies.
+            stats (SearchStats): Optional counters; receives the nodes visited
+                and the deepest completed iteration.
+
+        Returns:
+            int: The chosen cell index, or None if the board is full.
+        """
+        search = _Search(self, board, ai, time.perf_counter() + time_budget)
+        move = search.best_move(max_depth)
+        if stats is not None:
+            stats.nodes += search.nodes
+            stats.max_depth = max(stats.max_depth, search.depth_reached)
+        return move
+
+
+class _Search:
+    """Mutable state of one move search."""
+
+    def __init__(self, engine, board, ai, deadline):
+        self.engine = engine
+        self.deadline = deadline
+        self.nodes = 0
+        self.depth_reached = 0
+        # 1 = AI, -1 = human, 0 = empty.
+        self.cells = [0 if not c else (1 if c == ai else -1) for c in board]
+        self.empty = self.cells.count(0)
+        self.ai_count = [0] * len(engine.lines)
+        self.human_count = [0] * len(engine.lines)
+        for li, line in enumerate(engine.lines):
+            for i in line:
+                if self.cells[i] == 1:
+                    self.ai_count[li] += 1
+                elif self.cells[i] == -1:
+                    self.human_count[li] += 1
+        contrib = engine.contrib
+        self.score = sum(contrib[a][h] for a, h in zip(self.ai_count, self.human_count)
+                         if a < engine.k and h < engine.k)
+
+    def _make(self, move, player):
+        """Play `move` for `player`; return True if it completes a line."""
+        engine = self.engine
+        contrib = engine.contrib
+        counts = self.ai_count if player == 1 else self.human_count
+        won = False
+        self.cells[move] = player
+        self.empty -= 1
+        for li in engine.cell_lines[move]:
+            a, h = self.ai_count[li], self.human_count[li]
+            old = contrib[a][h]
+            counts[li] += 1
+            if counts[li] == engine.k:
+                won = True
+            self.score += contrib[self.ai_count[li]][self.human_count[li]] - old
+        return won
+
+    def _unmake(self, move, player):
+        engine = self.engine
+        contrib = engine.contrib
+        counts = self.ai_count if player == 1 else self.human_count
+        self.cells[move] = 0
+        self.empty += 1
+        for li in engine.cell_lines[move]:
+            old = contrib[self.ai_count[li]][self.human_count[li]]
+            counts[li] -= 1
+            self.score += contrib[self.ai_count[li]][self.human_count[li]] - old
+
+    def _candidates(self):
+        """Empty cells next to a piece (all empty cells on small boards), best first."""
+        engine = self.engine
+        cells = self.cells
+        if self.empty == engine.cells:
+            return list(engine.centre_order[:1])
+        if engine.size <= 4:
+            moves = [i for i in engine.centre_order if not cells[i]]
+        else:
+            moves = [i for i in engine.centre_order
+                     if not cells[i] and any(cells[n] for n in engine.neighbors[i])]
+        # Prefer cells that extend or block the most promising windows.
+        weight = engine.weight
+        ai_count, human_count = self.ai_count, self.human_count
+
+        def urgency(i):
+            total = 0
+            for li in engine.cell_lines[i]:
+                a, h = ai_count[li], human_count[li]
+                if not h:
+                    total += weight[a]
+                if not a:
+                    total += weight[h]
+            return total
+
+        moves.sort(key=urgency, reverse=True)
+        return moves
+
+    def _negamax(self, depth, alpha, beta, player, ply):
+        self.nodes += 1
+        if depth == 0:
+            return player * self.score
+        # Leaves are cheap; an inner node orders and searches all its
+        # candidates, so the clock is read before each one.
+        if time.perf_counter() > self.deadline:
+            raise SearchTimeout
+        best = -math.inf
+        for move in self._candidates():
+            if self._make(move, player):
+                score = WIN - ply
+            elif self.empty == 0:
+                score = 0
+            else:
+                score = -self._negamax(depth - 1, -beta, -alpha, -player, ply + 1)
+            self._unmake(move, player)
+            if score > best:
+                best = score
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        break
+        return best
+
+    def best_move(self, max_depth=None):
+        root = self._candidates()
+        if not root:
+            return None
+        # Until the first iteration completes, fall back on move ordering.
+        best = root[0]
+        limit = self.empty if max_depth is None else min(max_depth, self.empty)
+        clock, deadline = time.perf_counter, self.deadline
+        try:
+            for depth in range(1, limit + 1):
+                if clock() > deadline:
+                    break
+                alpha = -math.inf
+                scores = {}
+                iteration_best = None
+                for move in root:
+                    if clock() > deadline:
+                        raise SearchTimeout
+                    if self._make(move, 1):
+                        score = WIN
+                    elif self.empty == 0:
+                        score = 0
+                    else:
+                        score = -self._negamax(depth - 1, -math.inf, -alpha, -1, 1)
+                    self._unmake(move, 1)
+                    scores[move] = score
+                    if score > alpha:
+                        alpha, iteration_best = score, move
+                best = iteration_best
+                self.depth_reached = depth
+                # A forced win or loss has been found; deeper search can't change it.
+                if abs(alpha) >= WIN - self.engine.cells:
+                    break
+                # Search the previous iteration's best moves first next time.
+                root.sort(key=lambda m: scores[m], reverse=True)
+        except SearchTimeout:
+            pass
+        return best
@@ -0,0 +1,190 @@
+"""
+Opening book and endgame store for `get_best_move`.
+
+Solved positions are kept in a file that every worker process memory-maps
+read-only, so they all share one copy in the page cache instead of each
+loading (or re-searching) the same positions after a restart. `get_best_move`
+in app.py looks the current position up here before it searches.
+
+A book is a perfect-play table file (see perfect_table.py): one best move per
+board, indexed by the board's base-3 number, NO_MOVE where there is none. The
+full table is already the complete book, so `python perfect_table.py build`
+writes a file this module can map. A book can also, like a classic opening
+book plus endgame table, keep only the first few plies and the last few empty
+cells; the positions left out read as NO_MOVE and the middle game is searched.
+The command line builds and inspects books:
+
+    python opening_book.py build [path] [--opening-plies N] [--endgame-empty N]
+    python opening_book.py info [path]
+    python opening_book.py stats http://localhost:5000
+"""
+
+import argparse
+import json
+import mmap
+import os
+import sys
+import time
+import urllib.request
+
+from perfect_table import CELLS, MAGIC, NO_MOVE, POW3, SIZE, board_index, build_table, save_table
+
+# Default location of the book file.
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+
+
+def build_book(opening_plies=CELLS, endgame_empty=0):
+    """
+    Builds a perfect-play table that keeps only positions near the start or the end of the game.
+
+    Args:
+        opening_plies (int): Keep positions with at most this many moves
+            played (CELLS, the default, keeps every position).
+        endgame_empty (int): Also keep positions with at most this many
+            empty cells.
+
+    Returns:
+        tuple: (table, positions) where `table` is a bytearray of SIZE best
+        moves, in the perfect_table format, and `positions` is the number of
+        positions kept.
+    """
+    table, _ = build_table()
+    positions = 0
+    for index, move in enumerate(table):
+        if move == NO_MOVE:
+            continue  # Game over or unreachable; nothing to look up.
+        played = sum(1 for p in POW3 if index // p % 3)
+        if played <= opening_plies or CELLS - played <= endgame_empty:
+            positions += 1
+        else:
+            table[index] = NO_MOVE
+    return table, positions
+
+
+class OpeningBook:
+    """
+    Read-only, memory-mapped view of a book file.
+
+    Args:
+        path (str): A table written by `perfect_table.save_table`, in full or
+            as cut down by `build_book`.
+
+    Raises:
+        ValueError: If the file is not a perfect-play table.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        with open(path, 'rb') as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC or len(self._map) != len(MAGIC) + SIZE:
+            self._map.close()
+            raise ValueError(f"{path} is not a perfect-play table")
+        self._offset = len(MAGIC)
+        self.positions = SIZE - self._map[self._offset:].count(NO_MOVE)
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, board):
+        """
+        Looks a position up.
+
+        Args:
+            board (list): A 9-element board.
+
+        Returns:
+            int or None: The best move for the player to move, or None if the
+            position is not in the book.
+        """
+        move = self._map[self._offset + board_index(board)]
+        return None if move == NO_MOVE else move
+
+    def best_move(self, board, ai):
+        """
+        Returns the book move for `ai`, or None (counted as a miss) if the search must decide.
+
+        Args:
+            board (list): The current 9-element board.
+            ai (str): The symbol the AI plays.
+        """
+        to_move = 'X' if board.count('X') == board.count('O') else 'O'
+        move = self.lookup(board) if ai == to_move else None
+        if move is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return move
+
+    def info(self):
+        """Coverage of the book and this process's hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            'path': self.path,
+            'positions': self.positions,
+            'bytes': len(self._map),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'pid': os.getpid(),
+        }
+
+    def close(self):
+        self._map.close()
+
+
+def _poll_stats(url, polls):
+    """
+    Reads the book counters of a running server, summed over the workers seen.
+
+    Each request reaches one worker, so /engine/stats is polled `polls` times
+    and the latest counters of every distinct worker process are added up.
+    """
+    workers = {}
+    for _ in range(polls):
+        with urllib.request.urlopen(url.rstrip('/') + '/engine/stats', timeout=10) as resp:
+            book = json.load(resp).get('book')
+        if not book:
+            sys.exit("The server has no opening book loaded (set TICTACTOE_BOOK_PATH).")
+        workers[book['pid']] = book
+    hits = sum(b['hits'] for b in workers.values())
+    misses = sum(b['misses'] for b in workers.values())
+    return workers, hits, misses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python opening_book.py', description="Build and inspect opening books.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="solve positions and write a book file")
+    build.add_argument('path', nargs='?', default=DEFAULT_PATH)
+    build.add_argument('--opening-plies', type=int, default=CELLS,
+                       help="store positions with at most this many moves played (default: all)")
+    build.add_argument('--endgame-empty', type=int, default=0,
+                       help="also store positions with at most this many empty cells")
+    info = commands.add_parser('info', help="report how many positions a book file covers")
+    info.add_argument('path', nargs='?', default=DEFAULT_PATH)
+    stats = commands.add_parser('stats', help="report the hit rate of a running server's book")
+    stats.add_argument('url', help="base URL of the server, e.g. http://localhost:5000")
+    stats.add_argument('--polls', type=int, default=20,
+                       help="requests made to reach the different worker processes")
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        table, positions = build_book(args.opening_plies, args.endgame_empty)
+        save_table(table, args.path)
+        elapsed = time.perf_counter() - start
+        print(f"Stored {positions} positions in {elapsed * 1000:.1f} ms; "
+              f"wrote {len(MAGIC) + len(table)} bytes to {args.path}")
+    elif args.command == 'info':
+        book = OpeningBook(args.path)
+        print(f"{args.path}: {book.positions} positions, {len(book._map)} bytes")
+        book.close()
+    else:
+        workers, hits, misses = _poll_stats(args.url, args.polls)
+        lookups = hits + misses
+        rate = hits / lookups if lookups else 0.0
+        print(f"{len(workers)} worker(s): {hits} hits, {misses} misses, hit rate {rate:.1%}")
+
+
+if __name__ == '__main__':
+    main()
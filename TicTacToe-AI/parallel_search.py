@@ -0,0 +1,133 @@
+"""
+Parallel root search for `get_best_move`.
+
+`get_best_move` in app.py scores the root moves one after another, so a deep
+search keeps one core busy while the rest sit idle. `ParallelRootSearch`
+hands the root moves to a persistent process pool instead:
+
+*   The lowest-index move is searched first with a full window, as the serial
+    search would. Its score becomes the alpha bound every other root move is
+    searched with ("young brothers wait"), so those searches prune as hard as
+    the serial ones do.
+*   The remaining moves run concurrently. Once a move scores a forced win (the
+    best possible score), moves after it can no longer be chosen and any of
+    them still queued are cancelled.
+*   A move searched with the alpha bound either fails low (it cannot beat the
+    first move) or returns its exact score, so picking the lowest-index move
+    with the highest score gives exactly the move the serial search returns.
+
+Searching a handful of empty cells is faster than the round trip to a worker,
+so positions with fewer than `min_empty` empty cells are searched in-process.
+The pool is created on first use, and again after a fork, so it can be set up
+before a server forks its workers.
+"""
+
+import math
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+class ParallelRootSearch:
+    """
+    Splits the root moves of a search across a process pool.
+
+    Args:
+        score_move (callable): Module-level function `score_move(board, move, ai, alpha)`
+            returning the minimax score of `ai` playing `move`, searched with
+            lower bound `alpha`. It must be picklable, i.e. importable by name.
+        workers (int): Worker processes in the pool (defaults to the CPU count).
+        min_empty (int): Fewest empty cells for which the pool is used.
+        best_score (int): The highest score a move can get (a forced win).
+    """
+
+    def __init__(self, score_move, workers=None, min_empty=8, best_score=1):
+        self.score_move = score_move
+        self.workers = workers or os.cpu_count() or 1
+        self.min_empty = min_empty
+        self.best_score = best_score
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.parallel_searches = 0
+        self.serial_searches = 0
+        self.cancelled = 0
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                self._pid = os.getpid()
+            return self._pool
+
+    def best_move(self, board, ai):
+        """
+        Determines the best move for `ai`, exactly like `get_best_move` in app.py.
+
+        Args:
+            board (list): The current state of the board.
+            ai (str): The symbol the AI plays.
+
+        Returns:
+            int: The lowest-index move with the best score, or None if the board is full.
+        """
+        moves = [i for i, cell in enumerate(board) if cell == '']
+        if not moves:
+            return None
+        if len(moves) < self.min_empty or self.workers < 2:
+            self.serial_searches += 1
+            return self._serial(board, moves, ai)
+        self.parallel_searches += 1
+
+        pool = self._executor()
+        board = list(board)
+        first = moves[0]
+        alpha = pool.submit(self.score_move, board, first, ai, -math.inf).result()
+        if alpha >= self.best_score:
+            return first
+
+        pending = {pool.submit(self.score_move, board, move, ai, alpha): move for move in moves[1:]}
+        scores = {}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                move = pending.pop(future)
+                scores[move] = future.result()
+                if scores[move] >= self.best_score:
+                    # Nothing after a forced win can be picked; drop what hasn't started.
+                    for other, later in list(pending.items()):
+                        if later > move and other.cancel():
+                            del pending[other]
+                            self.cancelled += 1
+
+        best_score, best_move = alpha, first
+        for move in moves[1:]:
+            score = scores.get(move, -math.inf)
+            if score > best_score:
+                best_score, best_move = score, move
+        return best_move
+
+    def _serial(self, board, moves, ai):
+        best_score, best_move = -math.inf, None
+        for move in moves:
+            score = self.score_move(board, move, ai, -math.inf)
+            if score > best_score:
+                best_score, best_move = score, move
+        return best_move
+
+    def info(self):
+        """Pool size, cutoff and how searches were split."""
+        return {
+            'workers': self.workers,
+            'min_empty': self.min_empty,
+            'parallel_searches': self.parallel_searches,
+            'serial_searches': self.serial_searches,
+            'cancelled': self.cancelled,
+        }
+
+    def close(self):
+        """Shut the pool down; it is recreated if the search is used again."""
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.shutdown(cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,204 @@
+"""
+Precomputed perfect-play table for Tic-Tac-Toe.
+
+Tic-Tac-Toe has only 5,478 legal positions, so instead of running minimax on
+every request we can solve all of them once and answer with a lookup.
+
+Every board is numbered by reading its cells as a base-3 number
+('' = 0, 'X' = 1, 'O' = 2, cell 0 is the least significant digit). The table
+is a 3**9 = 19,683 byte array indexed by that number: for each non-terminal
+position reachable from the empty board (X moves first) it stores the best
+move for the player to move, and NO_MOVE everywhere else. The best move is
+the lowest-index move with the highest minimax value, which is exactly what
+`get_best_move` in app.py returns, so both engines always agree.
+
+The table can be built at startup (tens of milliseconds) or loaded from a
+file written by:
+
+    python perfect_table.py build [path]
+"""
+
+import os
+import sys
+import time
+
+# Number of cells on the board and of possible boards.
+CELLS = 9
+SIZE = 3 ** CELLS
+
+# Stored for positions that are terminal or unreachable.
+NO_MOVE = 0xFF
+
+# File header so a stray file is never mistaken for a table.
+MAGIC = b'TTTPP1\n'
+
+# Default location of the on-disk table.
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perfect_play.bin')
+
+POW3 = [3 ** i for i in range(CELLS)]
+CODE = {'': 0, 'X': 1, 'O': 2}
+
+LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),  # Rows
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),  # Columns
+    (0, 4, 8), (2, 4, 6),             # Diagonals
+)
+
+
+def board_index(board):
+    """
+    Returns the base-3 number of a board.
+
+    Args:
+        board (list): A 9-element list of '', 'X' or 'O'.
+
+    Returns:
+        int: The index of the board, between 0 and 3**9 - 1.
+    """
+    index = 0
+    for i in range(CELLS):
+        index += CODE[board[i]] * POW3[i]
+    return index
+
+
+def _winner(cells):
+    """Return 1 or 2 if that player has three in a row, else 0 (cells are codes)."""
+    for a, b, c in LINES:
+        if cells[a] and cells[a] == cells[b] == cells[c]:
+            return cells[a]
+    return 0
+
+
+def solve_positions():
+    """
+    Solves every position reachable from the empty board.
+
+    Returns:
+        dict: index -> (value, move) for each legal position, where `value` is
+        1, 0 or -1 for the player to move and `move` is the lowest-index best
+        move, or NO_MOVE if the game is over.
+    """
+    solved = {}
+    cells = [0] * CELLS
+
+    def solve(index, player):
+        if index in solved:
+            return solved[index][0]
+        if _winner(cells):
+            # The previous player just completed a line.
+            solved[index] = (-1, NO_MOVE)
+            return -1
+        best_value, best_move = None, NO_MOVE
+        other = 3 - player
+        for move in range(CELLS):
+            if cells[move]:
+                continue
+            cells[move] = player
+            value = -solve(index + player * POW3[move], other)
+            cells[move] = 0
+            if best_value is None or value > best_value:
+                best_value, best_move = value, move
+        if best_value is None:
+            best_value = 0  # Full board without a winner: tie.
+        solved[index] = (best_value, best_move)
+        return best_value
+
+    solve(0, 1)
+    return solved
+
+
+def build_table():
+    """
+    Builds the best-move table from `solve_positions`.
+
+    Returns:
+        tuple: (table, positions) where `table` is a bytearray of SIZE best moves
+        and `positions` is the number of legal positions visited.
+    """
+    solved = solve_positions()
+    table = bytearray([NO_MOVE]) * SIZE
+    for index, (_, move) in solved.items():
+        table[index] = move
+    return table, len(solved)
+
+
+def save_table(table, path=DEFAULT_PATH):
+    """Writes a table to `path` atomically, so a process mapping the file never sees a partial one."""
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as fh:
+        fh.write(MAGIC)
+        fh.write(table)
+    os.replace(tmp, path)
+
+
+def load_table(path=DEFAULT_PATH):
+    """
+    Reads a table written by `save_table`.
+
+    Raises:
+        ValueError: If the file is not a perfect-play table.
+    """
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    if not data.startswith(MAGIC) or len(data) != len(MAGIC) + SIZE:
+        raise ValueError(f"{path} is not a perfect-play table")
+    return bytearray(data[len(MAGIC):])
+
+
+class PerfectPlayTable:
+    """
+    Answers best-move queries from a precomputed table.
+
+    If `path` names an existing file the table is loaded from it; otherwise it
+    is built in memory. `info()` reports how long that took and how big it is.
+    """
+
+    def __init__(self, path=None):
+        start = time.perf_counter()
+        if path and os.path.exists(path):
+            self.table = load_table(path)
+            self.source = path
+        else:
+            self.table, _ = build_table()
+            self.source = 'built'
+        self.startup_seconds = time.perf_counter() - start
+        self.positions = SIZE - self.table.count(NO_MOVE)
+
+    def best_move(self, board, ai):
+        """
+        Looks up the best move for `ai` on `board`.
+
+        Args:
+            board (list): The current 9-element board.
+            ai (str): The symbol the AI plays.
+
+        Returns:
+            int or None: The move, or None if the position is not in the table
+            (terminal, unreachable, or not `ai`'s turn) and a search is needed.
+        """
+        to_move = 'X' if board.count('X') == board.count('O') else 'O'
+        if ai != to_move:
+            return None
+        move = self.table[board_index(board)]
+        return None if move == NO_MOVE else move
+
+    def info(self):
+        """Startup cost and size of the table."""
+        return {
+            'source': self.source,
+            'startup_ms': self.startup_seconds * 1000,
+            'positions': self.positions,
+            'bytes': len(self.table),
+        }
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'build':
+        sys.exit("usage: python perfect_table.py build [path]")
+    out = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH
+    start = time.perf_counter()
+    table, positions = build_table()
+    elapsed = time.perf_counter() - start
+    save_table(table, out)
+    print(f"Solved {positions} positions in {elapsed * 1000:.1f} ms; "
+          f"wrote {len(MAGIC) + len(table)} bytes to {out}")
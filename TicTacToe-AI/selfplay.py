@@ -0,0 +1,273 @@
+"""
+Headless self-play tournaments between AI players.
+
+Every ordered pair of players (including a player against itself) plays a
+number of complete games, with the first player as X. The games go straight
+through `check_winner` and the engines' `get_best_move`, split into chunks
+across a pool of worker processes. The report gives:
+
+    * throughput (games and moves per second, over the wall time),
+    * average move latency per player,
+    * a win/draw/loss table for every pairing, and
+    * any game lost by a perfect player. That is always a bug, so the command
+      exits with status 1 when one happens.
+
+Players:
+
+    minimax    app.get_best_move (it consults the opening book when
+               TICTACTOE_BOOK_PATH is set, exactly as the server does)
+    table      the perfect-play table in perfect_table.py
+    bitboard   the bitboard engine in bitboard.py
+    random     a uniformly random legal move
+    depthN     the mnk.py engine searching at most N plies (e.g. depth2)
+
+    python selfplay.py --players minimax,random,depth2 --games 1000
+    python selfplay.py --players table,bitboard,random,depth1,depth3 --games 1000000 --json
+"""
+
+import argparse
+import importlib.util
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Players that search the whole game tree; they can never lose.
+PERFECT = ('minimax', 'table', 'bitboard')
+BASE_PLAYERS = PERFECT + ('random',)
+
+# The Tic-Tac-Toe app module. run() sets it before the pool starts, so forked
+# workers inherit it; spawned workers load it again in _init_worker.
+_GAME = None
+# Player name -> move function, built lazily in each process.
+_PLAYERS = {}
+
+
+def player_names(spec):
+    """
+    Parses a comma-separated list of player names.
+
+    Raises:
+        ValueError: If a name is not a known player.
+    """
+    names = [name.strip() for name in spec.split(',') if name.strip()]
+    for name in names:
+        if name not in BASE_PLAYERS and not (name.startswith('depth') and name[5:].isdigit()):
+            raise ValueError(f"Unknown player {name!r}, expected one of {', '.join(BASE_PLAYERS)} or depthN")
+    if not names:
+        raise ValueError("No players given")
+    return names
+
+
+def _load_game(path):
+    """Imports the app module from `path` under a name of its own."""
+    spec = importlib.util.spec_from_file_location('selfplay_game', path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['selfplay_game'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _init_worker(path):
+    global _GAME
+    if _GAME is None:
+        _GAME = _load_game(path)
+
+
+def get_player(name):
+    """
+    Returns the move function for a player, creating it on first use.
+
+    A move function takes (board, symbol, rng) and returns the cell to play.
+    """
+    player = _PLAYERS.get(name)
+    if player is not None:
+        return player
+    game = _GAME
+    if name == 'minimax':
+        def player(board, symbol, rng):
+            return game.get_best_move(board, symbol)
+    elif name == 'table':
+        from perfect_table import PerfectPlayTable
+        table = PerfectPlayTable()
+
+        def player(board, symbol, rng):
+            return table.best_move(board, symbol)
+    elif name == 'bitboard':
+        import bitboard
+
+        def player(board, symbol, rng):
+            return bitboard.get_best_move(board, symbol)
+    elif name == 'random':
+        def player(board, symbol, rng):
+            return rng.choice(game.get_available_moves(board))
+    else:
+        engine = game.get_mnk_engine(3, 3)
+        depth = int(name[5:])
+
+        def player(board, symbol, rng):
+            return engine.get_best_move(board, symbol, time_budget=math.inf, max_depth=depth)
+    _PLAYERS[name] = player
+    return player
+
+
+def play_games(x_name, o_name, games, seed):
+    """
+    Plays `games` games of `x_name` (as X) against `o_name` (as O).
+
+    Args:
+        x_name (str): The player moving first.
+        o_name (str): The player moving second.
+        games (int): Number of games.
+        seed (str): Seed for the random player's choices.
+
+    Returns:
+        dict: 'x', 'o' and 'tie' (games won by each side and drawn), plus
+        'moves' and 'seconds' per side ('X' and 'O') for the latency averages.
+    """
+    check_winner = _GAME.check_winner
+    sides = ((get_player(x_name), 'X'), (get_player(o_name), 'O'))
+    rng = random.Random(seed)
+    tally = {'X': 0, 'O': 0, 'tie': 0}
+    moves = {'X': 0, 'O': 0}
+    seconds = {'X': 0.0, 'O': 0.0}
+    clock = time.perf_counter
+    for _ in range(games):
+        board = [''] * 9
+        turn = 0
+        result = None
+        while result is None:
+            player, symbol = sides[turn & 1]
+            start = clock()
+            move = player(board, symbol, rng)
+            seconds[symbol] += clock() - start
+            moves[symbol] += 1
+            board[move] = symbol
+            result = check_winner(board)
+            turn += 1
+        tally[result] += 1
+    return {'x': tally['X'], 'o': tally['O'], 'tie': tally['tie'], 'moves': moves, 'seconds': seconds}
+
+
+def run(players, games=1000, workers=None, chunk=None, seed=0, game=None):
+    """
+    Plays a round-robin tournament.
+
+    Args:
+        players (list): Player names (see player_names).
+        games (int): Games per ordered pairing.
+        workers (int): Worker processes (default: one per CPU).
+        chunk (int): Games per task sent to a worker (default: enough for
+            about four tasks per worker and pairing).
+        seed (int): Base seed; the same seed replays the same tournament.
+        game (module): The Tic-Tac-Toe app module (default: `import app`).
+
+    Returns:
+        dict: The tournament report, see the module docstring.
+    """
+    global _GAME
+    _GAME = game or _GAME or importlib.import_module('app')
+    workers = workers or os.cpu_count() or 1
+    chunk = chunk or max(1, math.ceil(games / (workers * 4)))
+    pairings = list(itertools.product(players, repeat=2))
+
+    tasks = []
+    for x_name, o_name in pairings:
+        for start in range(0, games, chunk):
+            tasks.append((x_name, o_name, min(chunk, games - start), f'{seed}:{x_name}:{o_name}:{start}'))
+
+    results = {pair: {'x': 0, 'o': 0, 'tie': 0} for pair in pairings}
+    latency = {name: [0, 0.0] for name in players}  # name -> [moves, seconds]
+    wall = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(_GAME.__file__,)) as pool:
+        futures = [(task, pool.submit(play_games, *task)) for task in tasks]
+        for (x_name, o_name, _, _), future in futures:
+            chunk_result = future.result()
+            for key in ('x', 'o', 'tie'):
+                results[x_name, o_name][key] += chunk_result[key]
+            for name, side in ((x_name, 'X'), (o_name, 'O')):
+                latency[name][0] += chunk_result['moves'][side]
+                latency[name][1] += chunk_result['seconds'][side]
+    wall = time.perf_counter() - wall
+
+    total_games = games * len(pairings)
+    total_moves = sum(moves for moves, _ in latency.values())
+    losses = [
+        {'player': loser, 'opponent': winner, 'as': side, 'games': count}
+        for (x_name, o_name), counts in results.items()
+        for loser, winner, side, count in ((x_name, o_name, 'X', counts['o']), (o_name, x_name, 'O', counts['x']))
+        if count and loser in PERFECT
+    ]
+    return {
+        'workers': workers,
+        'games': total_games,
+        'seconds': wall,
+        'games_per_s': total_games / wall,
+        'moves_per_s': total_moves / wall,
+        'players': {
+            name: {'moves': moves, 'mean_move_us': seconds / moves * 1e6 if moves else 0.0}
+            for name, (moves, seconds) in latency.items()
+        },
+        'pairings': {f'{x_name}-{o_name}': counts for (x_name, o_name), counts in results.items()},
+        'perfect_losses': losses,
+    }
+
+
+def format_report(report, players):
+    """Renders a report as plain-text tables."""
+    lines = [
+        f"{report['games']} games on {report['workers']} worker(s) in {report['seconds']:.2f} s: "
+        f"{report['games_per_s']:,.0f} games/s, {report['moves_per_s']:,.0f} moves/s",
+        '',
+        f"{'player':<10} {'moves':>12} {'mean move':>12}",
+    ]
+    for name in players:
+        stats = report['players'][name]
+        lines.append(f"{name:<10} {stats['moves']:>12} {stats['mean_move_us']:>10.1f} us")
+
+    # Rows play X, columns play O; cells are X wins / draws / O wins.
+    rows = [[f"{c['x']}/{c['tie']}/{c['o']}" for c in (report['pairings'][f'{x_name}-{o_name}'] for o_name in players)]
+            for x_name in players]
+    width = max(len(cell) for row in rows for cell in row + players) + 2
+    lines += ['', 'X wins / draws / O wins (rows play X, columns play O)',
+              ' ' * 10 + ''.join(name.rjust(width) for name in players)]
+    for x_name, row in zip(players, rows):
+        lines.append(f'{x_name:<10}' + ''.join(cell.rjust(width) for cell in row))
+
+    lines.append('')
+    if report['perfect_losses']:
+        for loss in report['perfect_losses']:
+            lines.append(f"PERFECT PLAYER LOST: {loss['player']} (as {loss['as']}) lost "
+                         f"{loss['games']} game(s) to {loss['opponent']}")
+    else:
+        lines.append("No perfect player lost a game.")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python selfplay.py', description="Play AI-vs-AI Tic-Tac-Toe tournaments.")
+    parser.add_argument('--players', default='minimax,random,depth2',
+                        help="comma-separated players: minimax, table, bitboard, random, depthN")
+    parser.add_argument('--games', type=int, default=1000, help="games per ordered pairing")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--chunk', type=int, help="games per task sent to a worker")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the random player")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+    try:
+        players = player_names(args.players)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    report = run(players, games=args.games, workers=args.workers, chunk=args.chunk, seed=args.seed)
+    print(json.dumps(report, indent=2) if args.json else format_report(report, players))
+    return 1 if report['perfect_losses'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Production entry point for the Tic-Tac-Toe game.
+
+Runs the app under a multi-worker server instead of the Flask development
+server started by `python app.py`:
+
+    python serve.py                        # gunicorn, one worker per CPU
+    python serve.py --workers 8 --bind 0.0.0.0:8000
+    python serve.py --server uvicorn       # ASGI mode (see asgi.py)
+
+Defaults can also be set through the environment: WEB_CONCURRENCY (workers),
+BIND, KEEP_ALIVE and BACKLOG.
+
+Each player's game is kept in a game store (see game_store.py). With more
+than one worker the store defaults to SQLite (TICTACTOE_STORE=sqlite) so that
+every worker sees every game; set TICTACTOE_STORE=memory explicitly only if a
+load balancer pins each player to one worker.
+"""
+
+import argparse
+import gc
+import os
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve the Tic-Tac-Toe game with a production server.")
+    parser.add_argument('--server', choices=['gunicorn', 'uvicorn'], default='gunicorn',
+                        help="gunicorn serves the WSGI app; uvicorn serves the ASGI app in asgi.py")
+    parser.add_argument('--bind', default=os.environ.get('BIND', '0.0.0.0:5000'),
+                        help="host:port to listen on")
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1)),
+                        help="number of worker processes")
+    parser.add_argument('--threads', type=int, default=1,
+                        help="threads per gunicorn worker (more than 1 selects the gthread worker and enables the WebSocket)")
+    parser.add_argument('--keep-alive', type=int, default=int(os.environ.get('KEEP_ALIVE', '5')),
+                        help="seconds to hold idle keep-alive connections open")
+    parser.add_argument('--backlog', type=int, default=int(os.environ.get('BACKLOG', '2048')),
+                        help="maximum number of pending connections")
+    parser.add_argument('--timeout', type=int, default=30,
+                        help="seconds before a silent worker is restarted (gunicorn)")
+    return parser.parse_args(argv)
+
+
+def run_gunicorn(args: argparse.Namespace) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    class Server(BaseApplication):
+        def load_config(self):
+            options = {
+                'bind': args.bind,
+                'workers': args.workers,
+                'threads': args.threads,
+                'worker_class': 'gthread' if args.threads > 1 else 'sync',
+                'keepalive': args.keep_alive,
+                'backlog': args.backlog,
+                'timeout': args.timeout,
+                # Import and warm the app once in the master so workers fork
+                # with the engine tables already built.
+                'preload_app': True,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app import create_app
+            # Runs once in the master (preload_app): build the engine tables, with the
+            # WebSocket only for threaded workers (a sync worker serves one
+            # request at a time, so an open socket would hold it until the tab
+            # closes; the page then stays on fetch). Then move the objects
+            # built so far out of the collector's reach, so collections in the
+            # workers don't write to, and so un-share, their pages.
+            application = create_app(websocket=args.threads > 1, warm=True)
+            gc.freeze()
+            return application
+
+    Server().run()
+
+
+def run_uvicorn(args: argparse.Namespace) -> None:
+    import uvicorn
+
+    host, _, port = args.bind.rpartition(':')
+    uvicorn.run(
+        'asgi:application',
+        host=host or '0.0.0.0',
+        port=int(port),
+        workers=args.workers,
+        backlog=args.backlog,
+        timeout_keep_alive=args.keep_alive,
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+    )
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.workers > 1:
+        # Games must be visible to every worker; set before app.py is imported.
+        os.environ.setdefault('TICTACTOE_STORE', 'sqlite')
+    if args.server == 'uvicorn':
+        run_uvicorn(args)
+    else:
+        run_gunicorn(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Test setup: the game's modules are imported from the TicTacToe-AI folder.
+
+`app.py` is loaded under its own name, `tictactoe_app`, so this suite can
+share a pytest run with the chatbot's, whose app module is also `app.py`.
+Engine and store settings that could be set in a developer's environment are
+cleared first, so the app starts on its defaults.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+for var in ('TICTACTOE_ENGINE', 'TICTACTOE_ENGINE_SWITCH', 'TICTACTOE_BOOK_PATH', 'TICTACTOE_STORE',
+            'TICTACTOE_METRICS', 'TICTACTOE_TIME_BUDGET'):
+    os.environ.pop(var, None)
+
+
+def load_game():
+    """Returns the Tic-Tac-Toe app module, importing it on first use."""
+    module = sys.modules.get('tictactoe_app')
+    if module is None:
+        spec = importlib.util.spec_from_file_location('tictactoe_app', os.path.join(GAME_DIR, 'app.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['tictactoe_app'] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def game():
+    return load_game()
+
+
+@pytest.fixture
+def client(game):
+    return game.app.test_client()
+
+
+@pytest.fixture(scope='session')
+def positions(game):
+    """Every non-terminal 3 x 3 position reachable from the empty board, with the symbol to move."""
+    seen, found = set(), []
+
+    def walk(board, turn):
+        if tuple(board) in seen:
+            return
+        seen.add(tuple(board))
+        if game.check_winner(board) is not None:
+            return
+        found.append((list(board), turn))
+        for i in range(9):
+            if not board[i]:
+                board[i] = turn
+                walk(board, 'O' if turn == 'X' else 'X')
+                board[i] = ''
+
+    walk([''] * 9, 'X')
+    return found
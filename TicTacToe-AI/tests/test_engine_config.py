@@ -0,0 +1,40 @@
+"""
+Engine settings read at startup: TICTACTOE_ENGINE and TICTACTOE_ENGINE_SWITCH.
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def fresh_app():
+    """Imports app.py again, under a throwaway name, with the current environment."""
+    spec = importlib.util.spec_from_file_location('tictactoe_app_config', os.path.join(GAME_DIR, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_unknown_engine_fails_at_startup(monkeypatch):
+    monkeypatch.setenv('TICTACTOE_ENGINE', 'alphazero')
+    with pytest.raises(ValueError, match='TICTACTOE_ENGINE'):
+        fresh_app()
+
+
+def test_engine_switch_is_off_by_default(client):
+    assert client.post('/engine', json={'engine': 'table'}).status_code == 404
+
+
+@pytest.mark.parametrize('value,routed', [('1', True), ('yes', True), ('0', False), ('', False)])
+def test_engine_switch_opt_in(monkeypatch, value, routed):
+    monkeypatch.setenv('TICTACTOE_ENGINE', 'bitboard')
+    monkeypatch.setenv('TICTACTOE_ENGINE_SWITCH', value)
+    module = fresh_app()
+    assert module.ENGINE == 'bitboard'
+    response = module.app.test_client().post('/engine', json={'engine': 'minimax'})
+    assert (response.status_code != 404) is routed
+    if routed:
+        assert module.ENGINE == 'minimax'
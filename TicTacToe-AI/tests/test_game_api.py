@@ -0,0 +1,37 @@
+"""
+Request validation of the game's JSON routes: malformed input gets an error
+reply, never a 500.
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize('route', ['/set-symbol', '/make-move'])
+@pytest.mark.parametrize('body', ['[1, 2]', '"X"', 'null', '7', 'not json', ''])
+def test_non_object_bodies_are_rejected(client, route, body):
+    response = client.post(route, data=body, content_type='application/json')
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Expected a JSON object'}
+
+
+def test_set_symbol_checks_its_fields(client):
+    assert 'error' in client.post('/set-symbol', json={}).get_json()
+    assert 'error' in client.post('/set-symbol', json={'symbol': 'Z'}).get_json()
+    assert 'error' in client.post('/set-symbol', json={'symbol': 'X', 'size': 'big'}).get_json()
+    assert client.post('/set-symbol', json={'symbol': 'X'}).get_json()['success'] is True
+
+
+@pytest.mark.parametrize('position', ['abc', '', [1], {'cell': 1}, 9, -1, '12'])
+def test_bad_positions_are_invalid_moves(client, position):
+    client.post('/set-symbol', json={'symbol': 'X'})
+    response = client.post('/make-move', json={'position': position})
+    assert response.status_code == 200
+    assert response.get_json() == {'error': 'Invalid move'}
+
+
+def test_a_move_gets_an_answer(client):
+    client.post('/set-symbol', json={'symbol': 'X'})
+    state = client.post('/make-move', json={'position': '4'}).get_json()
+    assert state['board'][4] == 'X'
+    assert state['board'].count('O') == 1
+    assert state['currentPlayer'] == 'X'
@@ -0,0 +1,39 @@
+"""
+Per-move metrics: search statistics come only from engines that count them.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import game_metrics
+
+
+def render_move(game, monkeypatch, engine, size=3, k=3):
+    """Plays one AI move with `engine` and metrics on; returns the /metrics text."""
+    metrics = game_metrics.GameMetrics()
+    monkeypatch.setattr(game, 'METRICS', metrics)
+    monkeypatch.setattr(game, 'ENGINE', engine)
+    if engine == 'table':
+        game.load_perfect_table()
+    board = [''] * (size * size)
+    board[0] = 'X'
+    game.choose_move(SimpleNamespace(board=board, ai='O', size=size, k=k))
+    return metrics.render()
+
+
+@pytest.mark.parametrize('engine', ['table', 'bitboard'])
+def test_lookups_record_no_search_stats(game, monkeypatch, engine):
+    text = render_move(game, monkeypatch, engine)
+    assert f'tictactoe_move_duration_seconds_count{{engine="{engine}"}} 1' in text
+    assert 'tictactoe_search_nodes_' not in text
+    assert 'tictactoe_search_depth_' not in text
+
+
+def test_searches_record_their_stats(game, monkeypatch):
+    text = render_move(game, monkeypatch, 'minimax')
+    assert 'tictactoe_search_nodes_count{engine="minimax"} 1' in text
+    assert 'tictactoe_search_depth_count{engine="minimax"} 1' in text
+    assert 'tictactoe_search_prunes_total{engine="minimax"}' in text
+    text = render_move(game, monkeypatch, 'minimax', size=5, k=4)
+    assert 'tictactoe_search_nodes_count{engine="mnk"} 1' in text
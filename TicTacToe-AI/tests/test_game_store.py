@@ -0,0 +1,75 @@
+"""
+Game stores: the compact encoding and batched expiry of the in-memory store.
+
+The memory store takes its clock as an argument, so these tests drive time by
+hand instead of sleeping.
+"""
+
+import math
+
+import pytest
+
+from game_store import EXPIRE_BATCH, MAX_SIZE, Game, MemoryGameStore, SQLiteGameStore
+
+GAMES = 10_000
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize('size,k', [(3, 3), (5, 4), (MAX_SIZE, 5), (MAX_SIZE, MAX_SIZE)])
+def test_encoding_round_trips(size, k):
+    board = [''] * (size * size)
+    board[0], board[-1] = 'X', 'O'
+    state = Game('O', size, k, board).encode()
+    assert len(state) == 3 + size * size
+    game = Game.decode(state)
+    assert (game.human, game.size, game.k, game.board) == ('O', size, k, board)
+
+
+def test_expiry_sweep_is_batched():
+    clock = Clock()
+    store = MemoryGameStore(ttl=10, max_games=GAMES, clock=clock)
+    for i in range(GAMES):
+        store.put(f'old{i}', Game('X'))
+    clock.now = 20
+    assert store.get('old0') is None  # Expired games are never handed out.
+    calls = 0
+    while len(store) > calls:
+        before = len(store)
+        store.put(f'new{calls}', Game('X'))
+        calls += 1
+        # One new game in, at most EXPIRE_BATCH expired ones out.
+        assert len(store) >= before + 1 - EXPIRE_BATCH
+    assert calls == math.ceil((GAMES - 1) / EXPIRE_BATCH)
+    assert store.expired == GAMES
+    assert store.evicted == 0
+    assert store.get(f'old{GAMES - 1}') is None and store.get(f'new{calls - 1}') is not None
+
+
+def test_cap_drops_least_recently_saved():
+    clock = Clock()
+    store = MemoryGameStore(ttl=math.inf, max_games=100, clock=clock)
+    for i in range(150):
+        store.put(f'g{i}', Game('X'))
+        if i % 10 == 0:
+            store.put('g0', Game('O'))
+    assert len(store) == 100 and store.evicted == 50
+    assert store.get('g0').human == 'O'
+    assert store.get('g1') is None and store.get('g149') is not None
+
+
+def test_sqlite_store_round_trips(tmp_path):
+    store = SQLiteGameStore(str(tmp_path / 'games.db'))
+    game = Game('X', MAX_SIZE, 5)
+    game.board[40] = 'O'
+    store.put('abc', game)
+    loaded = store.get('abc')
+    assert (loaded.size, loaded.k, loaded.board) == (MAX_SIZE, 5, game.board)
+    store.delete('abc')
+    assert store.get('abc') is None
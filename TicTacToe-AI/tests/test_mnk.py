@@ -0,0 +1,82 @@
+"""
+MNKEngine: the wall-clock budget and the iterative-deepening result.
+"""
+
+import random
+import time
+
+import pytest
+
+import game_metrics
+from mnk import MNKEngine
+
+# Allowed overrun of the time budget: timer and scheduling slack, not search.
+MARGIN = 0.025
+
+
+def random_board(size, pieces, rng):
+    board = [''] * (size * size)
+    for i in range(pieces):
+        board[rng.choice([c for c, v in enumerate(board) if not v])] = 'XO'[i % 2]
+    return board
+
+
+@pytest.mark.parametrize('size,k', [(9, 5), (7, 5), (5, 4), (4, 4)])
+@pytest.mark.parametrize('budget', [0.01, 0.05])
+def test_search_stays_within_budget(size, k, budget):
+    engine = MNKEngine(size, k)
+    rng = random.Random(size * 100 + k)
+    for _ in range(5):
+        board = random_board(size, rng.randint(0, 6), rng)
+        start = time.perf_counter()
+        move = engine.get_best_move(board, 'O', time_budget=budget)
+        elapsed = time.perf_counter() - start
+        assert elapsed <= budget + MARGIN
+        assert board[move] == ''
+
+
+def test_deeper_iterations_complete_with_more_time():
+    engine = MNKEngine(7, 5)
+    board = random_board(7, 4, random.Random(1))
+    short, long = game_metrics.SearchStats(), game_metrics.SearchStats()
+    engine.get_best_move(board, 'O', time_budget=0.01, stats=short)
+    engine.get_best_move(board, 'O', time_budget=0.5, stats=long)
+    assert 1 <= short.max_depth <= long.max_depth
+    assert long.nodes > short.nodes
+
+
+def test_max_depth_caps_the_search():
+    stats = game_metrics.SearchStats()
+    MNKEngine(5, 4).get_best_move([''] * 25, 'X', time_budget=10, max_depth=2, stats=stats)
+    assert stats.max_depth == 2
+
+
+def test_full_search_of_three_by_three():
+    # The empty board is a draw; with time to spare every ply is searched.
+    stats = game_metrics.SearchStats()
+    move = MNKEngine(3, 3).get_best_move([''] * 9, 'X', time_budget=30, stats=stats)
+    assert stats.max_depth == 9
+    assert move in range(9)
+
+
+def test_takes_a_win_before_blocking():
+    engine = MNKEngine(5, 4)
+    board = [''] * 25
+    for i in (0, 1, 2):
+        board[i] = 'O'        # Top row: O wins at 3.
+    for i in (10, 11, 12):
+        board[i] = 'X'        # Middle row: X threatens 13.
+    assert engine.get_best_move(board, 'O', time_budget=1) == 3
+    board[3] = 'X'
+    assert engine.get_best_move(board, 'O', time_budget=1) == 13
+
+
+def test_blocks_an_immediate_loss():
+    engine = MNKEngine(7, 5)
+    board = [''] * 49
+    for i in (22, 23, 24, 25):
+        board[i] = 'X'        # Four in the middle row, open at 21 only.
+    board[26] = 'O'
+    for i in (0, 48, 6):
+        board[i] = 'O'
+    assert engine.get_best_move(board, 'O', time_budget=1) == 21
@@ -0,0 +1,34 @@
+"""
+The opening book is a perfect-play table file, mapped read-only.
+"""
+
+import pytest
+
+from opening_book import OpeningBook, build_book
+from perfect_table import build_table, save_table
+
+
+def test_full_book_is_the_perfect_play_table():
+    table, _ = build_table()
+    book, positions = build_book()
+    assert book == table and positions == 4520
+
+
+def test_book_moves_match_the_search(game, positions, tmp_path):
+    path = str(tmp_path / 'book.bin')
+    save_table(build_book(opening_plies=2, endgame_empty=4)[0], path)
+    book = OpeningBook(path)
+    for board, ai in positions:
+        move = book.best_move(board, ai)
+        assert move is None or move == game.get_best_move(board, ai)
+    info = book.info()
+    assert info['hits'] == info['positions'] == 3512
+    assert info['misses'] == 4520 - 3512
+    book.close()
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / 'book.bin'
+    path.write_bytes(b'not a table')
+    with pytest.raises(ValueError):
+        OpeningBook(str(path))
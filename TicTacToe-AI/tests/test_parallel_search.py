@@ -0,0 +1,43 @@
+"""
+The 'parallel' engine picks exactly the move get_best_move does, in every
+position a 3 x 3 game can reach.
+"""
+
+import pytest
+
+from parallel_search import ParallelRootSearch
+
+
+@pytest.fixture
+def pooled(game):
+    # Two workers and no cutoff, so even one-CPU machines use the pool everywhere.
+    search = ParallelRootSearch(game.score_root_move, workers=2, min_empty=1)
+    yield search
+    search.close()
+
+
+def test_pool_matches_serial_search(game, positions, pooled):
+    assert len(positions) == 4520
+    mismatches = [(board, ai) for board, ai in positions
+                  if pooled.best_move(board, ai) != game.get_best_move(board, ai)]
+    assert mismatches == []
+    assert pooled.parallel_searches == len(positions)
+    # Forced wins found early cancelled later root moves that hadn't started.
+    assert pooled.cancelled > 0
+
+
+def test_forced_win_on_the_first_move_skips_the_rest(game, pooled):
+    board = ['X', 'X', '',
+             'O', 'O', '',
+             '', '', '']
+    assert pooled.best_move(board, 'X') == 2 == game.get_best_move(board, 'X')
+    assert pooled.cancelled == 0
+
+
+def test_small_positions_stay_in_process(game, positions):
+    search = ParallelRootSearch(game.score_root_move, workers=2, min_empty=8)
+    for board, ai in positions[::25]:
+        assert search.best_move(board, ai) == game.get_best_move(board, ai)
+    assert search.serial_searches > 0 and search.parallel_searches > 0
+    search.close()
+    assert search.best_move(['X'] * 9, 'O') is None
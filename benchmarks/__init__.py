@@ -0,0 +1,10 @@
+"""
+Benchmarks for the Chatbot and Tic-Tac-Toe apps.
+
+    python -m benchmarks micro              # engine-level timings
+    python -m benchmarks load               # HTTP latency/throughput (Flask test client)
+    python -m benchmarks all -o run.json    # everything, written as JSON
+    python -m benchmarks all --baseline baseline.json   # fail on regressions
+
+See benchmarks/README.md for details.
+"""
@@ -0,0 +1,81 @@
+"""Command-line entry point: `python -m benchmarks`."""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from benchmarks import compare, load, micro, sessions, startup, tournament
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    parser.add_argument('suite', nargs='?', choices=['micro', 'load', 'sessions', 'selfplay', 'startup', 'all'], default='all')
+    parser.add_argument('-o', '--output', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="compare against this JSON file; exit 1 on regression")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed relative slowdown before a metric counts as a regression")
+    parser.add_argument('--repeat', type=int, default=2000, help="calls per chat intent (micro)")
+    parser.add_argument('--requests', type=int, default=5000, help="/chat requests (load)")
+    parser.add_argument('--games', type=int, default=300, help="games played via /make-move (load)")
+    parser.add_argument('--concurrency', type=int, default=1, help="concurrent clients (load)")
+    parser.add_argument('--sessions', type=int, default=100_000, help="live games held in each store (sessions)")
+    parser.add_argument('--selfplay-games', type=int, default=20,
+                        help="games per pairing of AI players (selfplay)")
+    parser.add_argument('--startup-runs', type=int, default=10,
+                        help="fresh interpreters started per app and mode (startup)")
+    parser.add_argument('--chat-url', help="base URL of a running chatbot instead of the test client")
+    parser.add_argument('--game-url', help="base URL of a running Tic-Tac-Toe app instead of the test client")
+    parser.add_argument('--websocket', action='store_true',
+                        help="drive --chat-url/--game-url over their WebSocket channels instead of HTTP")
+    args = parser.parse_args(argv)
+
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        }
+    }
+    if args.suite in ('micro', 'all'):
+        results['micro'] = micro.run(repeat=args.repeat)
+    if args.suite in ('load', 'all'):
+        results['load'] = load.run(
+            chat_requests=args.requests, games=args.games, concurrency=args.concurrency,
+            chat_url=args.chat_url, game_url=args.game_url, websocket=args.websocket,
+        )
+    if args.suite in ('sessions', 'all'):
+        results['sessions'] = sessions.run(sessions=args.sessions)
+    if args.suite in ('selfplay', 'all'):
+        results['selfplay'] = tournament.run(games=args.selfplay_games)
+    if args.suite in ('startup', 'all'):
+        results['startup'] = startup.run(runs=args.startup_runs)
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(text + '\n')
+    else:
+        print(text)
+
+    status = 0
+    for loss in results.get('selfplay', {}).get('perfect_losses', []):
+        print(f"PERFECT PLAYER LOST: {loss['player']} (as {loss['as']}) lost "
+              f"{loss['games']} game(s) to {loss['opponent']}", file=sys.stderr)
+        status = 1
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        worse = compare.regressions(results, baseline, tolerance=args.tolerance)
+        for name, old, new in worse:
+            print(f"REGRESSION {name}: {old:.1f} -> {new:.1f}", file=sys.stderr)
+        if worse:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of the baseline.", file=sys.stderr)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
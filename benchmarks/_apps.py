@@ -0,0 +1,37 @@
+"""Load the two apps by file path.
+
+Both projects keep their code in an `app.py` inside a folder that is not a
+Python package (`TicTacToe-AI` is not even a valid identifier), so they are
+imported under distinct module names with their folder on `sys.path` for
+sibling imports such as `rules`.
+"""
+
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHATBOT_DIR = os.path.join(ROOT, 'Chatbot')
+TICTACTOE_DIR = os.path.join(ROOT, 'TicTacToe-AI')
+
+
+def _load(name, folder):
+    if name in sys.modules:
+        return sys.modules[name]
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+    spec = importlib.util.spec_from_file_location(name, os.path.join(folder, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_chatbot():
+    """Return the Chatbot `app` module."""
+    return _load('chatbot_app', CHATBOT_DIR)
+
+
+def load_tictactoe():
+    """Return the Tic-Tac-Toe `app` module."""
+    return _load('tictactoe_app', TICTACTOE_DIR)
@@ -0,0 +1,43 @@
+"""Compare a benchmark run against a stored baseline."""
+
+
+def flatten(result, prefix=''):
+    """Flatten nested result dicts into {'a.b.metric': value}."""
+    flat = {}
+    for key, value in result.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+# Throughput metrics: higher is better. Everything else compared is a latency.
+THROUGHPUT = ('rps', 'games_per_s')
+
+
+def regressions(current, baseline, tolerance=0.25,
+                metrics=('p50_us', 'p95_us', 'mean_move_us', 'rps', 'games_per_s')):
+    """List metrics that got worse than the baseline by more than `tolerance`.
+
+    Latencies (`*_us`) regress when they grow, throughput (`rps`,
+    `games_per_s`) when it drops. Metrics missing from either run are ignored.
+
+    Returns:
+        list of (name, baseline_value, current_value) tuples.
+    """
+    cur = flatten(current)
+    base = flatten(baseline)
+    worse = []
+    for name, old in base.items():
+        if name not in cur or not name.endswith(metrics) or old <= 0:
+            continue
+        new = cur[name]
+        if name.endswith(THROUGHPUT):
+            bad = new < old * (1 - tolerance)
+        else:
+            bad = new > old * (1 + tolerance)
+        if bad:
+            worse.append((name, old, new))
+    return worse
@@ -0,0 +1,158 @@
+"""HTTP load generator for /chat, /set-symbol and /make-move.
+
+By default requests go through Flask's test client in-process, which measures
+the full request/JSON path without network noise. Pass a base URL to drive a
+running server instead (e.g. one started with serve.py); each concurrent
+client then keeps its own keep-alive connection and cookies, or, with
+`websocket=True`, its own WebSocket connections.
+"""
+
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from benchmarks._apps import load_chatbot, load_tictactoe
+from benchmarks.micro import INTENT_SAMPLES
+from benchmarks.stats import summarize
+
+
+class TestClientTransport:
+    """Posts JSON through a Flask test client."""
+
+    def __init__(self, flask_app):
+        self.client = flask_app.test_client()
+
+    def post(self, path, payload):
+        resp = self.client.post(path, json=payload)
+        return resp.status_code, resp.get_json()
+
+
+class HTTPTransport:
+    """Posts JSON to a live server over one keep-alive connection."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        self.cookie = None
+
+    def post(self, path, payload):
+        headers = {'Content-Type': 'application/json'}
+        if self.cookie:
+            headers['Cookie'] = self.cookie
+        self.conn.request('POST', path, body=json.dumps(payload), headers=headers)
+        resp = self.conn.getresponse()
+        body = resp.read()
+        cookie = resp.getheader('Set-Cookie')
+        if cookie:
+            self.cookie = cookie.split(';', 1)[0]
+        return resp.status, json.loads(body) if body else None
+
+
+class WebSocketTransport:
+    """Sends each request as a frame over a persistent WebSocket to a live server.
+
+    `/chat` goes to `/ws/chat`; `/set-symbol` and `/make-move` go to
+    `/ws/game`. Needs the `websockets` package.
+    """
+
+    SOCKETS = {'/chat': '/ws/chat', '/set-symbol': '/ws/game', '/make-move': '/ws/game'}
+
+    def __init__(self, base_url):
+        from websockets.sync.client import connect
+        self._connect = connect
+        self.base = 'ws' + base_url[len('http'):] if base_url.startswith('http') else base_url
+        self.sockets = {}
+
+    def post(self, path, payload):
+        socket_path = self.SOCKETS[path]
+        conn = self.sockets.get(socket_path)
+        if conn is None:
+            conn = self.sockets[socket_path] = self._connect(self.base.rstrip('/') + socket_path)
+        if socket_path == '/ws/game':
+            payload = dict(payload, type=path.lstrip('/'))
+        conn.send(json.dumps(payload))
+        return 200, json.loads(conn.recv())
+
+
+def _timed(transport, samples, path, payload):
+    start = time.perf_counter()
+    status, body = transport.post(path, payload)
+    samples.setdefault(path, []).append(time.perf_counter() - start)
+    if status != 200:
+        raise RuntimeError(f"{path} returned HTTP {status}: {body}")
+    return body
+
+
+def chat_worker(transport, requests, samples):
+    messages = list(INTENT_SAMPLES.values())
+    for i in range(requests):
+        _timed(transport, samples, '/chat', {'message': messages[i % len(messages)]})
+
+
+def game_worker(transport, games, samples, seed=0):
+    """Play complete games: the human side picks random empty cells."""
+    rng = random.Random(seed)
+    for g in range(games):
+        human = 'X' if g % 2 == 0 else 'O'
+        _timed(transport, samples, '/set-symbol', {'symbol': human})
+        state = None
+        if human == 'O':
+            state = _timed(transport, samples, '/make-move', {})
+        board = state['board'] if state else [''] * 9
+        while not (state and state.get('gameOver')):
+            empty = [i for i, cell in enumerate(board) if not cell]
+            state = _timed(transport, samples, '/make-move', {'position': rng.choice(empty)})
+            if 'error' in state:
+                break
+            board = state['board']
+
+
+def _run(make_transport, worker, count, concurrency):
+    """Split `count` units of work across `concurrency` clients and time them."""
+    per_client = [count // concurrency + (1 if i < count % concurrency else 0) for i in range(concurrency)]
+    results = [{} for _ in range(concurrency)]
+    transports = [make_transport() for _ in range(concurrency)]
+    threads = [
+        threading.Thread(target=worker, args=(transports[i], per_client[i], results[i]))
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    merged = {}
+    for r in results:
+        for path, samples in r.items():
+            merged.setdefault(path, []).extend(samples)
+    return {path: summarize(samples, wall) for path, samples in merged.items()}
+
+
+def run(chat_requests=5000, games=300, concurrency=1, chat_url=None, game_url=None, websocket=False):
+    """Drive both apps and return per-route latency percentiles and requests per second.
+
+    With `websocket`, servers given by URL are driven over their WebSocket
+    channels instead of HTTP, and their results are keyed `ws:<route>`.
+    """
+    remote = WebSocketTransport if websocket else HTTPTransport
+    if chat_url:
+        chat_transport = lambda: remote(chat_url)
+    else:
+        chat_app = load_chatbot().app
+        chat_transport = lambda: TestClientTransport(chat_app)
+    if game_url:
+        game_transport = lambda: remote(game_url)
+    else:
+        game_app = load_tictactoe().app
+        game_transport = lambda: TestClientTransport(game_app)
+
+    results = {}
+    for name, stats in _run(chat_transport, chat_worker, chat_requests, concurrency).items():
+        results[f'ws:{name}' if websocket and chat_url else name] = stats
+    for name, stats in _run(game_transport, game_worker, games, concurrency).items():
+        results[f'ws:{name}' if websocket and game_url else name] = stats
+    return results
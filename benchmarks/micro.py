@@ -0,0 +1,317 @@
+"""Micro-benchmarks: the chatbot rule engine and the Tic-Tac-Toe search."""
+
+import math
+import random
+import time
+
+from benchmarks._apps import load_chatbot, load_tictactoe
+from benchmarks.stats import summarize, time_calls
+
+
+# One representative message per chatbot intent, keyed by rule name.
+INTENT_SAMPLES = {
+    'greeting': 'hello there',
+    'farewell': 'ok see you',
+    'thanks': 'thank you so much',
+    'identity': 'what is your name',
+    'creator': 'who made you',
+    'joke': 'tell me a joke',
+    'weather': 'will it rain',
+    'time': 'what time is it',
+    'date': "what's the date",
+    'weekday': 'which day is it',
+    'status': 'how are you',
+    'empathy': 'i feel sad',
+    'color': 'your favorite color',
+    'math': 'what is 12 * 7',
+    'help': 'what can you do',
+    'privacy': 'how old are you',
+    'echo': 'repeat after me the quick brown fox',
+    'examples': 'show me an example',
+    'likes': 'i love pizza',
+    'compliment': 'that was awesome',
+    'hobbies': 'any hobbies',
+    'advice': 'give me advice',
+    'quote': 'share a quote',
+    'programming': 'i write python',
+    'food': 'i am hungry',
+    'news': 'any news',
+    'language': 'favorite language',
+    'fallback': 'the quick brown fox jumps over the lazy dog near the river bank',
+}
+
+
+def bench_chat(repeat=2000, cached=False):
+    """Time get_bot_response for every intent sample, including the fallback.
+
+    The response cache is switched off unless `cached` is set, so by default
+    every call runs the rule engine; with it, every call after the first is
+    a cache hit.
+    """
+    chat = load_chatbot()
+    index = chat.RULE_STORE.index
+    cache = chat.RESPONSE_CACHE
+    saved = cache.maxsize
+    cache.maxsize = cache.maxsize if cached else 0
+    results = {}
+    try:
+        for intent, message in INTENT_SAMPLES.items():
+            hit = index.match(message)
+            matched = hit[0].name if hit else 'fallback'
+            if matched != intent:
+                raise AssertionError(f"sample for {intent!r} resolved to {matched!r}: {message!r}")
+            samples = time_calls(chat.get_bot_response, [(message,)], repeat=repeat)
+            results[intent] = summarize(samples)
+    finally:
+        cache.maxsize = saved
+    return results
+
+
+# Paraphrases no rule matches, for the fallback intent classifier.
+CLASSIFIER_SAMPLES = (
+    'cya', 'got any jokes', 'thanx a lot', "i'm starving", 'is it snowing outside',
+    'the train to boston leaves at noon', 'purple elephants dance on the moon',
+    'i am looking for something interesting to read about a topic',
+)
+
+
+def bench_classifier(repeat=500):
+    """Time the fallback intent classifier (Chatbot/classifier.py) on messages no rule matches.
+
+    Returns None unless a trained model exists (`python classifier.py train`).
+    The latency budget is lifted so every call scores the whole message.
+    """
+    chat = load_chatbot()
+    if chat.CLASSIFIER is None:
+        return None
+    from classifier import IntentClassifier
+    model = IntentClassifier.load(chat.CLASSIFIER_PATH, budget=math.inf)
+    index = chat.RULE_STORE.index
+    for message in CLASSIFIER_SAMPLES:
+        if index.match(message) is not None:
+            raise AssertionError(f"classifier sample is matched by a rule: {message!r}")
+    return summarize(time_calls(model.predict, [(m,) for m in CLASSIFIER_SAMPLES], repeat=repeat))
+
+
+# Expressions for the chatbot's arithmetic engine, from a single operation up
+# to the length limit, plus inputs the limits reject.
+CALC_SAMPLES = {
+    'binary': '12 * 7',
+    'precedence': '2 + 3 * 4 - 5 / 2',
+    'parentheses': '((1 + 2) * (3 + 4)) % 5',
+    'power': '-2 ^ 3 ^ 2',
+    'words': '3 plus 4 times 2 divided by 8 to the power of 2',
+    'longest': ' + '.join(['(12.5 * 3)'] * 15),
+    'too_long': '1 + ' * 60 + '1',
+    'huge_exponent': '2 ^ 5000',
+}
+
+
+def bench_calc(repeat=2000):
+    """Time the chatbot's expression engine (Chatbot/calc.py) per sample expression.
+
+    `evaluate` is what the math rule runs, with the compiled program cached;
+    `compile` is the tokenizer and parser alone, bypassing that cache. Rejected
+    samples are timed up to the error.
+    """
+    load_chatbot()
+    import calc
+
+    def guarded(fn):
+        def call(text):
+            try:
+                fn(text)
+            except calc.CalcError:
+                pass
+        return call
+
+    evaluate, compile_ = guarded(calc.evaluate), guarded(calc.compile_expression.__wrapped__)
+    return {
+        'evaluate': {name: summarize(time_calls(evaluate, [(text,)], repeat=repeat))
+                     for name, text in CALC_SAMPLES.items()},
+        'compile': {name: summarize(time_calls(compile_, [(text,)], repeat=repeat))
+                    for name, text in CALC_SAMPLES.items()},
+    }
+
+
+def reachable_positions():
+    """Yield every non-terminal board reachable from the empty board (X moves first)."""
+    game = load_tictactoe()
+    seen = set()
+    stack = [('',) * 9]
+    while stack:
+        cells = stack.pop()
+        if cells in seen:
+            continue
+        seen.add(cells)
+        board = list(cells)
+        if game.check_winner(board) is not None:
+            continue
+        yield board
+        to_move = 'X' if board.count('X') == board.count('O') else 'O'
+        for i in range(9):
+            if not board[i]:
+                child = list(cells)
+                child[i] = to_move
+                stack.append(tuple(child))
+
+
+def side_to_move(board):
+    return 'X' if board.count('X') == board.count('O') else 'O'
+
+
+def bench_best_move(game=None, best_move=None):
+    """Time get_best_move from every reachable position, for whichever side is to move.
+
+    Returns a summary over all positions plus the empty-board (worst) case.
+    """
+    game = game or load_tictactoe()
+    best_move = best_move or game.get_best_move
+    saved = game.HUMAN, game.AI
+    samples = []
+    empty = []
+    try:
+        for board in reachable_positions():
+            game.AI = side_to_move(board)
+            game.HUMAN = 'O' if game.AI == 'X' else 'X'
+            t = time_calls(best_move, [(board,)])
+            samples.extend(t)
+            if not any(board):
+                empty.extend(t)
+    finally:
+        game.HUMAN, game.AI = saved
+    return {'all_positions': summarize(samples), 'empty_board': summarize(empty)}
+
+
+def bench_perfect_table():
+    """Time table lookups from every reachable position, plus the table's startup cost."""
+    game = load_tictactoe()
+    from perfect_table import PerfectPlayTable
+    table = PerfectPlayTable()
+    result = bench_best_move(game, lambda board: table.best_move(board, game.AI))
+    result['startup_ms'] = table.startup_seconds * 1000
+    return result
+
+
+def bench_bitboard():
+    """Time the bitboard engine from every reachable position.
+
+    The transposition table is cleared first, so the first (empty-board)
+    search is measured cold and `cold_empty_board_us` reports it separately;
+    the sweep that follows shows warm-table performance.
+    """
+    game = load_tictactoe()
+    import bitboard
+    bitboard.clear()
+    start = time.perf_counter()
+    bitboard.get_best_move([''] * 9, 'X')
+    cold = time.perf_counter() - start
+    result = bench_best_move(game, lambda board: bitboard.get_best_move(board, game.AI))
+    result['cold_empty_board_us'] = cold * 1e6
+    result['table_positions'] = bitboard.table_size()
+    return result
+
+
+def bench_parallel(workers=None, min_empty=7):
+    """Time the parallel root search against the serial one on the deepest positions.
+
+    Only positions with at least `min_empty` empty cells are searched, since
+    shallower ones never reach the process pool. Pool startup is excluded.
+    """
+    game = load_tictactoe()
+    from parallel_search import ParallelRootSearch
+    search = ParallelRootSearch(game.score_root_move, workers=workers, min_empty=min_empty)
+    boards = [(board, side_to_move(board)) for board in reachable_positions()
+              if board.count('') >= min_empty]
+    try:
+        search.best_move(*boards[-1])  # start the pool
+        parallel = time_calls(search.best_move, boards)
+        serial = time_calls(game.get_best_move, boards)
+    finally:
+        search.close()
+    return {
+        'workers': search.workers,
+        'parallel': summarize(parallel),
+        'serial': summarize(serial),
+        'speedup': sum(serial) / sum(parallel),
+    }
+
+
+def bench_batch():
+    """Time the NumPy batch evaluator on every reachable position against check_winner plus get_best_move.
+
+    The retrograde solve runs once per process and is reported separately as
+    `solve_ms`; `batch_ms` is one analyze() call over the whole batch.
+    """
+    game = load_tictactoe()
+    import batch_eval
+    boards = [(board, side_to_move(board)) for board in reachable_positions()]
+    start = time.perf_counter()
+    batch_eval.solve()
+    solve = time.perf_counter() - start
+    array = batch_eval.to_array([board for board, _ in boards])
+    start = time.perf_counter()
+    batch_eval.analyze(array)
+    batch = time.perf_counter() - start
+    start = time.perf_counter()
+    for board, ai in boards:
+        game.check_winner(board)
+        game.get_best_move(board, ai)
+    serial = time.perf_counter() - start
+    return {
+        'positions': len(boards),
+        'solve_ms': solve * 1000,
+        'batch_ms': batch * 1000,
+        'serial_ms': serial * 1000,
+        'speedup': serial / batch,
+    }
+
+
+def bench_mnk(budget=0.1, positions=10, seed=0):
+    """Time the generalized engine on larger boards against its per-move budget.
+
+    For each geometry, random openings of a few moves are searched with
+    `budget` seconds each. Reports latency and the iterative-deepening depth
+    reached; `max_us` should stay close to the budget.
+    """
+    load_tictactoe()
+    import mnk
+    rng = random.Random(seed)
+    results = {}
+    for size, k in ((4, 4), (5, 4), (7, 5)):
+        engine = mnk.MNKEngine(size, k)
+        samples, depths = [], []
+        for _ in range(positions):
+            board = [''] * (size * size)
+            for ply in range(rng.randint(0, 4)):
+                empty = [i for i, cell in enumerate(board) if not cell]
+                board[rng.choice(empty)] = 'X' if ply % 2 == 0 else 'O'
+            ai = side_to_move(board)
+            search = mnk._Search(engine, board, ai, time.perf_counter() + budget)
+            start = time.perf_counter()
+            search.best_move()
+            samples.append(time.perf_counter() - start)
+            depths.append(search.depth_reached)
+        result = summarize(samples)
+        result['budget_us'] = budget * 1e6
+        result['mean_depth'] = sum(depths) / len(depths)
+        results[f'{size}x{size}_k{k}'] = result
+    return results
+
+
+def run(repeat=2000):
+    random.seed(0)
+    return {
+        'chat': bench_chat(repeat=repeat),
+        'chat_cached': bench_chat(repeat=repeat, cached=True),
+        'chat_classifier': bench_classifier(),
+        'calc': bench_calc(repeat=repeat),
+        'tictactoe': {
+            'get_best_move': bench_best_move(),
+            'perfect_table': bench_perfect_table(),
+            'bitboard': bench_bitboard(),
+            'parallel': bench_parallel(),
+            'batch': bench_batch(),
+            'mnk': bench_mnk(),
+        },
+    }
@@ -0,0 +1,123 @@
+"""Session store benchmarks: memory per session and lookup latency for the
+Tic-Tac-Toe game stores and the chatbot's conversation contexts."""
+
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks._apps import load_chatbot, load_tictactoe
+from benchmarks.stats import summarize, time_calls
+
+
+def _random_game(Game, rng):
+    game = Game(rng.choice('XO'))
+    for cell in rng.sample(range(9), rng.randint(0, 6)):
+        game.board[cell] = rng.choice('XO')
+    return game
+
+
+def bench_store(store, sessions, lookups, seed=0):
+    """Fill `store` with `sessions` games, then time random gets and puts."""
+    from game_store import Game, new_game_id
+
+    rng = random.Random(seed)
+    ids = [new_game_id() for _ in range(sessions)]
+    start = time.perf_counter()
+    for game_id in ids:
+        store.put(game_id, _random_game(Game, rng))
+    fill = time.perf_counter() - start
+
+    sample = [(rng.choice(ids),) for _ in range(lookups)]
+    get = time_calls(store.get, sample)
+    put = time_calls(store.put, [(game_id, _random_game(Game, rng)) for (game_id,) in sample])
+    return {
+        'fill_per_game_us': fill / sessions * 1e6,
+        'get': summarize(get),
+        'put': summarize(put),
+        'games': len(store),
+    }
+
+
+def bench_memory(sessions=100_000, lookups=10_000):
+    """The in-process store, including traced memory per live game."""
+    load_tictactoe()
+    from game_store import MemoryGameStore
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = MemoryGameStore(max_games=sessions)
+    result = bench_store(store, sessions, lookups)
+    result['bytes_per_game'] = (tracemalloc.get_traced_memory()[0] - before) / len(store)
+    tracemalloc.stop()
+    return result
+
+
+def bench_sqlite(sessions=100_000, lookups=10_000):
+    """The SQLite store on a temporary file, including file size per game."""
+    load_tictactoe()
+    from game_store import SQLiteGameStore
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'games.db')
+        store = SQLiteGameStore(path, max_games=sessions)
+        result = bench_store(store, sessions, lookups)
+        store._conn().execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        result['bytes_per_game'] = os.path.getsize(path) / len(store)
+        store._conn().close()
+    return result
+
+
+def bench_contexts(sessions=100_000, lookups=10_000, seed=0):
+    """The chatbot's conversation contexts: memory, lookups, eviction and expiry.
+
+    Every session is filled with a full turn history and a numeric result
+    before memory is read. Then `lookups` new sessions arrive at the cap, each
+    evicting the least recently used one, and finally the clock jumps past the
+    TTL and `lookups` more new sessions sweep out the expired ones a batch at
+    a time.
+    """
+    load_chatbot()
+    from context import ContextStore, new_session_id
+
+    now = [0.0]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = ContextStore(max_sessions=sessions, clock=lambda: now[0])
+    ids = [new_session_id() for _ in range(sessions)]
+    start = time.perf_counter()
+    for session_id in ids:
+        session = store.session(session_id)
+        for turn in range(store.history):
+            session.record(f'what is {turn} + {turn}', 'math', store.history)
+        session.last_result = 2.0 * turn
+    fill = time.perf_counter() - start
+    bytes_per_session = (tracemalloc.get_traced_memory()[0] - before) / len(store)
+    tracemalloc.stop()
+
+    rng = random.Random(seed)
+    lookup = time_calls(store.session, [(rng.choice(ids),) for _ in range(lookups)])
+    evict = time_calls(store.session, [(new_session_id(),) for _ in range(lookups)])
+    evicted = store.evicted
+
+    now[0] += store.ttl + 1
+    expire = time_calls(store.session, [(new_session_id(),) for _ in range(lookups)])
+    return {
+        'fill_per_session_us': fill / sessions * 1e6,
+        'bytes_per_session': bytes_per_session,
+        'session': summarize(lookup),
+        'evict': summarize(evict),
+        'evicted': evicted,
+        'expire': summarize(expire),
+        'expired': store.expired,
+        'sessions_after_expiry': len(store),
+    }
+
+
+def run(sessions=100_000, lookups=10_000):
+    return {
+        'memory': bench_memory(sessions, lookups),
+        'sqlite': bench_sqlite(sessions, lookups),
+        'contexts': bench_contexts(sessions, lookups),
+    }
@@ -0,0 +1,133 @@
+"""Cold start: app import and create_app() in fresh interpreters, and the first
+requests a freshly forked worker serves with and without a warmed-up parent."""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks._apps import CHATBOT_DIR, ROOT, TICTACTOE_DIR, load_chatbot, load_tictactoe
+from benchmarks.stats import summarize
+
+# Run in a fresh interpreter inside an app's folder: import the app and build it.
+_BOOT = """
+import json, sys, time
+start = time.perf_counter()
+import app
+app.create_app(websocket={websocket})
+print(json.dumps({{'seconds': time.perf_counter() - start, 'import_ms': app.STARTUP['import_ms'],
+                  'modules': len(sys.modules)}}))
+"""
+
+
+def bench_boot(folder, runs=10, websocket=True):
+    """Start `runs` interpreters that import the app and call create_app().
+
+    `boot` is the import plus create_app() as timed inside the interpreter;
+    `process` adds interpreter start-up and exit, as seen by the parent.
+    """
+    boot, imports, process = [], [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, '-c', _BOOT.format(websocket=websocket)], cwd=folder,
+                             check=True, capture_output=True, text=True).stdout
+        process.append(time.perf_counter() - start)
+        result = json.loads(out.splitlines()[-1])
+        boot.append(result['seconds'])
+        imports.append(result['import_ms'] / 1000)
+    return {
+        'boot': summarize(boot),
+        'import': summarize(imports),
+        'process': summarize(process),
+        'modules': result['modules'],
+    }
+
+
+def _chat_requests(chat):
+    client = chat.app.test_client()
+    client.get('/')
+    for message in ('hello', 'what is 2 + 3 * 4', 'and times 2', 'cya'):
+        client.post('/chat', json={'message': message})
+
+
+def _game_requests(game):
+    client = game.app.test_client()
+    client.get('/')
+    client.post('/engine', json={'engine': 'table'})
+    client.post('/set-symbol', json={'symbol': 'O'})  # The AI opens as X.
+    client.post('/engine', json={'engine': 'bitboard'})
+    client.post('/make-move', json={'position': 4})
+    if game.HAS_NUMPY:
+        client.post('/analyze', json={'boards': [['X', '', '', '', 'O', '', '', '', '']]})
+
+
+def time_in_fork(fn, *args):
+    """Run `fn(*args)` in a forked child and return how long it took there, in seconds."""
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        status = 1
+        try:
+            start = time.perf_counter()
+            fn(*args)
+            os.write(write, repr(time.perf_counter() - start).encode('ascii'))
+            status = 0
+        finally:
+            os._exit(status)
+    os.close(write)
+    with os.fdopen(read) as fh:
+        text = fh.read()
+    _, status = os.waitpid(pid, 0)
+    if status:
+        raise RuntimeError(f"forked worker failed with status {status}")
+    return float(text)
+
+
+def fork_first_requests(name, runs=5):
+    """Time a forked worker's first requests, forking from a cold and then a warmed-up parent.
+
+    Must run in a process of its own (see bench_fork), as the parent's state is
+    what is being measured.
+    """
+    # _game_requests switches engines through POST /engine, which is opt-in.
+    os.environ.setdefault('TICTACTOE_ENGINE_SWITCH', '1')
+    module, requests = (load_chatbot(), _chat_requests) if name == 'chatbot' else (load_tictactoe(), _game_requests)
+    module.create_app()
+    cold = [time_in_fork(requests, module) for _ in range(runs)]
+    module.create_app(warm=True)
+    warm = [time_in_fork(requests, module) for _ in range(runs)]
+    return {
+        'cold': summarize(cold),
+        'warm': summarize(warm),
+        'warm_up_ms': module.STARTUP['warm_ms'],
+    }
+
+
+def bench_fork(name, runs=5):
+    """fork_first_requests in a fresh interpreter; None where fork() is unavailable."""
+    if not hasattr(os, 'fork'):
+        return None
+    out = subprocess.run([sys.executable, '-m', 'benchmarks.startup', name, str(runs)], cwd=ROOT,
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def run(runs=10):
+    return {
+        'chatbot': {
+            'wsgi': bench_boot(CHATBOT_DIR, runs),
+            'asgi': bench_boot(CHATBOT_DIR, runs, websocket=False),
+            'fork': bench_fork('chatbot'),
+        },
+        'tictactoe': {
+            'wsgi': bench_boot(TICTACTOE_DIR, runs),
+            'asgi': bench_boot(TICTACTOE_DIR, runs, websocket=False),
+            'fork': bench_fork('tictactoe'),
+        },
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps(fork_first_requests(sys.argv[1], int(sys.argv[2]))))
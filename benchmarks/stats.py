@@ -0,0 +1,43 @@
+"""Timing helpers shared by the benchmarks."""
+
+import time
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, int(round(pct / 100.0 * len(sorted_samples))) - 1))
+    return sorted_samples[rank]
+
+
+def summarize(samples, wall=None):
+    """Summarize per-call durations (seconds) as microsecond statistics.
+
+    When `wall` (total elapsed seconds) is given, requests per second is added.
+    """
+    s = sorted(samples)
+    n = len(s)
+    out = {
+        'count': n,
+        'mean_us': (sum(s) / n * 1e6) if n else 0.0,
+        'p50_us': percentile(s, 50) * 1e6,
+        'p95_us': percentile(s, 95) * 1e6,
+        'p99_us': percentile(s, 99) * 1e6,
+        'max_us': (s[-1] * 1e6) if n else 0.0,
+    }
+    if wall:
+        out['rps'] = n / wall
+    return out
+
+
+def time_calls(fn, args_list, repeat=1):
+    """Call `fn(*args)` for every args tuple `repeat` times; return the durations."""
+    samples = []
+    clock = time.perf_counter
+    for _ in range(repeat):
+        for args in args_list:
+            start = clock()
+            fn(*args)
+            samples.append(clock() - start)
+    return samples
@@ -0,0 +1,14 @@
+"""Self-play tournament: whole games between the Tic-Tac-Toe AI players."""
+
+from benchmarks._apps import load_tictactoe
+
+# Perfect players against a random and a depth-limited one; minimax's cost
+# dominates, so the default game count is kept small.
+PLAYERS = ('minimax', 'table', 'bitboard', 'random', 'depth2')
+
+
+def run(games=20, players=PLAYERS, workers=None):
+    """Play a round-robin of `games` games per ordered pairing with TicTacToe-AI/selfplay.py."""
+    game = load_tictactoe()
+    import selfplay
+    return selfplay.run(list(players), games=games, workers=workers, game=game)
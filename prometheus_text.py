@@ -0,0 +1,160 @@
+"""
+Prometheus-style metrics shared by the chatbot and the Tic-Tac-Toe game.
+
+A small in-process registry of counters and histograms rendered in the
+Prometheus text exposition format, so neither app needs a client library.
+Each app builds its own metrics on a :class:`Registry` (``chat_metrics.py``,
+``game_metrics.py``) and serves them with :func:`instrument`.
+
+Values are per process. Under a multi-worker server each scrape reads the
+worker that happened to answer it, so scrape every worker or aggregate with
+a label per instance.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+from flask import Flask, Response, request
+
+
+# Request latency buckets in seconds.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def enabled(var: str) -> bool:
+    """True when the environment variable ``var`` is set to ``1``, ``true``, ``yes`` or ``on``."""
+    return os.environ.get(var, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """A monotonically increasing count per label set."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name, self.help, self.labels = name, help, labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f'{self.name}{_labels(self.labels, labels)} {_number(value)}'
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label set."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, labels
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket..., count above the last bucket, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[slot] += 1
+            series[-1] += value
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            running = 0
+            for bound, count in zip(self.buckets, series):
+                running += count
+                le = 'le="%s"' % bound
+                yield f'{self.name}_bucket{_labels(self.labels, labels, le)} {running}'
+            running += series[len(self.buckets)]
+            le = 'le="+Inf"'
+            yield f'{self.name}_bucket{_labels(self.labels, labels, le)} {running}'
+            yield f'{self.name}_sum{_labels(self.labels, labels)} {_number(series[-1])}'
+            yield f'{self.name}_count{_labels(self.labels, labels)} {running}'
+
+
+class Registry:
+    """The set of metrics rendered by ``/metrics``; every name gets ``prefix``."""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._metrics = []
+
+    def counter(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> Counter:
+        metric = Counter(f'{self.prefix}_{name}', help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(f'{self.prefix}_{name}', help, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+def instrument(app: Flask, metrics) -> None:
+    """Time every Flask request and serve ``GET /metrics``; does nothing when ``metrics`` is None.
+
+    ``metrics`` needs a ``registry``, ``observe_request(route, method, status,
+    seconds)`` and ``render()``, as ``ChatMetrics`` and ``GameMetrics`` have.
+    """
+    if metrics is None:
+        return
+    key = f'{metrics.registry.prefix}.start'
+
+    @app.before_request
+    def _start_timer():
+        request.environ[key] = time.perf_counter()
+
+    @app.after_request
+    def _record(response):
+        start = request.environ.get(key)
+        if start is not None:
+            # The URL rule keeps the label set small; unknown paths share one label.
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            metrics.observe_request(route, request.method, response.status_code,
+                                    time.perf_counter() - start)
+        return response
+
+    @app.route('/metrics')
+    def metrics_endpoint():
+        """Expose the metrics in the Prometheus text format."""
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,52 @@
+// Persistent channel shared by the chatbot and the Tic-Tac-Toe pages.
+//
+// openChannel(path) returns {connect, request}. When the server offers a
+// WebSocket at `path`, every request travels over that one connection instead
+// of a new POST: frames carry an `id` and the reply with the same `id`
+// resolves the request. If the socket is unavailable (or drops), request()
+// resolves with null and the page falls back to fetch.
+function openChannel(path) {
+  let ready = null;          // Promise of an open socket, or of null when unavailable
+  let nextId = 0;
+  const pending = new Map(); // id -> {resolve, reject}
+
+  function connect() {
+    if (ready) return ready;
+    if (!('WebSocket' in window)) return (ready = Promise.resolve(null));
+    ready = new Promise((resolve) => {
+      const scheme = location.protocol === 'https:' ? 'wss' : 'ws';
+      const ws = new WebSocket(`${scheme}://${location.host}${path}`);
+      let opened = false;
+      ws.onopen = () => { opened = true; resolve(ws); };
+      ws.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        const request = pending.get(data.id);
+        if (request) {
+          pending.delete(data.id);
+          request.resolve(data);
+        }
+      };
+      ws.onclose = () => {
+        pending.forEach((request) => request.reject(new Error('connection closed')));
+        pending.clear();
+        // Reconnect next time if we had a working socket; otherwise stay on fetch.
+        if (opened) ready = null;
+        resolve(null);
+      };
+    });
+    return ready;
+  }
+
+  // Resolve with the server's JSON reply, or with null when only fetch is available.
+  async function request(payload) {
+    const ws = await connect();
+    if (!ws) return null;
+    const id = ++nextId;
+    return new Promise((resolve, reject) => {
+      pending.set(id, { resolve, reject });
+      ws.send(JSON.stringify({ ...payload, id }));
+    });
+  }
+
+  return { connect, request };
+}